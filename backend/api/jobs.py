@@ -0,0 +1,220 @@
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, List, Optional
+from backend.simulation.engine import SimulationEngine
+
+# Reports (paths_done, paths_total, running estimate) at chunk boundaries; see run_simulation.
+Progress = Callable[[int, int, Optional[Dict[str, Any]]], None]
+# A job's work: runs on the worker's own engine and reports through the Progress callback.
+JobTask = Callable[[SimulationEngine, Progress], Dict[str, Any]]
+
+class JobCancelled(Exception):
+    """Raised from a running job's progress callback once it has been cancelled."""
+
+class QueueFull(RuntimeError):
+    """The job queue is at its admission limit."""
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    priority: int
+    paths_total: int
+    task: Optional[JobTask]
+    status: str = "queued"  # queued -> running -> succeeded | failed | cancelled
+    paths_completed: int = 0
+    estimate: Optional[Dict[str, Any]] = None  # running expected cost / P95 / P99 and CI widths
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancel_requested: bool = False
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None  # HTTP status the error maps to
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def snapshot(self, include_result: bool = True) -> Dict[str, Any]:
+        report = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "priority": self.priority,
+            "progress": {
+                "paths_completed": self.paths_completed,
+                "paths_total": self.paths_total,
+                "fraction": self.paths_completed / self.paths_total if self.paths_total else 0.0
+            },
+            "estimate": self.estimate,
+            "cancel_requested": self.cancel_requested,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "error_status": self.error_status
+        }
+        if include_result:
+            report["result"] = self.result
+        return report
+
+class JobManager:
+    """
+    Background Simulation Jobs
+
+    Runs submitted simulations on a fixed set of worker threads, outside the
+    server's request threadpool, so heavy runs queue behind each other instead
+    of starving light endpoints. Higher `priority` runs first (FIFO within a
+    priority). At most `max_queued` jobs may wait; further submissions raise
+    QueueFull. Each worker owns an engine from `engine_factory`, since a run
+    mutates its engine's tariff and asset state.
+
+    Progress (paths completed and the running estimate) is reported at chunk
+    boundaries. Cancelling a queued job drops it; cancelling a running job
+    stops it at its next chunk boundary. The last `max_finished` finished
+    jobs are kept for polling.
+    """
+
+    def __init__(self,
+                 engine_factory: Callable[[], SimulationEngine],
+                 workers: int = 2,
+                 max_queued: int = 32,
+                 max_finished: int = 256):
+        if workers < 1 or max_queued < 0 or max_finished < 0:
+            raise ValueError("workers must be positive and the queue limits non-negative.")
+        self.engine_factory = engine_factory
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self._jobs: Dict[str, Job] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._queue: List = []
+        self._queued = 0
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+    def submit(self, task: JobTask, paths_total: int, priority: int = 0, kind: str = "simulate") -> Job:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The job manager has been shut down.")
+            if self._queued >= self.max_queued:
+                raise QueueFull(f"{self._queued} jobs are already queued (limit {self.max_queued}); retry later.")
+            job = Job(job_id=uuid.uuid4().hex, kind=kind, priority=priority, paths_total=paths_total, task=task)
+            self._jobs[job.job_id] = job
+            heapq.heappush(self._queue, (-priority, next(self._order), job))
+            self._queued += 1
+            self._start_workers()
+            self._ready.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancels a queued or running job; a finished job is forgotten instead."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == "queued":
+                # Left in the heap; workers skip it when popped.
+                self._queued -= 1
+                job.cancel_requested = True
+                self._finish(job, "cancelled")
+            elif job.status == "running":
+                job.cancel_requested = True
+            else:
+                del self._jobs[job_id]
+                self._finished.pop(job_id, None)
+            return job
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {"workers": self.workers, "max_queued": self.max_queued, "jobs": counts}
+
+    def shutdown(self):
+        """Stops the workers after their current jobs; queued jobs are cancelled."""
+        with self._lock:
+            self._closed = True
+            for _, _, job in self._queue:
+                if job.status == "queued":
+                    self._finish(job, "cancelled")
+            self._queue.clear()
+            self._queued = 0
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    # --- Internals -----------------------------------------------------
+
+    def _start_workers(self):
+        """Workers start on first submission, so importing the API spawns no threads."""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"voltwise-job-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self):
+        engine = self.engine_factory()
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._ready.wait()
+                if self._closed:
+                    break
+                _, _, job = heapq.heappop(self._queue)
+                if job.status != "queued":
+                    continue
+                self._queued -= 1
+                job.status = "running"
+                job.started_at = time.time()
+            self._run(engine, job)
+        engine.shutdown()
+
+    def _run(self, engine: SimulationEngine, job: Job):
+        def progress(paths_done: int, paths_total: int, estimate: Optional[Dict[str, Any]] = None):
+            job.paths_completed = paths_done
+            job.paths_total = paths_total
+            job.estimate = estimate
+            if job.cancel_requested:
+                raise JobCancelled(job.job_id)
+
+        status, result, error, error_status = "succeeded", None, None, None
+        try:
+            result = job.task(engine, progress)
+        except JobCancelled:
+            status = "cancelled"
+        except ValueError as e:
+            status, error, error_status = "failed", str(e), 400
+        except Exception as e:
+            status, error, error_status = "failed", str(e), 500
+        with self._lock:
+            job.result, job.error, job.error_status = result, error, error_status
+            self._finish(job, status)
+
+    def _finish(self, job: Job, status: str):
+        """Marks a job done and evicts the oldest finished jobs (lock held)."""
+        job.status = status
+        job.finished_at = time.time()
+        job.task = None
+        self._finished[job.job_id] = None
+        while len(self._finished) > self.max_finished:
+            evicted, _ = self._finished.popitem(last=False)
+            self._jobs.pop(evicted, None)
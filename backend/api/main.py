@@ -1,8 +1,17 @@
-from fastapi import FastAPI, HTTPException
+import os
+import json
+import queue
+import asyncio
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse, Response, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from backend.simulation.engine import SimulationEngine
+from backend.data.interval_store import IntervalStore
+from backend.simulation.shock_bank import ShockBankStore
+from backend.api.jobs import JobManager, Job, Progress, QueueFull
+from backend.api import result_formats
 from backend.insights.llm_agent import analyst_agent
 
 app = FastAPI(title="Voltwise API", version="1.0.0")
@@ -16,6 +25,29 @@ app.add_middleware(
 )
 
 engine = SimulationEngine()
+# Metered 15-minute history, ingested ahead of time (see ingest_intervals.py)
+interval_store = IntervalStore(os.environ.get("VOLTWISE_INTERVAL_STORE", os.path.join("data", "intervals")))
+# Prebuilt standard-normal shocks, mapped read-only by every worker (see build_shock_bank.py)
+shock_banks = ShockBankStore(os.environ.get("VOLTWISE_SHOCK_BANKS", os.path.join("data", "shock_banks")))
+
+
+def _job_engine() -> SimulationEngine:
+    # Each job worker owns an engine (runs mutate tariff and asset state) but shares the stage cache.
+    job_engine = SimulationEngine(cache_bytes=0)
+    job_engine.stage_cache = engine.stage_cache
+    return job_engine
+
+# Background simulations (POST /jobs/simulate), run outside the request threadpool
+jobs = JobManager(
+    _job_engine,
+    workers=int(os.environ.get("VOLTWISE_JOB_WORKERS", 2)),
+    max_queued=int(os.environ.get("VOLTWISE_JOB_QUEUE", 32))
+)
+
+@app.on_event("shutdown")
+def stop_simulation_workers():
+    jobs.shutdown()
+    engine.shutdown()
 
 class SimulationRequest(BaseModel):
     state: str
@@ -25,30 +57,350 @@ class SimulationRequest(BaseModel):
     market: Optional[str] = "IN_IEX"
     with_asset: Optional[bool] = True
     asset_type: Optional[str] = "BESS"
+    seed: Optional[int] = None
+    price_anchor: Optional[float] = None  # market mark (INR/kWh); replay meta.price_anchor with meta.seed
+    variance_reduction: Optional[str] = None
+    sampler: Optional[str] = "pseudo"
+    paths: Optional[int] = 1000
+    adaptive: Optional[bool] = False
+    rel_tol: Optional[float] = 5e-4
+    time_budget_s: Optional[float] = None
+    tail_sampling: Optional[bool] = False
+    compare_states: Optional[Union[str, List[str]]] = None  # tariff codes or "all"
+    billing_days: Optional[int] = None  # 28-31: bill a month with maximum-demand charges
+    load_noise: Optional[float] = None  # per-path load uncertainty, fraction of load per block
+    load_site: Optional[str] = None  # metered site in the interval store (replaces the synthetic profile)
+    load_start_date: Optional[str] = None  # first metered day, "YYYY-MM-DD"
+    workers: Optional[int] = None  # shard the paths across this many processes
+    shock_bank: Optional[str] = None  # prebuilt shock bank id (replaces fresh price shocks)
+    bank_offset: Optional[int] = 0  # first bank row used by path 0
 
 class AnalysisRequest(BaseModel):
     financials: Dict[str, Any]
     meta: Dict[str, Any]
 
+def _simulation_kwargs(req: SimulationRequest) -> Dict[str, Any]:
+    """run_simulation keyword arguments for one request (metered load resolved from the store)."""
+    load_profile_mw = None
+    if req.load_site is not None:
+        if req.load_start_date is None:
+            raise ValueError("load_start_date is required with load_site.")
+        load_profile_mw = interval_store.period(req.load_site, req.load_start_date, req.billing_days or 1)
+    if req.paths is None or req.paths < 1:
+        # Checked here as well as in the engine so a job is refused before it is queued.
+        raise ValueError(f"paths must be at least 1, got {req.paths}.")
+    if req.workers is not None and req.workers > (os.cpu_count() or 1):
+        raise ValueError(f"workers may be at most this node's {os.cpu_count()} CPUs, got {req.workers}.")
+    return dict(
+        state_code=req.state,
+        category=req.category,
+        load_mw=req.load_mw,
+        shift_type=req.shift_type,
+        market_code=req.market,
+        with_asset=req.with_asset,
+        asset_type=req.asset_type,
+        seed=req.seed,
+        price_anchor=req.price_anchor,
+        variance_reduction=req.variance_reduction,
+        sampler=req.sampler,
+        num_scenarios=req.paths,
+        adaptive=req.adaptive,
+        rel_tol=req.rel_tol,
+        time_budget_s=req.time_budget_s,
+        tail_sampling=req.tail_sampling,
+        compare_states=req.compare_states,
+        billing_days=req.billing_days,
+        load_noise=req.load_noise,
+        load_profile_mw=load_profile_mw,
+        workers=req.workers,
+        shock_bank=shock_banks.get(req.shock_bank) if req.shock_bank is not None else None,
+        bank_offset=req.bank_offset or 0
+    )
+
 @app.post("/simulate")
-def run_simulation(req: SimulationRequest):
+def run_simulation(req: SimulationRequest, request: Request):
     """
     Directly exposes the Stochastic Engine.
     Input: User parameters.
-    Output: Vectorized Monte Carlo futures.
+    Output: Vectorized Monte Carlo futures, encoded per the Accept header:
+    JSON (default), a compact summary or a float32 binary (see result_formats).
+    """
+    media_type = result_formats.negotiate(request.headers.get("accept"))
+    if media_type is None:
+        raise HTTPException(status_code=406, detail=f"Supported result formats: {', '.join(result_formats.MEDIA_TYPES)}.")
+    try:
+        result = engine.run_simulation(raw_costs_format="array", **_simulation_kwargs(req))
+        body, media_type = result_formats.render(result, media_type)
+        headers = {"Vary": "Accept"}
+        if media_type == result_formats.BINARY:
+            return Response(content=body, media_type=media_type, headers=headers)
+        if media_type == result_formats.SUMMARY:
+            return JSONResponse(content=body, media_type=media_type, headers=headers)
+        return body
+    except ValueError as e:
+        # Invalid simulation options (unknown sampler, incompatible modes)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # Standard error response for production monitoring
+        raise HTTPException(status_code=500, detail=str(e))
+
+class BatchSimulationRequest(BaseModel):
+    requests: List[SimulationRequest]
+
+@app.post("/simulate/batch")
+def run_simulation_batch(req: BatchSimulationRequest):
+    """
+    Many /simulate requests in one call. Requests sharing market, seed and path
+    count are evaluated against one set of price paths.
+    Output: one /simulate response per request, in input order.
     """
     try:
-        return engine.run_simulation(
-            state_code=req.state, 
-            category=req.category, 
+        kwargs = []
+        for i, item in enumerate(req.requests):
+            try:
+                kwargs.append(_simulation_kwargs(item))
+            except ValueError as e:
+                raise ValueError(f"requests[{i}]: {e}") from e
+        return engine.run_batch(kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+class SimulationJobRequest(SimulationRequest):
+    priority: Optional[int] = 0  # higher runs first
+
+# Paths per chunk of a job without its own chunking: the granularity of progress and cancellation.
+JOB_CHUNK_PATHS = 10000
+# Paths per chunk of a streamed run: the first estimate arrives after this many paths.
+STREAM_CHUNK_PATHS = 4096
+
+def _submit_job(req: SimulationJobRequest,
+                chunk_paths: int,
+                listener: Optional[Progress] = None,
+                keep_raw_costs: bool = True) -> Job:
+    """
+    Queues the run; `listener` also receives every progress report. A finished
+    job keeps raw_costs as one float64 array (a list would hold a Python float
+    per path for as long as the job is kept), or drops it if not `keep_raw_costs`.
+    """
+    kwargs = _simulation_kwargs(req)
+    if not req.adaptive and req.workers is None:
+        # Chunking does not change a full run's result (each path is billed on its
+        # own; see TariffEngine.energy_totals and verify_reproducibility.py).
+        kwargs["chunk_size"] = min(req.paths, chunk_paths)
+
+    def task(job_engine: SimulationEngine, progress: Progress) -> Dict[str, Any]:
+        def report(paths_done: int, paths_total: int, estimate: Optional[Dict[str, Any]]):
+            progress(paths_done, paths_total, estimate)
+            if listener is not None:
+                listener(paths_done, paths_total, estimate)
+        result = job_engine.run_simulation(progress=report, raw_costs_format="array", **kwargs)
+        if not keep_raw_costs:
+            result.pop("raw_costs")
+        return result
+
+    return jobs.submit(task, paths_total=req.paths, priority=req.priority or 0)
+
+@app.post("/jobs/simulate", status_code=202)
+def submit_simulation_job(req: SimulationJobRequest):
+    """
+    Queues a /simulate run and returns its job id at once.
+    Poll GET /jobs/{job_id} for progress and the result; DELETE cancels.
+    """
+    try:
+        return _submit_job(req, JOB_CHUNK_PATHS).snapshot(include_result=False)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs")
+def list_jobs():
+    return {"queue": jobs.stats(), "jobs": [job.snapshot(include_result=False) for job in jobs.jobs()]}
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.")
+    report = job.snapshot()
+    if report["result"] is not None and "raw_costs" in report["result"]:
+        # Encoded per request; the stored result keeps its raw_costs array.
+        report["result"], _ = result_formats.render(dict(report["result"]), result_formats.JSON)
+    return report
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    """Cancels a queued or running job (running jobs stop at their next chunk); forgets a finished one."""
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'.")
+    return job.snapshot(include_result=False)
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/simulate/stream")
+def stream_simulation(req: SimulationJobRequest):
+    """
+    /simulate as Server-Sent Events, run through the job queue.
+    Events: "job" (id and queue state), one "estimate" per chunk of paths
+    (running expected cost, P95, P99 and CI widths), then "result" (the
+    /simulate response without raw_costs), "error" or "cancelled".
+    Closing the connection (or DELETE /jobs/{job_id}) stops the run.
+    """
+    events: "queue.Queue" = queue.Queue()
+
+    def relay(paths_done: int, paths_total: int, estimate: Optional[Dict[str, Any]]):
+        events.put({"paths_completed": paths_done, "paths_total": paths_total, "estimate": estimate})
+
+    try:
+        job = _submit_job(req, STREAM_CHUNK_PATHS, relay, keep_raw_costs=False)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def stream():
+        try:
+            yield _sse("job", job.snapshot(include_result=False))
+            while True:
+                try:
+                    yield _sse("estimate", events.get_nowait())
+                except queue.Empty:
+                    if job.done:
+                        # The last report may have landed between the empty read and
+                        # the done check; reports precede completion, so drain once more.
+                        while not events.empty():
+                            yield _sse("estimate", events.get_nowait())
+                        break
+                    await asyncio.sleep(0.02)
+            if job.status == "succeeded":
+                yield _sse("result", job.result)
+            elif job.status == "failed":
+                yield _sse("error", {"status": job.error_status, "detail": job.error})
+            else:
+                yield _sse("cancelled", job.snapshot(include_result=False))
+        finally:
+            # Client gone before the end: stop the run at its next chunk.
+            if not job.done:
+                jobs.cancel(job.job_id)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+class CounterfactualRequest(BaseModel):
+    state: str
+    load_mw: float
+    asset_scenarios: List[str] = ["BESS"]  # each one asset or a stack, e.g. "BESS+HYDROGEN"
+    shift_type: Optional[str] = "1_SHIFT_DAY"
+    market: Optional[str] = "IN_IEX"
+    seed: Optional[int] = None
+    price_anchor: Optional[float] = None
+    sampler: Optional[str] = "pseudo"
+    paths: Optional[int] = 1000
+    load_noise: Optional[float] = None
+
+@app.post("/simulate/counterfactual")
+def run_counterfactual(req: CounterfactualRequest):
+    """
+    Baseline vs asset scenarios billed on the same price paths (common random numbers).
+    Output: per-scenario distributions, per-path cost deltas, and dP95 / dCVaR with CIs.
+    """
+    try:
+        return engine.run_counterfactual(
+            asset_scenarios=req.asset_scenarios,
+            state_code=req.state,
             load_mw=req.load_mw,
+            num_scenarios=req.paths,
             shift_type=req.shift_type,
             market_code=req.market,
-            with_asset=req.with_asset,
-            asset_type=req.asset_type
+            seed=req.seed,
+            price_anchor=req.price_anchor,
+            sampler=req.sampler,
+            load_noise=req.load_noise
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+class BESSSweepRequest(BaseModel):
+    state: str
+    load_mw: float
+    capacity_mwh: List[float]
+    power_mw: List[float]
+    round_trip_efficiency: List[float] = [0.88]
+    shift_type: Optional[str] = "1_SHIFT_DAY"
+    market: Optional[str] = "IN_IEX"
+    seed: Optional[int] = None
+    price_anchor: Optional[float] = None
+    sampler: Optional[str] = "pseudo"
+    paths: Optional[int] = 1000
+
+@app.post("/simulate/bess-sweep")
+def run_bess_sweep(req: BESSSweepRequest):
+    """
+    BESS sizing sweep: every capacity x power x efficiency combination against
+    one shared set of price paths. Output: P95 / expected cost / degradation surfaces.
+    """
+    try:
+        return engine.run_bess_sweep(
+            capacities_mwh=req.capacity_mwh,
+            powers_mw=req.power_mw,
+            efficiencies=req.round_trip_efficiency,
+            state_code=req.state,
+            load_mw=req.load_mw,
+            num_scenarios=req.paths,
+            shift_type=req.shift_type,
+            market_code=req.market,
+            seed=req.seed,
+            price_anchor=req.price_anchor,
+            sampler=req.sampler
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+class HydrogenSweepRequest(BaseModel):
+    state: str
+    load_mw: float
+    break_even_inr_per_kwh: List[float]
+    power_rating_mw: List[float]
+    shift_type: Optional[str] = "1_SHIFT_DAY"
+    market: Optional[str] = "IN_IEX"
+    seed: Optional[int] = None
+    price_anchor: Optional[float] = None
+    sampler: Optional[str] = "pseudo"
+    paths: Optional[int] = 1000
+
+@app.post("/simulate/hydrogen-sweep")
+def run_hydrogen_sweep(req: HydrogenSweepRequest):
+    """
+    Electrolyzer sensitivity: break-even price x power rating in one time walk.
+    Output: production-kg and net-cost surfaces.
+    """
+    try:
+        return engine.run_hydrogen_sweep(
+            break_evens_inr_per_kwh=req.break_even_inr_per_kwh,
+            power_ratings_mw=req.power_rating_mw,
+            state_code=req.state,
+            load_mw=req.load_mw,
+            num_scenarios=req.paths,
+            shift_type=req.shift_type,
+            market_code=req.market,
+            seed=req.seed,
+            price_anchor=req.price_anchor,
+            sampler=req.sampler
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        # Standard error response for production monitoring
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/analyze/llm")
@@ -251,6 +603,10 @@ def get_assumptions():
     from core.assumptions.registry import params
     return params.get_latest()
 
+@app.get("/shock-banks")
+def list_shock_banks():
+    return {bank_id: shock_banks.get(bank_id).meta for bank_id in shock_banks.banks()}
+
 @app.get("/scenarios/summary")
 def get_scenarios_summary():
     return {
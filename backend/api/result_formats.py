@@ -0,0 +1,92 @@
+"""
+Result Transport for /simulate (content negotiation on the Accept header)
+
+- application/json: the full result, raw_costs as a JSON list (default).
+- application/vnd.voltwise.summary+json: raw_costs replaced by `cost_summary`,
+  a fixed-bin histogram and a quantile grid; the same size at any path count.
+- application/vnd.voltwise.binary: the JSON result without raw_costs as a
+  header, followed by the per-path costs as a float32 buffer. Layout: uint32
+  little-endian header length H, H bytes of UTF-8 JSON (space-padded so the
+  buffer starts 8-byte aligned), then count little-endian float32 costs.
+  float32 keeps costs of ~10 lakh INR to within about 0.06 INR.
+"""
+import json
+import struct
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+
+JSON = "application/json"
+SUMMARY = "application/vnd.voltwise.summary+json"
+BINARY = "application/vnd.voltwise.binary"
+MEDIA_TYPES = (JSON, SUMMARY, BINARY)
+
+# Bins of the summary histogram (the Risk Console's density chart) and the quantile grid step.
+HISTOGRAM_BINS = 40
+QUANTILE_GRID = np.linspace(0.0, 1.0, 101)
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """
+    The supported media type the Accept header prefers (highest q, then
+    listed order); JSON for a missing header or wildcards, None if nothing
+    offered is acceptable.
+    """
+    if not accept:
+        return JSON
+    best, best_q = None, 0.0
+    for entry in accept.split(","):
+        media_type, *params = [part.strip() for part in entry.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media_type in ("*/*", "application/*"):
+            media_type = JSON
+        elif media_type == "application/octet-stream":
+            media_type = BINARY
+        if media_type in MEDIA_TYPES and q > best_q:
+            best, best_q = media_type, q
+    return best
+
+def cost_summary(costs: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+    """Fixed-bin histogram and 1%-step quantile grid of the per-path costs."""
+    if costs is None or costs.size == 0:
+        return None
+    low, high = float(np.min(costs)), float(np.max(costs))
+    counts, edges = np.histogram(costs, bins=HISTOGRAM_BINS, range=(low, high if high > low else low + 1.0))
+    return {
+        "count": int(costs.size),
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+        "quantiles": {"q": QUANTILE_GRID.tolist(), "values": np.quantile(costs, QUANTILE_GRID).tolist()}
+    }
+
+def encode_binary(result: Dict[str, Any], costs: Optional[np.ndarray]) -> bytes:
+    """Header + float32 buffer (layout in the module docstring)."""
+    buffer = np.ascontiguousarray(costs if costs is not None else np.empty(0), dtype="<f4")
+    header = dict(result, raw_costs={"dtype": "<f4", "count": int(buffer.size)})
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (-(4 + len(header_bytes)) % 8)
+    return struct.pack("<I", len(header_bytes)) + header_bytes + buffer.tobytes()
+
+def decode_binary(body: bytes) -> Tuple[Dict[str, Any], np.ndarray]:
+    """(header, float32 costs) of a binary /simulate response; the costs are a view of `body`."""
+    (length,) = struct.unpack_from("<I", body)
+    header = json.loads(body[4:4 + length].decode("utf-8"))
+    costs = np.frombuffer(body, dtype=header["raw_costs"]["dtype"], count=header["raw_costs"]["count"], offset=4 + length)
+    return header, costs
+
+def render(result: Dict[str, Any], media_type: str) -> Tuple[Any, str]:
+    """
+    Encodes a run_simulation result whose raw_costs is an ndarray (or None).
+    Returns the JSON-able body, or bytes for the binary format.
+    """
+    costs = result.pop("raw_costs")
+    if media_type == BINARY:
+        return encode_binary(result, costs), media_type
+    if media_type == SUMMARY:
+        result["cost_summary"] = cost_summary(costs)
+        return result, media_type
+    result["raw_costs"] = costs.tolist() if costs is not None else []
+    return result, media_type
@@ -0,0 +1,277 @@
+import csv
+import io
+import json
+import os
+import re
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple, Union
+import numpy as np
+
+DateLike = Union[str, date, np.datetime64]
+
+class IntervalStore:
+    """
+    Layer 3 Service: Metered Interval-Data Store
+
+    Responsibility: Hold 15-minute meter history per site as compact float32
+    arrays on disk, so simulations can read day or month slices without
+    re-parsing the source files.
+
+    Layout under `root`: one `<site>.f32.npy` file per site, a C-ordered
+    (days, 96) float32 array of MW with NaN for missing blocks, plus an
+    `index.json` of each site's first date and day count. Sites are opened as
+    read-only memory maps on first access; day() / days() / period() return
+    views into them, so a slice costs nothing until it is read. Readers
+    re-read `index.json` when its modification time changes, so sites
+    ingested by another process (ingest_intervals.py) appear without a restart.
+
+    Ingestion reads CSV in large text blocks split straight into columns
+    (quoted or irregular blocks fall back to the csv module), converts them
+    with vectorized numpy date and float parsing, and reads Parquet via
+    pyarrow (optional, imported lazily).
+    Re-ingesting a site merges the new readings into its existing history.
+    """
+
+    BLOCKS_PER_DAY = 96
+    BLOCK_MINUTES = 15
+    INDEX_FILE = "index.json"
+    # Bytes of CSV text parsed per batch (bounds the parser's Python-object overhead)
+    CSV_BATCH_BYTES = 32 << 20
+    UNIT_SCALE = {"MW": 1.0, "KW": 1e-3}
+    _SITE_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+    def __init__(self, root: str):
+        self.root = root
+        self._maps: Dict[str, np.memmap] = {}
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._index_mtime: Optional[int] = None
+        self._refresh()
+
+    # --- Reading -------------------------------------------------------
+
+    def sites(self) -> List[str]:
+        self._refresh()
+        return sorted(self._index)
+
+    def coverage(self, site: str) -> Dict[str, Any]:
+        """First and last date held for a site, and the share of blocks with readings."""
+        entry = self._entry(site)
+        first = np.datetime64(entry["start"], "D")
+        data = self._array(site)
+        return {
+            "site": site,
+            "first_date": entry["start"],
+            "last_date": str(first + entry["days"] - 1),
+            "days": entry["days"],
+            "filled_fraction": float(np.count_nonzero(~np.isnan(data)) / data.size) if data.size else 0.0
+        }
+
+    def day(self, site: str, day: DateLike) -> np.ndarray:
+        """(96,) float32 view of one day's MW readings."""
+        return self.days(site, day, 1)[0]
+
+    def days(self, site: str, start: DateLike, num_days: int) -> np.ndarray:
+        """(num_days, 96) float32 view starting at `start`."""
+        entry = self._entry(site)
+        offset = int((self._to_day(start) - np.datetime64(entry["start"], "D")).astype(int))
+        if num_days < 1:
+            raise ValueError("num_days must be a positive integer.")
+        if offset < 0 or offset + num_days > entry["days"]:
+            raise ValueError(f"Site '{site}' holds {entry['start']} + {entry['days']} days; "
+                             f"{num_days} days from {self._to_day(start)} are out of range.")
+        return self._array(site)[offset:offset + num_days]
+
+    def period(self, site: str, start: DateLike, num_days: int) -> np.ndarray:
+        """
+        Flat (num_days * 96,) load profile for SimulationEngine (a view, no copy).
+        Raises ValueError if any block in the slice has no reading.
+        """
+        profile = self.days(site, start, num_days).reshape(-1)
+        missing = int(np.count_nonzero(np.isnan(profile)))
+        if missing:
+            raise ValueError(f"Site '{site}' has {missing} missing 15-minute blocks in the requested slice.")
+        return profile
+
+    # --- Ingestion -----------------------------------------------------
+
+    def ingest(self, path: str, **options) -> Dict[str, int]:
+        """Ingests a .csv or .parquet interval file; returns readings stored per site."""
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix == ".csv":
+            return self.ingest_csv(path, **options)
+        if suffix in (".parquet", ".pq"):
+            return self.ingest_parquet(path, **options)
+        raise ValueError(f"Unsupported interval file '{path}'. Expected .csv or .parquet.")
+
+    def ingest_csv(self,
+                   path: str,
+                   site: Optional[str] = None,
+                   timestamp_column: str = "timestamp",
+                   value_column: str = "load_mw",
+                   site_column: str = "site",
+                   unit: str = "MW") -> Dict[str, int]:
+        """
+        CSV with a header row. Timestamps are ISO-8601 interval starts
+        ("2024-01-31 23:45[:00]"); `site` names a single-site file that has no
+        site column.
+        """
+        batches: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        with open(path, newline="") as f:
+            header = [name.strip() for name in next(csv.reader([f.readline()]))]
+            ts_idx = self._column(header, timestamp_column, path)
+            value_idx = self._column(header, value_column, path)
+            site_idx = None if site is not None else self._column(header, site_column, path)
+            while True:
+                lines = f.readlines(self.CSV_BATCH_BYTES)
+                if not lines:
+                    break
+                fields = self._csv_fields(lines, len(header), path)
+                timestamps = np.array(fields[ts_idx::len(header)], dtype="datetime64[m]")
+                values = np.array(fields[value_idx::len(header)], dtype=np.float64)
+                if site_idx is None:
+                    sites = np.full(timestamps.size, site)
+                else:
+                    sites = np.array(fields[site_idx::len(header)])
+                batches.append((sites, timestamps, values))
+        return self._store(batches, unit)
+
+    def ingest_parquet(self,
+                       path: str,
+                       site: Optional[str] = None,
+                       timestamp_column: str = "timestamp",
+                       value_column: str = "load_mw",
+                       site_column: str = "site",
+                       unit: str = "MW") -> Dict[str, int]:
+        """Parquet with the same columns as ingest_csv, read one row group at a time."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet ingestion requires pyarrow (pip install pyarrow).") from e
+
+        columns = [timestamp_column, value_column] + ([] if site is not None else [site_column])
+        parquet = pq.ParquetFile(path)
+        batches = []
+        for group in range(parquet.num_row_groups):
+            table = parquet.read_row_group(group, columns=columns)
+            timestamps = table.column(timestamp_column).to_numpy().astype("datetime64[m]")
+            values = table.column(value_column).to_numpy().astype(np.float64)
+            if site is None:
+                sites = np.asarray(table.column(site_column).to_numpy(), dtype=str)
+            else:
+                sites = np.full(len(values), site)
+            batches.append((sites, timestamps, values))
+        return self._store(batches, unit)
+
+    # --- Internals -----------------------------------------------------
+
+    def _store(self, batches: List[Tuple[np.ndarray, np.ndarray, np.ndarray]], unit: str) -> Dict[str, int]:
+        """Scatters parsed readings into each site's (days, 96) array, merging with stored history."""
+        scale = self.UNIT_SCALE.get(unit.upper())
+        if scale is None:
+            raise ValueError(f"Unknown load unit '{unit}'. Expected one of {tuple(self.UNIT_SCALE)}.")
+        if not batches:
+            return {}
+        sites = np.concatenate([b[0] for b in batches])
+        timestamps = np.concatenate([b[1] for b in batches])
+        values = np.concatenate([b[2] for b in batches]) * scale
+
+        os.makedirs(self.root, exist_ok=True)
+        self._refresh()  # merge into the latest history, whichever process wrote it
+        stored = {}
+        for site in np.unique(sites):
+            site = str(site)
+            if not self._SITE_PATTERN.match(site):
+                raise ValueError(f"Site id '{site}' may only contain letters, digits, '_', '-' and '.'.")
+            mask = sites == site
+            minutes = timestamps[mask]
+            day_index = minutes.astype("datetime64[D]")
+            blocks = (minutes - day_index).astype(int) // self.BLOCK_MINUTES
+            stored[site] = self._write_site(site, day_index, blocks, values[mask])
+
+        # Swapped in whole, so readers polling the index never parse a partial file.
+        index_path = os.path.join(self.root, self.INDEX_FILE)
+        with open(index_path + ".tmp", "w") as f:
+            json.dump(self._index, f, indent=2, sort_keys=True)
+        os.replace(index_path + ".tmp", index_path)
+        self._index_mtime = os.stat(index_path).st_mtime_ns
+        return stored
+
+    def _write_site(self, site: str, days: np.ndarray, blocks: np.ndarray, values: np.ndarray) -> int:
+        first, last = days.min(), days.max()
+        entry = self._index.get(site)
+        if entry is not None:
+            old_first = np.datetime64(entry["start"], "D")
+            first = min(first, old_first)
+            last = max(last, old_first + entry["days"] - 1)
+        num_days = int((last - first).astype(int)) + 1
+
+        # Write to a fresh file and swap it in, so open readers never see a partial array.
+        path = self._path(site)
+        staging = path + ".tmp"
+        data = np.lib.format.open_memmap(staging, mode="w+", dtype=np.float32, shape=(num_days, self.BLOCKS_PER_DAY))
+        data[:] = np.nan
+        if entry is not None:
+            offset = int((np.datetime64(entry["start"], "D") - first).astype(int))
+            data[offset:offset + entry["days"]] = self._array(site)
+        # Duplicate readings for a block: the last one in file order is kept.
+        data[(days - first).astype(int), blocks] = values
+        data.flush()
+        del data
+
+        self._maps.pop(site, None)
+        os.replace(staging, path)
+        self._index[site] = {"start": str(first), "days": num_days}
+        return int(values.size)
+
+    def _array(self, site: str) -> np.ndarray:
+        if site not in self._maps:
+            self._entry(site)
+            self._maps[site] = np.load(self._path(site), mmap_mode="r")
+        return self._maps[site]
+
+    def _refresh(self):
+        """Reloads the index (and drops open maps, whose files may have been swapped) if it changed on disk."""
+        index_path = os.path.join(self.root, self.INDEX_FILE)
+        try:
+            mtime = os.stat(index_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._index_mtime:
+            return
+        index = {}
+        if mtime is not None:
+            with open(index_path) as f:
+                index = json.load(f)
+        self._index, self._maps, self._index_mtime = index, {}, mtime
+
+    def _entry(self, site: str) -> Dict[str, Any]:
+        self._refresh()
+        if site not in self._index:
+            raise ValueError(f"Unknown site '{site}'. Stored sites: {self.sites()}.")
+        return self._index[site]
+
+    def _path(self, site: str) -> str:
+        return os.path.join(self.root, f"{site}.f32.npy")
+
+    @staticmethod
+    def _csv_fields(lines: List[str], width: int, path: str) -> List[str]:
+        """Row-major cells of a block of CSV lines; plain blocks skip the csv module."""
+        block = "".join(lines).replace("\r", "").rstrip("\n")
+        if '"' not in block and "\n\n" not in block:
+            fields = block.replace("\n", ",").split(",")
+            if len(fields) == width * (block.count("\n") + 1):
+                return fields
+        rows = [row for row in csv.reader(io.StringIO(block)) if row]
+        if any(len(row) != width for row in rows):
+            raise ValueError(f"'{path}' has rows that do not match its {width}-column header.")
+        return [cell for row in rows for cell in row]
+
+    @staticmethod
+    def _column(header: List[str], name: str, path: str) -> int:
+        if name not in header:
+            raise ValueError(f"Column '{name}' not found in '{path}' (columns: {header}).")
+        return header.index(name)
+
+    @staticmethod
+    def _to_day(value: DateLike) -> np.datetime64:
+        return np.datetime64(value, "D") if not isinstance(value, str) else np.datetime64(value[:10], "D")
@@ -1,6 +1,6 @@
 import numpy as np
-from typing import Dict, Any, List
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, asdict
 
 @dataclass
 class BESSConfig:
@@ -12,6 +12,98 @@ class BESSConfig:
     initial_soc: float = 0.5
     degradation_cost_per_cycle_inr: float = 5000.0 # Estimated cost of wear
 
+class _DispatchKernel:
+    """
+    In-place threshold dispatch over a batch of paths.
+
+    State lives in preallocated buffers of `shape`: (N,) for one configuration,
+    or (C, N) when the config parameters are (C, 1) columns, so C configurations
+    share one pass over the price paths. Each step() uses ufunc `out=` arguments
+    and 0/1 arithmetic masks, so the time loop allocates nothing.
+    """
+
+    STEP_H = 0.25
+
+    def __init__(self, price_paths: np.ndarray, params: Dict[str, Any], shape: Tuple[int, ...]):
+        self.price_paths = price_paths
+        self.p = params
+        self.current_soc = np.empty(shape)
+        self.current_soc[...] = params["initial_soc"]
+        self.current_energy_mwh = self.current_soc * params["capacity_mwh"]
+        self.cycle_count = np.zeros(shape)
+        self._set_thresholds()
+
+        # Scratch buffers reused by every step
+        self.charge_mw = np.empty(shape)
+        self.discharge_mw = np.empty(shape)
+        self.actions = np.empty(shape)
+        self.step_mwh = np.empty(shape)
+        self.mask = np.empty(shape, dtype=bool)
+        self.headroom_ok = np.empty(shape, dtype=bool)
+
+    def _set_thresholds(self):
+        # Dynamic Thresholding (Vectorized per path)
+        price_means = np.mean(self.price_paths, axis=1) # (N,)
+        self.charge_thresholds = price_means * 0.8
+        self.discharge_thresholds = price_means * 1.2
+
+    def advance(self, price_paths: np.ndarray):
+        """
+        Continues into the next day's (N, T) prices: SOC, stored energy and
+        cycle count carry over, and the thresholds follow the new day's means.
+        """
+        self.price_paths = price_paths
+        self._set_thresholds()
+
+    def step(self, t: int) -> np.ndarray:
+        """Advances every path by step t and returns the (shared) action buffer in MW."""
+        p = self.p
+        prices = self.price_paths[:, t]
+        soc, energy = self.current_soc, self.current_energy_mwh
+        charge_mw, discharge_mw = self.charge_mw, self.discharge_mw
+        mask, headroom_ok, step_mwh = self.mask, self.headroom_ok, self.step_mwh
+
+        # 1. Charge Logic: min(power, available capacity / step), zeroed off-signal
+        np.subtract(p["max_soc"], soc, out=charge_mw)
+        charge_mw *= p["capacity_mwh"]
+        charge_mw /= self.STEP_H
+        np.minimum(charge_mw, p["power_mw"], out=charge_mw)
+        np.less(prices, self.charge_thresholds, out=mask)
+        np.less(soc, p["max_soc"], out=headroom_ok)
+        mask &= headroom_ok
+        charge_mw *= mask
+
+        # 2. Discharge Logic: min(power, available energy / step), zeroed off-signal
+        np.subtract(soc, p["min_soc"], out=discharge_mw)
+        discharge_mw *= p["capacity_mwh"]
+        discharge_mw /= self.STEP_H
+        np.minimum(discharge_mw, p["power_mw"], out=discharge_mw)
+        np.greater(prices, self.discharge_thresholds, out=mask)
+        np.greater(soc, p["min_soc"], out=headroom_ok)
+        mask &= headroom_ok
+        discharge_mw *= mask
+
+        # Net action: +ive charge, -ive discharge (the signals are mutually exclusive)
+        np.subtract(charge_mw, discharge_mw, out=self.actions)
+
+        # Update Physics: efficiency applies to charged energy only
+        np.multiply(charge_mw, self.STEP_H, out=step_mwh)
+        np.divide(step_mwh, p["capacity_mwh"], out=charge_mw)
+        self.cycle_count += charge_mw
+        step_mwh *= p["round_trip_efficiency"]
+        energy += step_mwh
+        np.multiply(discharge_mw, self.STEP_H, out=step_mwh)
+        energy -= step_mwh
+
+        # Enforce Hard Physics Constraints
+        np.divide(energy, p["capacity_mwh"], out=soc)
+        np.clip(soc, p["min_soc"], p["max_soc"], out=soc)
+        np.multiply(soc, p["capacity_mwh"], out=energy)
+        return self.actions
+
+    def degradation_inr(self) -> np.ndarray:
+        return self.cycle_count * self.p["degradation_cost_per_cycle_inr"]
+
 class BESSSimulator:
     """
     Axiom 40: Latent Multi-Physics BESS Model
@@ -31,78 +123,91 @@ class BESSSimulator:
         self.cycle_count = 0.0
         self.degradation_accumulated_inr = 0.0
 
-    def simulate_dispatch(self, price_paths: np.ndarray, load_profiles_mw: np.ndarray) -> Dict[str, np.ndarray]:
+    def simulate_dispatch(self,
+                          price_paths: np.ndarray,
+                          load_profiles_mw: np.ndarray,
+                          record_paths: Optional[Sequence[int]] = None) -> Dict[str, np.ndarray]:
         """
         Axiom 50: Hyper-Scale Vectorized Dispatch.
         
         Processes all stochastic paths (N) simultaneously across time steps (T).
-        Input shapes: (N, T)
+        Input shapes: prices (N, T); load (N, T) or a shared (T,) profile.
+
+        The time loop runs in place on preallocated buffers (_DispatchKernel),
+        so the only (N, T) output is net_load_mw. `record_paths` limits the
+        bess_action_mw / soc_trail trails to those path indices (rows in the
+        given order); by default every path is recorded.
         """
         n_paths, t_steps = price_paths.shape
-        
-        # Initialize Tensors
-        bess_action_mw = np.zeros((n_paths, t_steps))
-        soc_trail = np.zeros((n_paths, t_steps))
-        
-        # Current state per path
-        current_soc = np.full(n_paths, self.config.initial_soc)
-        current_energy_mwh = current_soc * self.config.capacity_mwh
-        cycle_count = np.zeros(n_paths)
+        trail_idx = np.arange(n_paths) if record_paths is None else np.asarray(record_paths, dtype=np.intp)
+        kernel = self.kernel(price_paths)
 
-        # Dynamic Thresholding (Vectorized per path)
-        # We can use a rolling mean or global mean per path
-        price_means = np.mean(price_paths, axis=1) # (N,)
-        charge_thresholds = price_means * 0.8
-        discharge_thresholds = price_means * 1.2
+        # Outputs
+        net_load_mw = np.empty((n_paths, t_steps))
+        bess_action_mw = np.empty((trail_idx.size, t_steps))
+        soc_trail = np.empty((trail_idx.size, t_steps))
 
         for t in range(t_steps):
-            prices = price_paths[:, t]
-            
-            # Logic Masks (N, )
-            wants_charge = (prices < charge_thresholds) & (current_soc < self.config.max_soc)
-            wants_discharge = (prices > discharge_thresholds) & (current_soc > self.config.min_soc)
-
-            # 1. Charge Logic (Vectorized)
-            avail_cap = (self.config.max_soc - current_soc) * self.config.capacity_mwh
-            charge_power = np.minimum(self.config.power_mw, avail_cap / 0.25)
-            
-            # 2. Discharge Logic (Vectorized)
-            avail_energy = (current_soc - self.config.min_soc) * self.config.capacity_mwh
-            discharge_power = np.minimum(self.config.power_mw, avail_energy / 0.25)
-
-            # Calculate Net Actions
-            actions = np.zeros(n_paths)
-            actions[wants_charge] = charge_power[wants_charge]
-            actions[wants_discharge] = -discharge_power[wants_discharge]
-
-            # Update Physics (Vectorized)
-            # Energy Change: +ive for charge (efficiency applied), -ive for discharge
-            energy_change = np.where(actions > 0, 
-                                     actions * 0.25 * self.config.round_trip_efficiency, 
-                                     actions * 0.25)
-            
-            current_energy_mwh += energy_change
-            current_soc = current_energy_mwh / self.config.capacity_mwh
-            
-            # Enforce Hard Physics Constraints
-            current_soc = np.clip(current_soc, self.config.min_soc, self.config.max_soc)
-            current_energy_mwh = current_soc * self.config.capacity_mwh
+            actions = kernel.step(t)
 
             # Tracking
-            bess_action_mw[:, t] = actions
-            soc_trail[:, t] = current_soc
-            cycle_count += np.where(actions > 0, (actions * 0.25) / self.config.capacity_mwh, 0)
+            np.add(load_profiles_mw[..., t], actions, out=net_load_mw[:, t])
+            bess_action_mw[:, t] = actions[trail_idx]
+            soc_trail[:, t] = kernel.current_soc[trail_idx]
 
-        degradation_inr = cycle_count * self.config.degradation_cost_per_cycle_inr
+        degradation_inr = kernel.degradation_inr()
         
         return {
             "bess_action_mw": bess_action_mw,
             "soc_trail": soc_trail,
-            "net_load_mw": load_profiles_mw + bess_action_mw,
+            "trail_paths": trail_idx,
+            "net_load_mw": net_load_mw,
             "path_degradation_inr": degradation_inr,
             "mean_degradation_inr": np.mean(degradation_inr)
         }
 
+    def kernel(self, price_paths: np.ndarray) -> _DispatchKernel:
+        """Step-wise kernel for this config over all paths (used by fused asset pipelines)."""
+        return _DispatchKernel(price_paths, asdict(self.config), (price_paths.shape[0],))
+
+    @staticmethod
+    def sweep_dispatch(price_paths: np.ndarray,
+                       configs: Sequence[BESSConfig],
+                       tariff_weights: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Dispatches C configurations against the same (N, T) price paths in one
+        pass (config batch axis). Instead of C net-load tensors it returns the
+        per-path totals the bill is linear in, each of shape (C, N):
+        - energy_shift_kwh: sum_t action_t * 250 (net energy added by the battery)
+        - priced_shift_inr: sum_t w_t * price_t * action_t * 250 (at market price,
+          weighted by the tariff's (T,) ToD weights when given)
+        - path_degradation_inr
+        """
+        n_paths, t_steps = price_paths.shape
+        weights = np.ones(t_steps) if tariff_weights is None else tariff_weights
+        fields = [asdict(c) for c in configs]
+        params = {key: np.array([f[key] for f in fields], dtype=np.float64)[:, np.newaxis] for key in fields[0]}
+        kernel = _DispatchKernel(price_paths, params, (len(configs), n_paths))
+
+        energy_shift_kwh = np.zeros((len(configs), n_paths))
+        priced_shift_inr = np.zeros((len(configs), n_paths))
+        scratch = np.empty((len(configs), n_paths))
+        for t in range(t_steps):
+            actions = kernel.step(t)
+            energy_shift_kwh += actions
+            np.multiply(actions, price_paths[:, t], out=scratch)
+            scratch *= weights[t]
+            priced_shift_inr += scratch
+
+        # Per-block energy: 15-min blocks of MW -> kWh (matches TariffEngine's 250x)
+        energy_shift_kwh *= 250.0
+        priced_shift_inr *= 250.0
+        return {
+            "energy_shift_kwh": energy_shift_kwh,
+            "priced_shift_inr": priced_shift_inr,
+            "path_degradation_inr": kernel.degradation_inr()
+        }
+
     def reset(self):
         self.soc = self.config.initial_soc
         self.energy_stored_mwh = self.config.capacity_mwh * self.soc
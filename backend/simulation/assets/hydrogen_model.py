@@ -1,6 +1,6 @@
 import numpy as np
-from typing import Dict, Any, List
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, asdict
 
 @dataclass
 class HydrogenConfig:
@@ -10,6 +10,61 @@ class HydrogenConfig:
     ramp_up_limit_mw_per_min: float = 0.5 # Slower than BESS
     ramp_down_limit_mw_per_min: float = 1.0
     efficiency_kwh_per_kg_h2: float = 55.0 # Energy intensity
+    break_even_inr_per_kwh: float = 3.5 # Runs only below this price (Mocked @ ₹3.5/kWh for research)
+
+class _ElectrolyzerKernel:
+    """
+    In-place break-even dispatch with ramp and min-stable-load limits.
+
+    State has `shape`: (N,) for one configuration, or (G, N) when the power
+    rating and break-even price are (G, 1) columns, so a whole sensitivity grid
+    walks the price paths once. Scratch buffers are reused every step.
+    """
+
+    def __init__(self, price_paths: np.ndarray, params: Dict[str, Any], shape: Tuple[int, ...]):
+        self.price_paths = price_paths
+        self.p = params
+        # Ramp Constraints (15-min blocks = 15 * ramp_per_min)
+        self.max_ramp_up = params["ramp_up_limit_mw_per_min"] * 15
+        self.max_ramp_down = params["ramp_down_limit_mw_per_min"] * 15
+        self.min_stable_mw = params["power_rating_mw"] * params["min_stable_load_pct"]
+
+        self.current_load_mw = np.zeros(shape)
+        self.production_kg_h2 = np.zeros(shape)
+        self.lower = np.empty(shape)
+        self.upper = np.empty(shape)
+        self.step_kg = np.empty(shape)
+        self.mask = np.empty(shape, dtype=bool)
+
+    def advance(self, price_paths: np.ndarray):
+        """Continues into the next day's (N, T) prices; the load (ramp state) and production carry over."""
+        self.price_paths = price_paths
+
+    def step(self, t: int) -> np.ndarray:
+        """Advances every path by step t and returns the electrolyzer load buffer in MW."""
+        p = self.p
+        load = self.current_load_mw
+        prices = self.price_paths[:, t]
+
+        # Ramp window around the previous load, read before it is overwritten
+        np.subtract(load, self.max_ramp_down, out=self.lower)
+        np.add(load, self.max_ramp_up, out=self.upper)
+
+        # Target Load based on price signal, clipped to the ramp window
+        np.less(prices, p["break_even_inr_per_kwh"], out=self.mask)
+        np.multiply(self.mask, p["power_rating_mw"], out=load)
+        np.clip(load, self.lower, self.upper, out=load)
+
+        # Apply Min Stable Load Constraint (Purge vs Run)
+        np.greater_equal(load, self.min_stable_mw, out=self.mask)
+        load *= self.mask
+
+        # Daily Production: energy (MWh) / efficiency (kWh/kg)
+        np.multiply(load, 0.25, out=self.step_kg)
+        self.step_kg *= 1000
+        self.step_kg /= p["efficiency_kwh_per_kg_h2"]
+        self.production_kg_h2 += self.step_kg
+        return load
 
 class HydrogenSimulator:
     """
@@ -26,49 +81,70 @@ class HydrogenSimulator:
         """
         Axiom 70: Vectorized Hydrogen Dispatch.
         
-        Logic: Operates when prices are below a critical "Green H2 Break-even".
+        Logic: Operates when prices are below the configured break-even price.
         Constraints: Hard ramp rates and minimum stable load.
+        Load may be (N, T) or a shared (T,) profile.
         """
         n_paths, t_steps = price_paths.shape
+        kernel = self.kernel(price_paths)
         
         # Initialize Tensors
-        h2_load_mw = np.zeros((n_paths, t_steps))
-        production_kg_h2 = np.zeros(n_paths)
-        
-        # Current state per path
-        current_load_mw = np.zeros(n_paths)
-        
-        # H2 Break-even Threshold (Mocked @ ₹3.5/kWh for research)
-        h2_break_even = 3.5
+        h2_load_mw = np.empty((n_paths, t_steps))
+        net_load_mw = np.empty((n_paths, t_steps))
 
         for t in range(t_steps):
-            prices = price_paths[:, t]
-            
-            # Target Load based on price signal
-            target_load_mw = np.where(prices < h2_break_even, self.config.power_rating_mw, 0.0)
-            
-            # Apply Ramp Constraints (15-min blocks = 15 * ramp_per_min)
-            max_ramp_up = self.config.ramp_up_limit_mw_per_min * 15
-            max_ramp_down = self.config.ramp_down_limit_mw_per_min * 15
-            
-            potential_load = np.clip(target_load_mw, 
-                                     current_load_mw - max_ramp_down,
-                                     current_load_mw + max_ramp_up)
-            
-            # Apply Min Stable Load Constraint (Purge vs Run)
-            is_above_min = potential_load >= (self.config.power_rating_mw * self.config.min_stable_load_pct)
-            actual_load = np.where(is_above_min, potential_load, 0.0)
+            actual_load = kernel.step(t)
             
             # Physics Tracking
             h2_load_mw[:, t] = actual_load
-            # Daily Production: energy (MWh) / efficiency (kWh/kg)
-            production_kg_h2 += (actual_load * 0.25 * 1000) / self.config.efficiency_kwh_per_kg_h2
-            
-            current_load_mw = actual_load
+            np.add(load_profiles_mw[..., t], actual_load, out=net_load_mw[:, t])
 
         return {
             "asset_load_mw": h2_load_mw,
-            "net_load_mw": load_profiles_mw + h2_load_mw,
-            "total_production_kg": production_kg_h2,
-            "mean_production_kg": np.mean(production_kg_h2)
+            "net_load_mw": net_load_mw,
+            "total_production_kg": kernel.production_kg_h2,
+            "mean_production_kg": np.mean(kernel.production_kg_h2)
+        }
+
+    def kernel(self, price_paths: np.ndarray) -> _ElectrolyzerKernel:
+        """Step-wise kernel for this config over all paths (used by fused asset pipelines)."""
+        return _ElectrolyzerKernel(price_paths, asdict(self.config), (price_paths.shape[0],))
+
+    def sweep_dispatch(self,
+                       price_paths: np.ndarray,
+                       break_evens_inr_per_kwh: Sequence[float],
+                       power_ratings_mw: Sequence[float],
+                       tariff_weights: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Break-even x rating sensitivity in one time walk over shared price paths.
+        Returns per-path totals of shape (B, R, N): electrolyzer energy_kwh,
+        priced_energy_inr (at market price, weighted by the tariff's (T,) ToD
+        weights when given; the bill is linear in both) and production_kg.
+        """
+        n_paths, t_steps = price_paths.shape
+        weights = np.ones(t_steps) if tariff_weights is None else tariff_weights
+        grid = (len(break_evens_inr_per_kwh), len(power_ratings_mw))
+        params = asdict(self.config)
+        params["break_even_inr_per_kwh"] = np.repeat(np.asarray(break_evens_inr_per_kwh, dtype=np.float64), grid[1])[:, np.newaxis]
+        params["power_rating_mw"] = np.tile(np.asarray(power_ratings_mw, dtype=np.float64), grid[0])[:, np.newaxis]
+        kernel = _ElectrolyzerKernel(price_paths, params, (grid[0] * grid[1], n_paths))
+
+        energy_kwh = np.zeros((grid[0] * grid[1], n_paths))
+        priced_energy_inr = np.zeros((grid[0] * grid[1], n_paths))
+        scratch = np.empty((grid[0] * grid[1], n_paths))
+        for t in range(t_steps):
+            load = kernel.step(t)
+            energy_kwh += load
+            np.multiply(load, price_paths[:, t], out=scratch)
+            scratch *= weights[t]
+            priced_energy_inr += scratch
+
+        # 15-min blocks of MW -> kWh (matches TariffEngine's 250x)
+        energy_kwh *= 250.0
+        priced_energy_inr *= 250.0
+        shape = grid + (n_paths,)
+        return {
+            "energy_kwh": energy_kwh.reshape(shape),
+            "priced_energy_inr": priced_energy_inr.reshape(shape),
+            "production_kg": kernel.production_kg_h2.reshape(shape)
         }
@@ -1,138 +1,427 @@
-from typing import Dict, Any, List
-from core.assumptions.registry import params
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace, astuple
+from core.assumptions.registry import params, AssumptionSet
 from backend.simulation.monte_carlo import MonteCarloEngine
+from backend.simulation.random_streams import RandomStreams
+from backend.simulation.shock_bank import ShockBank, BankedStreams
 from backend.simulation.load_profiles import LoadProfileGenerator
-from backend.tariffs.engine import TariffEngine
+from backend.simulation.summaries import CostSummary
+from backend.simulation import variance_reduction as vr
+from backend.simulation import confidence
+from backend.tariffs.engine import TariffEngine, CompiledTariffs, BLOCKS_PER_DAY
 from backend.insights.rules import InsightEngine
-from backend.data.connector import market_connector
-from backend.data.global_registry import market_registry
+from backend.data.global_registry import market_registry, MarketData
 from backend.simulation.assets.bess_model import BESSSimulator, BESSConfig
 from backend.simulation.assets.hydrogen_model import HydrogenSimulator, HydrogenConfig
+from backend.simulation.assets.pipeline import AssetPipeline
+from backend.simulation.stage_cache import StageCache, digest
 import numpy as np
 
+@dataclass
+class _RunContext:
+    """Inputs shared by every chunk of a single run."""
+    assumptions: AssumptionSet
+    streams: RandomStreams
+    load_profile_mw: np.ndarray
+    market_mark: MarketData
+    price_anchor: float
+    contract_demand_kva: float
+    with_asset: bool
+    asset_type: str
+    assets: Tuple[str, ...] = ()
+    tariff: Optional[TariffEngine] = None  # the run's own tariff: self.tariff_engine is shared across requests
+    state_tariffs: Optional[CompiledTariffs] = None
+    variance_reduction: Optional[str] = None
+    sampler: str = "pseudo"
+    shock_shift: Optional[np.ndarray] = None
+    billing_days: Optional[int] = None
+    load_noise: Optional[float] = None
+    seeded: bool = False  # pinned seed and anchor: only runs that can repeat are worth caching
+    summarized: bool = False  # streaming/sharded: chunks are folded and dropped, so not cached either
+    shock_bank: Optional[Tuple[str, int]] = None  # (bank id, offset) when price shocks replay a bank
+
+@dataclass
+class _RunTotals:
+    """Mergeable per-path aggregates of a run, or of one shard of it."""
+    summary: CostSummary = field(default_factory=CostSummary)
+    state_summaries: List[CostSummary] = field(default_factory=list)
+    asset_impact: Optional[Dict[str, Any]] = None
+    degradation_inr: float = 0.0
+    production_kg: float = 0.0
+    peak_window_inr: float = 0.0
+    max_demand_kva: float = 0.0
+    billing_demand_kva: float = 0.0
+    over_contract: int = 0
+
+    @classmethod
+    def for_run(cls, ctx: _RunContext) -> "_RunTotals":
+        return cls(state_summaries=[CostSummary() for _ in ctx.state_tariffs.codes] if ctx.state_tariffs else [])
+
+    def merge(self, other: "_RunTotals"):
+        """Folds in the totals of the following paths (merge shards in path order)."""
+        self.summary.merge(other.summary)
+        for mine, theirs in zip(self.state_summaries, other.state_summaries):
+            mine.merge(theirs)
+        if self.asset_impact is None:
+            self.asset_impact = other.asset_impact
+        self.degradation_inr += other.degradation_inr
+        self.production_kg += other.production_kg
+        self.peak_window_inr += other.peak_window_inr
+        self.max_demand_kva += other.max_demand_kva
+        self.billing_demand_kva += other.billing_demand_kva
+        self.over_contract += other.over_contract
+
+def _check_path_counts(num_scenarios: int, chunk_size: Optional[int] = None):
+    """Rejects empty path sets and non-positive chunk sizes before anything is allocated."""
+    if num_scenarios is None or num_scenarios < 1:
+        raise ValueError(f"num_scenarios (paths) must be at least 1, got {num_scenarios}.")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive number of paths, got {chunk_size}.")
+
 class SimulationEngine:
     """
     Scenario Comparator Engine (Axiom 70: Multi-Physics)
-    
+
     Responsibility: Compare baseline load exposure against counterfactual latent asset scenarios.
     """
-    
-    def __init__(self):
+
+    # Paths per chunk when streaming without an explicit chunk_size.
+    DEFAULT_STREAM_CHUNK = 10000
+    # Paths per batch in adaptive mode without an explicit chunk_size.
+    DEFAULT_ADAPTIVE_BATCH = 500
+    # Shock-space shift (in standard deviations) for tail sampling. z_0.99 = 2.326
+    # is optimal for a bare load; BESS dispatch bends the tail off the linear
+    # bill direction, and a milder shift keeps more of its paths informative.
+    DEFAULT_TAIL_SHIFT = 1.75
+    # Config x path cells dispatched per pass in a BESS sizing sweep (bounds scratch memory).
+    DEFAULT_SWEEP_CELLS = 2_000_000
+    # raw_costs as a JSON-ready list, or the ndarray for binary/summary encoders
+    RAW_COSTS_FORMATS = ("list", "array")
+    # Byte budget of the stage cache (0 disables it).
+    DEFAULT_CACHE_BYTES = 256 << 20
+    # Paths per shard of a multi-process run without an explicit chunk_size. Shard
+    # bounds never depend on the worker count, so neither does the merged result.
+    DEFAULT_SHARD_SIZE = 2048
+
+    def __init__(self, cache_bytes: int = DEFAULT_CACHE_BYTES):
         self.tariff_engine = TariffEngine()
         self.load_generator = LoadProfileGenerator()
         self.bess_sim = BESSSimulator()
         self.h2_sim = HydrogenSimulator()
+        # Seeded runs reuse the stages an input change does not reach (e.g. prices and
+        # dispatch when only the tariff changes); see StageCache.
+        self.stage_cache = StageCache(cache_bytes)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = 0
+        self._pool_lock = threading.Lock()
 
-    def run_simulation(self, 
-                       state_code: str = "MH_MSEDCL_HT", 
-                       category: str = "Industrial", 
-                       load_mw: float = 1.0, 
+    def run_simulation(self,
+                       state_code: str = "MH_MSEDCL_HT",
+                       category: str = "Industrial",
+                       load_mw: float = 1.0,
                        num_scenarios: int = 1000,
                        shift_type: str = "1_SHIFT_DAY",
                        market_code: str = "IN_IEX",
                        with_asset: bool = True,
                        asset_type: str = "BESS",
+                       seed: Optional[int] = None,
+                       chunk_size: Optional[int] = None,
+                       price_anchor: Optional[float] = None,
+                       streaming: bool = False,
+                       variance_reduction: Optional[str] = None,
+                       sampler: str = "pseudo",
+                       adaptive: bool = False,
+                       rel_tol: float = 5e-4,
+                       time_budget_s: Optional[float] = None,
+                       tail_sampling: bool = False,
+                       tail_shift: float = DEFAULT_TAIL_SHIFT,
+                       load_profile_mw: Optional[np.ndarray] = None,
+                       compare_states: Optional[Sequence[str]] = None,
+                       billing_days: Optional[int] = None,
+                       load_noise: Optional[float] = None,
+                       shared_prices: Optional[np.ndarray] = None,
+                       workers: Optional[int] = None,
+                       shock_bank: Optional[ShockBank] = None,
+                       bank_offset: int = 0,
+                       progress: Optional[Callable[[int, int, Optional[Dict[str, Any]]], None]] = None,
+                       raw_costs_format: str = "list",
                        **kwargs) -> Dict[str, Any]:
         """
         Runs a multi-physics hyper-scale counterfactual risk comparison study.
+
+        `seed` pins every random stream (reported back in meta when omitted).
+        `chunk_size` generates price paths in blocks of that many paths; the
+        result is bit-identical to a single-block run with the same seed.
+        `price_anchor` replays a recorded market mark instead of the live pulse.
+        `streaming` generates, dispatches and bills one chunk at a time and folds
+        costs into mergeable summaries, so peak memory scales with chunk_size
+        rather than num_scenarios (billing builds a few chunk_size x 96 float64
+        temporaries per ToD weighting). Quantiles then come from a relative-error
+        sketch and raw_costs is not returned.
+        `variance_reduction` ("antithetic" or "control_variate") tightens the
+        expected cost and tail estimates and reports the achieved variance
+        reduction factors; it needs the full per-path cost vector.
+        `sampler` selects "pseudo" (i.i.d.) or "sobol" (scrambled Sobol with a
+        Brownian-bridge ordering) shocks.
+        `adaptive` runs batches of chunk_size paths until the 95% confidence
+        intervals of the expected cost and P95 are within `rel_tol` (relative
+        half-width), `time_budget_s` elapses, or num_scenarios paths have run.
+        `tail_sampling` tilts the shocks by `tail_shift` standard deviations along
+        the bill's steepest direction and reweights paths by likelihood ratio,
+        so far more paths land beyond P99 (reported with CVaR and effective
+        sample size).
+        `load_profile_mw` replaces the synthetic shift profile with a given (T,)
+        profile, e.g. a metered slice from IntervalStore.period().
+        The profile is shared by every path and broadcast, never copied per path.
+        `load_noise` adds per-path load uncertainty (Gaussian, this fraction of
+        the load per block), drawn chunk by chunk from its own stream.
+        `shared_prices` is the run's (num_scenarios, T) price paths, already
+        generated for this seed and anchor (see run_batch); plain draws only.
+        `asset_type` names one asset or a stack behind the same meter
+        ("BESS+HYDROGEN"), dispatched together in a single time walk (the
+        order of the stack affects only rounding).
+        `compare_states` (tariff codes, or "all") also bills each of those states
+        against the same price/load tensors, sharing one energy-cost reduction,
+        and reports a per-state distribution under financials["state_comparison"].
+        `billing_days` (28-31) bills a whole month instead of one day: the paths
+        are walked day by day with OU prices and asset state carried across
+        midnight, energy charges accumulate per day, and the demand charge is
+        levied once on each path's maximum demand. Only one day of prices and
+        net load is held per chunk. `load_profile_mw` may then be a single day,
+        repeated, or the whole period.
+        `workers` splits the paths into shards of chunk_size (default
+        DEFAULT_SHARD_SIZE) and runs the whole pipeline for each shard in a
+        pool of that many processes. Shards return mergeable summaries, so
+        financials are reported as in streaming mode; for a given seed and
+        chunk_size they match a streaming run whatever the worker count.
+        `shock_bank` scales and integrates stored standard shocks (path i reads
+        bank row `bank_offset` + i) instead of drawing them; other stages still
+        follow the seed. Pseudo-random single-day runs only.
+        `progress(paths_done, num_scenarios, estimate)` is called after every
+        chunk (or shard) with the running estimate so far (see
+        _running_estimate; None under tail sampling, whose paths are weighted).
+        An exception it raises aborts the run, e.g. to cancel a job.
+        `raw_costs_format` "array" returns raw_costs as the float64 ndarray
+        (None when not kept) instead of a list, for callers that encode it
+        themselves (see backend.api.result_formats).
         """
-        assumptions = params.get_latest()
+        _check_path_counts(num_scenarios, chunk_size)
+        assets = AssetPipeline.parse(asset_type) if with_asset else ()
+        if raw_costs_format not in self.RAW_COSTS_FORMATS:
+            raise ValueError(f"Unknown raw_costs_format '{raw_costs_format}'. Expected one of {self.RAW_COSTS_FORMATS}.")
+        if variance_reduction is not None:
+            if variance_reduction not in vr.MODES:
+                raise ValueError(f"Unknown variance reduction mode '{variance_reduction}'. Expected one of {vr.MODES}.")
+            if streaming:
+                raise ValueError("Variance reduction needs the full cost vector and cannot run in streaming mode.")
+        if adaptive and streaming:
+            raise ValueError("Adaptive mode needs exact order statistics and cannot run in streaming mode.")
+        if tail_sampling and (streaming or adaptive or variance_reduction is not None):
+            raise ValueError("Tail sampling reweights paths and cannot be combined with streaming, adaptive or variance reduction modes.")
+        if compare_states is not None and tail_sampling:
+            raise ValueError("State comparison reports unweighted distributions and cannot be combined with tail sampling.")
+        if load_noise is not None and load_noise < 0:
+            raise ValueError(f"load_noise must be a non-negative fraction of load, got {load_noise}.")
+        if shared_prices is not None:
+            if tail_sampling or billing_days is not None or variance_reduction == "antithetic":
+                raise ValueError("Shared price paths are plain one-day draws and cannot be used with tail sampling, antithetic pairs or billing_days.")
+            if shared_prices.shape != (num_scenarios, MonteCarloEngine().time_steps):
+                raise ValueError(f"shared_prices must have shape ({num_scenarios}, {MonteCarloEngine().time_steps}), got {shared_prices.shape}.")
+        if billing_days is not None:
+            if not 28 <= billing_days <= 31:
+                raise ValueError(f"billing_days must be between 28 and 31, got {billing_days}.")
+            if tail_sampling or variance_reduction == "control_variate" or compare_states is not None:
+                raise ValueError("Tail sampling, control variates and state comparison are single-day modes and cannot be combined with billing_days.")
+        if shock_bank is not None:
+            if sampler == "sobol" or billing_days is not None:
+                raise ValueError("Shock banks hold one day of pseudo-random shocks and cannot be used with the sobol sampler or billing_days.")
+            rows = (num_scenarios + 1) // 2 if variance_reduction == "antithetic" else num_scenarios
+            if bank_offset < 0 or bank_offset + rows > shock_bank.paths:
+                raise ValueError(f"Shock bank '{shock_bank.bank_id}' holds {shock_bank.paths:,} paths; "
+                                 f"{rows:,} rows from offset {bank_offset:,} do not fit.")
+        if workers is not None:
+            if workers < 1:
+                raise ValueError(f"workers must be a positive integer, got {workers}.")
+            if adaptive or variance_reduction is not None or tail_sampling or shared_prices is not None:
+                raise ValueError("Sharded runs merge per-shard summaries and cannot be combined with adaptive, variance reduction, tail sampling or shared prices.")
 
-        # 1. Physics: Generate Load Profile
-        load_profile_mw = self.load_generator.generate_industrial_profile(
-            base_load_mw=load_mw, 
-            shift_type=shift_type
+        cache_before = self.stage_cache.stats()
+        ctx = self._build_context(
+            load_mw, shift_type, market_code, seed, price_anchor, load_profile_mw,
+            with_asset=with_asset,
+            asset_type=asset_type,
+            assets=assets,
+            variance_reduction=variance_reduction,
+            sampler=sampler,
+            billing_days=billing_days,
+            load_noise=load_noise,
+            shock_bank=shock_bank,
+            bank_offset=bank_offset
         )
-        
-        # 2. Market Grounding
-        market_engine = market_registry.get_market(market_code)
-        market_mark = market_engine.get_latest_mark()
-        live_price_anchor = market_mark.price_inr_kwh
+        assumptions, streams = ctx.assumptions, ctx.streams
+        market_mark, live_price_anchor = ctx.market_mark, ctx.price_anchor
 
-        # 3. Stochastic Generation (Axiom 50: Vectorized Scaling)
-        mc_engine = MonteCarloEngine(num_scenarios=num_scenarios)
-        price_sim = mc_engine.generate_price_paths(
-            base_price=live_price_anchor,
-            volatility=assumptions.dam_volatility_sigma
-        )
-        scenarios = price_sim.scenarios 
+        # 5. Financial Exposure Mapping (Regulatory Reality)
+        ctx.tariff = TariffEngine(state_code)
+        if compare_states is not None:
+            ctx.state_tariffs = ctx.tariff.compiled(None if compare_states == "all" else list(compare_states))
+        if tail_sampling:
+            ctx.shock_shift = self._tail_shift(ctx, tail_shift)
 
-        # 4. Multi-Physics Asset Grounding (Counterfactual)
-        asset_impact = None
-        asset_results = None
-        sim_load_profiles_mw = np.tile(load_profile_mw, (num_scenarios, 1))
-        
-        if with_asset:
-            if asset_type == "BESS":
-                self.bess_sim.reset()
-                asset_results = self.bess_sim.simulate_dispatch(scenarios, sim_load_profiles_mw)
-                sim_load_profiles_mw = asset_results["net_load_mw"]
-                asset_impact = {
-                    "type": "BESS (4h Li-ion)",
-                    "soc_trail": asset_results["soc_trail"][0].tolist(),
-                    "mean_degradation_inr": float(asset_results["mean_degradation_inr"])
-                }
-            elif asset_type == "HYDROGEN":
-                asset_results = self.h2_sim.simulate_dispatch(scenarios, sim_load_profiles_mw)
-                sim_load_profiles_mw = asset_results["net_load_mw"]
-                asset_impact = {
-                    "type": "Hydrogen Electrolyzer",
-                    "production_kg": float(asset_results["mean_production_kg"]),
-                    "load_trail": asset_results["asset_load_mw"][0].tolist()
+        # 3-5. Generate, dispatch and bill chunk by chunk (Axiom 50: Vectorized Scaling)
+        if workers is not None:
+            block = chunk_size or self.DEFAULT_SHARD_SIZE
+        elif streaming:
+            block = chunk_size or min(num_scenarios, self.DEFAULT_STREAM_CHUNK)
+        elif adaptive:
+            block = chunk_size or min(num_scenarios, self.DEFAULT_ADAPTIVE_BATCH)
+        else:
+            block = chunk_size or num_scenarios
+
+        totals = _RunTotals.for_run(ctx)
+        cost_chunks: List[np.ndarray] = []
+        control_chunks: List[np.ndarray] = []
+        log_weight_chunks: List[np.ndarray] = []
+        state_chunks: List[np.ndarray] = []
+        stopped_by, elapsed_s = None, 0.0
+        summarized = streaming or workers is not None
+        ctx.summarized = summarized
+        started_at = time.perf_counter()
+
+        start = 0
+        if workers is not None:
+            totals = self._run_shards(ctx, num_scenarios, block, workers, progress)
+            start = num_scenarios
+        while start < num_scenarios:
+            stop = min(start + block, num_scenarios)
+            if billing_days:
+                chunk = self._simulate_period_chunk(ctx, start, stop)
+            elif shared_prices is not None:
+                chunk = self._simulate_chunk(ctx, start, stop, prices={"scenarios": shared_prices[start:stop], "log_weights": None})
+            else:
+                chunk = self._simulate_chunk(ctx, start, stop)
+            self._fold_chunk(ctx, chunk, start, totals)
+
+            if not streaming:
+                cost_chunks.append(chunk["costs"])
+                if "state_costs" in chunk:
+                    state_chunks.append(chunk["state_costs"])
+                if "control_costs" in chunk:
+                    control_chunks.append(chunk["control_costs"])
+                if chunk["log_weights"] is not None:
+                    log_weight_chunks.append(chunk["log_weights"])
+            start = stop
+            if progress is not None:
+                progress(start, num_scenarios, None if tail_sampling else self._running_estimate(totals.summary))
+
+            if adaptive:
+                elapsed_s = time.perf_counter() - started_at
+                stopped_by = self._adaptive_stop(totals.summary, rel_tol, time_budget_s, elapsed_s, done=start >= num_scenarios)
+                if stopped_by is not None:
+                    break
+
+        paths_run = start
+        summary = totals.summary
+
+        asset_impact = totals.asset_impact
+        if asset_impact is not None:
+            if "BESS" in assets:
+                asset_impact["mean_degradation_inr"] = totals.degradation_inr / paths_run
+            if "HYDROGEN" in assets:
+                asset_impact["production_kg"] = totals.production_kg / paths_run
+
+        if summarized:
+            costs = None
+            financials = {
+                "expected_cost_inr": float(summary.moments.mean),
+                "p05_inr": float(summary.quantile(0.05)),
+                "p95_inr": float(summary.quantile(0.95)),
+                "tail_risk_at_p99_inr": float(summary.quantile(0.99)),
+                "volatility": summary.moments.std,
+                "quantile_relative_error_bound": summary.sketch.relative_accuracy,
+            }
+        else:
+            costs = np.concatenate(cost_chunks)
+            financials = {
+                "expected_cost_inr": float(np.mean(costs)),
+                "p05_inr": float(np.percentile(costs, 5)),
+                "p95_inr": float(np.percentile(costs, 95)),
+                "tail_risk_at_p99_inr": float(np.percentile(costs, 99)),
+                "volatility": float(np.std(costs)),
+            }
+            if variance_reduction is not None:
+                control = self._control_variate(ctx, np.concatenate(control_chunks)) if control_chunks else None
+                financials.update(vr.estimate(costs, variance_reduction, control))
+                financials["variance_reduction"] = vr.variance_reduction_report(
+                    costs, variance_reduction, streams.generator("bootstrap"), control=control
+                )
+            if adaptive:
+                financials["adaptive"] = self._adaptive_report(costs, stopped_by, rel_tol, elapsed_s)
+            if tail_sampling:
+                weighted = vr.importance_estimate(costs, np.concatenate(log_weight_chunks))
+                ess = weighted.pop("effective_sample_size")
+                tail_ess = weighted.pop("tail_effective_sample_size")
+                financials.update(weighted)
+                financials["tail_sampling"] = {
+                    "shift_norm": tail_shift,
+                    "effective_sample_size": ess,
+                    "ess_fraction": ess / paths_run,
+                    "tail_effective_sample_size": tail_ess
                 }
 
-        # 5. Financial Exposure Mapping (Regulatory Reality)
-        self.tariff_engine.set_tariff(state_code)
-        
-        # Calculate Exposure (Vectorized over paths)
-        bill_results = self.tariff_engine.calculate_bill(
-            contract_demand_kva=load_mw * 1000 / 0.9,
-            price_scenarios=scenarios,
-            load_profile_mw=sim_load_profiles_mw
-        )
+        if ctx.state_tariffs is not None:
+            financials["state_comparison"] = self._state_comparison(
+                ctx.state_tariffs, totals.state_summaries, np.concatenate(state_chunks, axis=1) if state_chunks else None
+            )
 
-        costs = bill_results["total_estimated_bill"]
-        
-        # 6. Axiom 50: Extreme Tail Search
-        # Identify the single worst-case scenario
-        worst_idx = np.argmax(costs)
-        
-        # Guarded access for asset-specific metrics
-        bess_soc_at_peak = 0.0
-        if with_asset and asset_results:
-            peak_time_idx = np.argmax(scenarios[worst_idx])
-            bess_soc_at_peak = float(asset_results["soc_trail"][worst_idx][peak_time_idx])
-
-        tail_event = {
-            "path_index": int(worst_idx),
-            "max_price": float(np.max(scenarios[worst_idx])),
-            "peak_hour": int(np.argmax(scenarios[worst_idx])),
-            "cost_inr": float(costs[worst_idx]),
-            "bess_soc_at_peak": bess_soc_at_peak
-        }
+        if billing_days:
+            mean_billing_demand = totals.billing_demand_kva / paths_run
+            financials["billing_period"] = {
+                "days": billing_days,
+                "contract_demand_kva": ctx.contract_demand_kva,
+                "mean_max_demand_kva": totals.max_demand_kva / paths_run,
+                "mean_billing_demand_kva": mean_billing_demand,
+                # Pre-duty demand charge on the mean billing demand
+                "mean_demand_charge_inr": mean_billing_demand * ctx.tariff.structure["fixed_charges_inr_per_kva"],
+                "over_contract_fraction": totals.over_contract / paths_run
+            }
 
-        financials = {
-            "expected_cost_inr": float(np.mean(costs)),
-            "p05_inr": float(np.percentile(costs, 5)),
-            "p95_inr": float(np.percentile(costs, 95)),
-            "tail_risk_at_p99_inr": float(np.percentile(costs, 99)),
-            "volatility": float(np.std(costs)),
-            "tail_event": tail_event,
+        financials.update({
+            # Mean ToD energy charge inside the tariff's peak windows (pre-duty)
+            "peak_window_exposure_inr": totals.peak_window_inr / paths_run,
+            "tail_event": summary.worst,
             "market": {
                 "anchor": live_price_anchor,
                 "source": market_mark.source,
                 "currency": market_mark.currency
             }
-        }
+        })
 
         # 7. Causal Insight Generation
         meta_data = {
             "state": state_code,
             "category": category,
             "asset_present": with_asset,
-            "paths": num_scenarios
+            "paths": paths_run,
+            "seed": streams.seed,
+            "price_anchor": live_price_anchor,  # replay with the seed to reproduce the run
+            "assumptions_version": assumptions.version_id,
+            "mode": "sharded" if workers is not None else ("streaming" if streaming else ("adaptive" if adaptive else "full")),
+            "sampler": sampler,
+            "chunk_size": block,
+            "workers": workers,
+            "billing_days": billing_days,
+            "load_noise": load_noise,
+            "shock_bank": None if shock_bank is None else {
+                "id": shock_bank.bank_id, "offset": bank_offset, "digest": shock_bank.digest
+            },
+            "stage_cache": self._cache_report(cache_before)
         }
-        
+
         insight_engine = InsightEngine()
         report = insight_engine.generate_insights(financials, meta_data)
 
@@ -141,10 +430,963 @@ class SimulationEngine:
             "financials": financials,
             "asset_analysis": asset_impact,
             "insights": report,
-            "raw_costs": costs.tolist(),
+            "raw_costs": costs if raw_costs_format == "array" else (costs.tolist() if costs is not None else []),
             "distribution": {
                 "p05": financials["p05_inr"],
                 "p50": financials["expected_cost_inr"],
                 "p95": financials["p95_inr"]
             }
         }
+
+    def run_batch(self, requests: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Runs many run_simulation requests (keyword dicts), sharing price paths.
+
+        Requests are grouped by (market, assumptions version, seed, path count,
+        sampler, price anchor, shock bank and offset); each group's paths are generated once and every
+        member is dispatched and billed against them. Unseeded requests in a
+        group share one fresh seed, and an unpinned anchor is read from the
+        market once per group; both are reported in each result's meta.
+        Tail-sampled, antithetic, billing-period and sharded requests draw
+        their own paths. Results come back in input order.
+        """
+        version = params.get_latest().version_id
+        groups: Dict[Tuple, List[int]] = {}
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+
+        for i, request in enumerate(requests):
+            try:
+                _check_path_counts(request.get("num_scenarios", 1000), request.get("chunk_size"))
+            except ValueError as e:
+                raise ValueError(f"requests[{i}]: {e}") from e
+            if request.get("tail_sampling") or request.get("billing_days") is not None \
+                    or request.get("variance_reduction") == "antithetic" or request.get("workers") is not None:
+                results[i] = self._batch_item(i, request)
+                continue
+            key = (
+                request.get("market_code", "IN_IEX"), version, request.get("seed"),
+                request.get("num_scenarios", 1000), request.get("sampler", "pseudo"), request.get("price_anchor"),
+                request.get("shock_bank"), request.get("bank_offset", 0)
+            )
+            groups.setdefault(key, []).append(i)
+
+        for (market_code, _, seed, num_scenarios, sampler, price_anchor, shock_bank, bank_offset), members in groups.items():
+            try:
+                streams = RandomStreams(seed) if shock_bank is None else BankedStreams(shock_bank, bank_offset, seed)
+                if price_anchor is None:
+                    price_anchor = market_registry.get_market(market_code).get_latest_mark().price_inr_kwh
+                mc_engine = MonteCarloEngine(num_scenarios=num_scenarios, streams=streams, sampler=sampler)
+                prices = mc_engine.generate_price_paths(
+                    base_price=price_anchor,
+                    volatility=params.get_latest().dam_volatility_sigma
+                ).scenarios
+            except ValueError as e:
+                raise ValueError(f"requests[{members[0]}]: {e}") from e
+            prices.flags.writeable = False
+            for i in members:
+                results[i] = self._batch_item(
+                    i, {**requests[i], "seed": streams.seed, "price_anchor": price_anchor, "shared_prices": prices}
+                )
+        return results
+
+    def _batch_item(self, index: int, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self.run_simulation(**request)
+        except ValueError as e:
+            raise ValueError(f"requests[{index}]: {e}") from e
+
+    def run_counterfactual(self,
+                           asset_scenarios: Sequence[str] = ("BESS",),
+                           state_code: str = "MH_MSEDCL_HT",
+                           load_mw: float = 1.0,
+                           num_scenarios: int = 1000,
+                           shift_type: str = "1_SHIFT_DAY",
+                           market_code: str = "IN_IEX",
+                           seed: Optional[int] = None,
+                           chunk_size: Optional[int] = None,
+                           price_anchor: Optional[float] = None,
+                           sampler: str = "pseudo",
+                           load_profile_mw: Optional[np.ndarray] = None,
+                           load_noise: Optional[float] = None,
+                           n_resamples: int = 200) -> Dict[str, Any]:
+        """
+        Baseline vs asset counterfactual on common random numbers.
+
+        Prices (and noisy loads) are generated once per chunk; the baseline and
+        every asset scenario ("BESS", "HYDROGEN", "BESS+HYDROGEN", ...) are
+        dispatched and billed against those same paths. Each scenario reports
+        its distribution, the per-path cost differences against the baseline,
+        and the deltas of the mean, P95 and CVaR99 with paired-bootstrap CIs.
+        """
+        _check_path_counts(num_scenarios, chunk_size)
+        stacks = [AssetPipeline.parse(name) for name in asset_scenarios]
+        if not stacks:
+            raise ValueError("The counterfactual needs at least one asset scenario.")
+        labels = ["+".join(stack) for stack in stacks]
+        if len(set(labels)) != len(labels):
+            raise ValueError(f"Each asset scenario may appear once, got {labels}.")
+        if load_noise is not None and load_noise < 0:
+            raise ValueError(f"load_noise must be a non-negative fraction of load, got {load_noise}.")
+
+        ctx = self._build_context(
+            load_mw, shift_type, market_code, seed, price_anchor, load_profile_mw,
+            sampler=sampler, load_noise=load_noise
+        )
+        ctx.tariff = TariffEngine(state_code)
+        contexts = [ctx] + [replace(ctx, with_asset=True, asset_type=label, assets=stack) for label, stack in zip(labels, stacks)]
+        block = chunk_size or num_scenarios
+
+        costs = np.empty((len(contexts), num_scenarios))
+        asset_impacts: Dict[str, Any] = {}
+        asset_totals = {label: {"degradation_inr": 0.0, "production_kg": 0.0} for label in labels}
+
+        for start, stop, prices in self._price_chunks(ctx, num_scenarios, block):
+            shared = {"scenarios": prices, "log_weights": None}
+            for row, scenario_ctx in enumerate(contexts):
+                chunk = self._simulate_chunk(scenario_ctx, start, stop, prices=shared)
+                costs[row, start:stop] = chunk["costs"]
+                asset_results = chunk["asset_results"]
+                if asset_results is not None:
+                    label = scenario_ctx.asset_type
+                    if start == 0:
+                        asset_impacts[label] = self._asset_impact(scenario_ctx, asset_results)
+                    asset_totals[label]["degradation_inr"] += float(np.sum(asset_results.get("path_degradation_inr", 0.0)))
+                    asset_totals[label]["production_kg"] += float(np.sum(asset_results.get("total_production_kg", 0.0)))
+
+        def distribution(values: np.ndarray) -> Dict[str, float]:
+            return {
+                "expected_cost_inr": float(np.mean(values)),
+                "p95_inr": float(np.percentile(values, 95)),
+                "cvar_99_inr": confidence.cvar(values, 0.99),
+                "volatility": float(np.std(values))
+            }
+
+        rng = ctx.streams.generator("bootstrap")
+        scenarios = {}
+        for row, (label, stack) in enumerate(zip(labels, stacks), start=1):
+            impact = asset_impacts[label]
+            if "BESS" in stack:
+                impact["mean_degradation_inr"] = asset_totals[label]["degradation_inr"] / num_scenarios
+            if "HYDROGEN" in stack:
+                impact["production_kg"] = asset_totals[label]["production_kg"] / num_scenarios
+            path_deltas = costs[row] - costs[0]
+            d05, d50, d95 = np.percentile(path_deltas, [5, 50, 95])
+            scenarios[label] = {
+                **distribution(costs[row]),
+                "delta": confidence.paired_delta(costs[0], costs[row], rng, n_resamples),
+                "path_delta_quantiles_inr": {"p05": float(d05), "p50": float(d50), "p95": float(d95)},
+                "path_deltas_inr": path_deltas.tolist(),
+                "asset_analysis": impact
+            }
+
+        return {
+            "meta": {
+                "state": state_code,
+                "paths": num_scenarios,
+                "seed": ctx.streams.seed,
+                "price_anchor": ctx.price_anchor,
+                "assumptions_version": ctx.assumptions.version_id,
+                "sampler": sampler,
+                "chunk_size": block,
+                "bootstrap_resamples": n_resamples,
+                "market": {
+                    "anchor": ctx.price_anchor,
+                    "source": ctx.market_mark.source,
+                    "currency": ctx.market_mark.currency
+                }
+            },
+            "baseline": distribution(costs[0]),
+            "scenarios": scenarios
+        }
+
+    def run_bess_sweep(self,
+                       capacities_mwh: Sequence[float],
+                       powers_mw: Sequence[float],
+                       efficiencies: Sequence[float],
+                       state_code: str = "MH_MSEDCL_HT",
+                       load_mw: float = 1.0,
+                       num_scenarios: int = 1000,
+                       shift_type: str = "1_SHIFT_DAY",
+                       market_code: str = "IN_IEX",
+                       seed: Optional[int] = None,
+                       chunk_size: Optional[int] = None,
+                       price_anchor: Optional[float] = None,
+                       sampler: str = "pseudo",
+                       load_profile_mw: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        BESS sizing sweep over capacity x power x round-trip efficiency.
+
+        Every configuration is dispatched against the same price paths (common
+        random numbers), in config batches of at most DEFAULT_SWEEP_CELLS
+        config-paths, and billed from per-path energy totals in one tariff call.
+        Surfaces are nested lists indexed [capacity][power][efficiency].
+        """
+        _check_path_counts(num_scenarios, chunk_size)
+        grid = [(c, p, e) for c in capacities_mwh for p in powers_mw for e in efficiencies]
+        if not grid:
+            raise ValueError("The sweep grid needs at least one capacity, power and efficiency value.")
+        configs = [replace(self.bess_sim.config, capacity_mwh=c, power_mw=p, round_trip_efficiency=e) for c, p, e in grid]
+
+        ctx = self._build_context(load_mw, shift_type, market_code, seed, price_anchor, load_profile_mw, sampler=sampler)
+        tariff = TariffEngine(state_code)
+        load_kwh = ctx.load_profile_mw * 250.0
+        block = chunk_size or num_scenarios
+        config_batch = max(1, self.DEFAULT_SWEEP_CELLS // block)
+        costs = np.empty((len(configs), num_scenarios))
+        baseline = np.empty(num_scenarios)
+        degradation = np.zeros(len(configs))
+
+        tod_weights = tariff.tod_weights(MonteCarloEngine().time_steps)
+
+        for start, stop, prices in self._price_chunks(ctx, num_scenarios, block):
+            base_priced_inr = prices @ (load_kwh * tod_weights)
+            baseline[start:stop] = tariff.bill_from_totals(ctx.contract_demand_kva, base_priced_inr, load_kwh.sum())
+
+            for lo in range(0, len(configs), config_batch):
+                hi = min(lo + config_batch, len(configs))
+                shift = self.bess_sim.sweep_dispatch(prices, configs[lo:hi], tariff_weights=tod_weights)
+                costs[lo:hi, start:stop] = tariff.bill_from_totals(
+                    ctx.contract_demand_kva,
+                    base_priced_inr + shift["priced_shift_inr"],
+                    load_kwh.sum() + shift["energy_shift_kwh"]
+                )
+                degradation[lo:hi] += shift["path_degradation_inr"].sum(axis=1)
+
+        expected = costs.mean(axis=1)
+        p95 = np.percentile(costs, 95, axis=1)
+        baseline_p95 = float(np.percentile(baseline, 95))
+        mean_degradation = degradation / num_scenarios
+        shape = (len(capacities_mwh), len(powers_mw), len(efficiencies))
+
+        def surface(values: np.ndarray) -> List:
+            return values.reshape(shape).tolist()
+
+        return {
+            "meta": {
+                "state": state_code,
+                "paths": num_scenarios,
+                "seed": ctx.streams.seed,
+                "price_anchor": ctx.price_anchor,
+                "assumptions_version": ctx.assumptions.version_id,
+                "sampler": sampler,
+                "grid": {
+                    "capacity_mwh": list(capacities_mwh),
+                    "power_mw": list(powers_mw),
+                    "round_trip_efficiency": list(efficiencies)
+                }
+            },
+            "baseline": {
+                "expected_cost_inr": float(np.mean(baseline)),
+                "p95_inr": baseline_p95
+            },
+            "surfaces": {
+                "expected_cost_inr": surface(expected),
+                "p95_inr": surface(p95),
+                "mean_degradation_inr": surface(mean_degradation),
+                "p95_reduction_inr": surface(baseline_p95 - p95)
+            },
+            "configs": [
+                {
+                    "capacity_mwh": c,
+                    "power_mw": p,
+                    "round_trip_efficiency": e,
+                    "expected_cost_inr": float(expected[i]),
+                    "p95_inr": float(p95[i]),
+                    "mean_degradation_inr": float(mean_degradation[i])
+                }
+                for i, (c, p, e) in enumerate(grid)
+            ]
+        }
+
+    def run_hydrogen_sweep(self,
+                           break_evens_inr_per_kwh: Sequence[float],
+                           power_ratings_mw: Sequence[float],
+                           state_code: str = "MH_MSEDCL_HT",
+                           load_mw: float = 1.0,
+                           num_scenarios: int = 1000,
+                           shift_type: str = "1_SHIFT_DAY",
+                           market_code: str = "IN_IEX",
+                           seed: Optional[int] = None,
+                           chunk_size: Optional[int] = None,
+                           price_anchor: Optional[float] = None,
+                           sampler: str = "pseudo",
+                           load_profile_mw: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Electrolyzer sensitivity over break-even price x power rating.
+
+        The whole grid walks one shared set of price paths once (common random
+        numbers) and is billed from per-path energy totals. The incremental
+        cost per kg is the mean bill increase over the no-asset baseline divided
+        by the mean production. Surfaces are nested lists indexed [break_even][rating].
+        """
+        _check_path_counts(num_scenarios, chunk_size)
+        if not break_evens_inr_per_kwh or not power_ratings_mw:
+            raise ValueError("The sensitivity grid needs at least one break-even price and one power rating.")
+
+        ctx = self._build_context(load_mw, shift_type, market_code, seed, price_anchor, load_profile_mw, sampler=sampler)
+        tariff = TariffEngine(state_code)
+        load_kwh = ctx.load_profile_mw * 250.0
+        grid = (len(break_evens_inr_per_kwh), len(power_ratings_mw))
+        block = chunk_size or min(num_scenarios, max(1, self.DEFAULT_SWEEP_CELLS // (grid[0] * grid[1])))
+        costs = np.empty(grid + (num_scenarios,))
+        baseline = np.empty(num_scenarios)
+        production_kg = np.zeros(grid)
+
+        tod_weights = tariff.tod_weights(MonteCarloEngine().time_steps)
+
+        for start, stop, prices in self._price_chunks(ctx, num_scenarios, block):
+            base_priced_inr = prices @ (load_kwh * tod_weights)
+            baseline[start:stop] = tariff.bill_from_totals(ctx.contract_demand_kva, base_priced_inr, load_kwh.sum())
+            walk = self.h2_sim.sweep_dispatch(prices, break_evens_inr_per_kwh, power_ratings_mw, tariff_weights=tod_weights)
+            costs[..., start:stop] = tariff.bill_from_totals(
+                ctx.contract_demand_kva,
+                base_priced_inr + walk["priced_energy_inr"],
+                load_kwh.sum() + walk["energy_kwh"]
+            )
+            production_kg += walk["production_kg"].sum(axis=-1)
+
+        expected = costs.mean(axis=-1)
+        mean_production = production_kg / num_scenarios
+        extra_cost = expected - float(np.mean(baseline))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cost_per_kg = np.where(mean_production > 0, extra_cost / mean_production, np.nan)
+
+        return {
+            "meta": {
+                "state": state_code,
+                "paths": num_scenarios,
+                "seed": ctx.streams.seed,
+                "price_anchor": ctx.price_anchor,
+                "assumptions_version": ctx.assumptions.version_id,
+                "sampler": sampler,
+                "grid": {
+                    "break_even_inr_per_kwh": list(break_evens_inr_per_kwh),
+                    "power_rating_mw": list(power_ratings_mw)
+                }
+            },
+            "baseline": {
+                "expected_cost_inr": float(np.mean(baseline)),
+                "p95_inr": float(np.percentile(baseline, 95))
+            },
+            "surfaces": {
+                "production_kg": mean_production.tolist(),
+                "expected_cost_inr": expected.tolist(),
+                "p95_inr": np.percentile(costs, 95, axis=-1).tolist(),
+                # JSON-safe: a grid point that never runs has no cost per kg
+                "incremental_cost_inr_per_kg": [[None if np.isnan(v) else float(v) for v in row] for row in cost_per_kg]
+            }
+        }
+
+    def _build_context(self,
+                       load_mw: float,
+                       shift_type: str,
+                       market_code: str,
+                       seed: Optional[int],
+                       price_anchor: Optional[float],
+                       load_profile_mw: Optional[np.ndarray],
+                       with_asset: bool = False,
+                       asset_type: str = "BESS",
+                       shock_bank: Optional[ShockBank] = None,
+                       bank_offset: int = 0,
+                       **options) -> _RunContext:
+        """Seeds the streams, builds the load profile and grounds the price anchor."""
+        assumptions = params.get_latest()
+        if shock_bank is None:
+            streams = RandomStreams(seed)
+        else:
+            streams = BankedStreams(shock_bank, bank_offset, seed)
+
+        # 1. Physics: Generate Load Profile
+        if load_profile_mw is None:
+            load_profile_mw = self.stage_cache.fetch(
+                "load",
+                None if seed is None else (streams.seed, load_mw, shift_type),
+                lambda: self.load_generator.generate_industrial_profile(
+                    base_load_mw=load_mw,
+                    shift_type=shift_type,
+                    rng=streams.generator("load")
+                )
+            )
+        else:
+            # Metered slices arrive as float32 store views; one day or month is cheap to widen.
+            load_profile_mw = np.asarray(load_profile_mw, dtype=np.float64)
+
+        # 2. Market Grounding
+        market_engine = market_registry.get_market(market_code)
+        market_mark = market_engine.get_latest_mark()
+        if price_anchor is not None and not price_anchor > 0:
+            raise ValueError(f"price_anchor must be a positive price in INR/kWh, got {price_anchor}.")
+        live_price_anchor = market_mark.price_inr_kwh if price_anchor is None else price_anchor
+
+        return _RunContext(
+            assumptions=assumptions,
+            streams=streams,
+            load_profile_mw=load_profile_mw,
+            market_mark=market_mark,
+            price_anchor=live_price_anchor,
+            contract_demand_kva=load_mw * 1000 / 0.9,
+            with_asset=with_asset,
+            asset_type=asset_type,
+            # The live anchor is re-read (and moves) on every call.
+            seeded=seed is not None and price_anchor is not None,
+            shock_bank=None if shock_bank is None else (shock_bank.bank_id, bank_offset),
+            **options
+        )
+
+    def _price_chunks(self, ctx: _RunContext, num_scenarios: int, block: int):
+        """Yields (start, stop, prices) for successive blocks of the seeded path set."""
+        for start in range(0, num_scenarios, block):
+            stop = min(start + block, num_scenarios)
+            mc_engine = MonteCarloEngine(num_scenarios=stop - start, streams=ctx.streams, sampler=ctx.sampler)
+            prices = mc_engine.generate_price_paths(
+                base_price=ctx.price_anchor,
+                volatility=ctx.assumptions.dam_volatility_sigma,
+                path_offset=start
+            ).scenarios
+            yield start, stop, prices
+
+    def _adaptive_stop(self,
+                       summary: CostSummary,
+                       rel_tol: float,
+                       time_budget_s: Optional[float],
+                       elapsed_s: float,
+                       done: bool) -> Optional[str]:
+        """
+        Why an adaptive run stops after this batch, or None to run another. The
+        CIs come from the running summary (moments and sketch), so a check costs
+        the same however many paths have run.
+        """
+        relative = self._running_estimate(summary)["relative_half_width"]
+        if relative["expected_cost"] is not None and max(relative.values()) <= rel_tol:
+            return "tolerance"
+        if time_budget_s is not None and elapsed_s >= time_budget_s:
+            return "time_budget"
+        if done:
+            return "max_scenarios"
+        return None
+
+    def _adaptive_report(self,
+                         costs: np.ndarray,
+                         stopped_by: Optional[str],
+                         rel_tol: float,
+                         elapsed_s: float) -> Dict[str, Any]:
+        """Exact 95% CIs on the expected cost and P95 of the paths an adaptive run used."""
+        mean = float(np.mean(costs))
+        p95 = float(np.percentile(costs, 95))
+        mean_ci = confidence.mean_interval(costs.size, mean, float(np.std(costs, ddof=1)) if costs.size > 1 else 0.0)
+        p95_ci = confidence.quantile_interval(costs, 0.95)
+        return {
+            "paths_used": int(costs.size),
+            "stopped_by": stopped_by,
+            "rel_tol": rel_tol,
+            "elapsed_s": elapsed_s,
+            "expected_cost_ci_inr": [float(mean_ci[0]), float(mean_ci[1])],
+            "p95_ci_inr": [float(p95_ci[0]), float(p95_ci[1])],
+            "expected_cost_ci_width_inr": float(mean_ci[1] - mean_ci[0]),
+            "p95_ci_width_inr": float(p95_ci[1] - p95_ci[0]),
+            "relative_half_width": {
+                "expected_cost": confidence.relative_half_width(mean_ci, mean),
+                "p95": confidence.relative_half_width(p95_ci, p95)
+            }
+        }
+
+    def _fold_chunk(self, ctx: _RunContext, chunk: Dict[str, Any], start: int, totals: _RunTotals):
+        """Folds a simulated chunk of paths starting at `start` into the run totals."""
+        costs = chunk["costs"]
+        asset_results = chunk["asset_results"]
+
+        if asset_results is not None:
+            if start == 0:
+                totals.asset_impact = self._asset_impact(ctx, asset_results)
+            totals.degradation_inr += float(np.sum(asset_results.get("path_degradation_inr", 0.0)))
+            totals.production_kg += float(np.sum(asset_results.get("total_production_kg", 0.0)))
+
+        totals.peak_window_inr += float(np.sum(chunk["peak_costs"]))
+        if ctx.billing_days:
+            totals.max_demand_kva += float(np.sum(chunk["max_demand_kva"]))
+            totals.billing_demand_kva += float(np.sum(chunk["billing_demand_kva"]))
+            totals.over_contract += int(np.count_nonzero(chunk["max_demand_kva"] > ctx.contract_demand_kva))
+
+        # 6. Axiom 50: Extreme Tail Search
+        # Identify the single worst-case scenario
+        if totals.summary.add(costs, path_offset=start):
+            totals.summary.worst = self._tail_event(ctx, chunk, totals.summary.worst_index, start)
+
+        for row, state_summary in enumerate(totals.state_summaries):
+            state_summary.add(chunk["state_costs"][row], path_offset=start)
+
+    def _simulate_shard(self, ctx: _RunContext, start: int, stop: int) -> _RunTotals:
+        """Runs paths [start, stop) end to end and keeps only their mergeable totals."""
+        totals = _RunTotals.for_run(ctx)
+        if ctx.billing_days:
+            chunk = self._simulate_period_chunk(ctx, start, stop)
+        else:
+            chunk = self._simulate_chunk(ctx, start, stop)
+        self._fold_chunk(ctx, chunk, start, totals)
+        return totals
+
+    def _run_shards(self,
+                    ctx: _RunContext,
+                    num_scenarios: int,
+                    shard_size: int,
+                    workers: int,
+                    progress: Optional[Callable[[int, int, Optional[Dict[str, Any]]], None]] = None) -> _RunTotals:
+        """
+        Simulates fixed shards of the path set across `workers` processes and
+        merges their totals in path order. One worker runs in-process. If the
+        merge is aborted (e.g. by `progress`), shards not yet started are dropped.
+        """
+        bounds = [(start, min(start + shard_size, num_scenarios)) for start in range(0, num_scenarios, shard_size)]
+        futures = []
+        if workers == 1:
+            shards = (self._simulate_shard(ctx, start, stop) for start, stop in bounds)
+        else:
+            setup = (self.bess_sim.config, self.h2_sim.config)
+            pool = self._executor(workers)
+            futures = [pool.submit(_shard_worker, (ctx, setup, start, stop)) for start, stop in bounds]
+            shards = (future.result() for future in futures)
+
+        totals = _RunTotals.for_run(ctx)
+        try:
+            for (_, stop), shard in zip(bounds, shards):
+                totals.merge(shard)
+                if progress is not None:
+                    progress(stop, num_scenarios, self._running_estimate(totals.summary))
+        finally:
+            for future in futures:
+                future.cancel()
+        return totals
+
+    def _running_estimate(self, summary: CostSummary) -> Dict[str, Any]:
+        """
+        Expected cost, P95 and P99 of the paths folded so far, with 95% CI
+        widths. Quantiles come from the summary's sketch, so each estimate
+        costs the same however many paths have run.
+        """
+        count = summary.count
+        mean = float(summary.moments.mean)
+        sample_std = float(np.sqrt(summary.moments.m2 / (count - 1))) if count > 1 else 0.0
+        mean_ci = confidence.mean_interval(count, mean, sample_std)
+        p95 = float(summary.quantile(0.95))
+        p95_ci = summary.quantile_interval(0.95)
+
+        def width(interval: Tuple[float, float]) -> Optional[float]:
+            return float(interval[1] - interval[0]) if np.all(np.isfinite(interval)) else None
+
+        return {
+            "paths": count,
+            "expected_cost_inr": mean,
+            "p95_inr": p95,
+            "p99_inr": float(summary.quantile(0.99)),
+            "expected_cost_ci_width_inr": width(mean_ci),
+            "p95_ci_width_inr": width(p95_ci),
+            "relative_half_width": {
+                "expected_cost": confidence.relative_half_width(mean_ci, mean) if count > 1 else None,
+                "p95": confidence.relative_half_width(p95_ci, p95)
+            }
+        }
+
+    def _executor(self, workers: int) -> ProcessPoolExecutor:
+        """The engine's worker pool, kept across runs and resized when `workers` changes."""
+        with self._pool_lock:
+            if self._pool is None or self._pool_workers != workers:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                # Spawned workers: forking a threaded server process is not safe.
+                self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                self._pool_workers = workers
+            return self._pool
+
+    def shutdown(self):
+        """Stops the worker pool, if one was started."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool, self._pool_workers = None, 0
+
+    def _simulate_chunk(self,
+                        ctx: _RunContext,
+                        start: int,
+                        stop: int,
+                        prices: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Generates, dispatches and bills paths [start, stop) of the run. Each
+        stage goes through the stage cache under the keys from _stage_keys().
+        `prices` ({"scenarios", "log_weights"}) reuses paths already generated
+        for another scenario of the same run.
+        """
+        n_paths = stop - start
+        keys = self._stage_keys(ctx, start, stop)
+
+        # 3. Stochastic Generation
+        def generate() -> Dict[str, Any]:
+            mc_engine = MonteCarloEngine(
+                num_scenarios=n_paths,
+                streams=ctx.streams,
+                antithetic=ctx.variance_reduction == "antithetic",
+                sampler=ctx.sampler,
+                shock_shift=ctx.shock_shift
+            )
+            price_sim = mc_engine.generate_price_paths(
+                base_price=ctx.price_anchor,
+                volatility=ctx.assumptions.dam_volatility_sigma,
+                path_offset=start
+            )
+            return {"scenarios": price_sim.scenarios, "log_weights": price_sim.log_weights}
+
+        if prices is None:
+            prices = self.stage_cache.fetch("prices", keys["prices"], generate)
+        scenarios = prices["scenarios"]
+
+        # 4. Multi-Physics Asset Grounding (Counterfactual)
+        asset_results = None
+        # A shared profile is ctx's own array; only noisy per-path rows are worth caching.
+        sim_load_profiles_mw = self.stage_cache.fetch(
+            "load", keys["load"] if ctx.load_noise else None, lambda: self._path_loads(ctx, start, stop)
+        )
+
+        if ctx.assets:
+            def dispatch() -> Dict[str, Any]:
+                self.bess_sim.reset()
+                # Only path 0 feeds the asset trails; the worst path is re-dispatched on demand.
+                pipeline = AssetPipeline(ctx.assets, self.bess_sim, self.h2_sim)
+                return pipeline.dispatch(scenarios, sim_load_profiles_mw, record_paths=[0] if start == 0 else [])
+
+            asset_results = self.stage_cache.fetch("dispatch", keys["dispatch"], dispatch)
+            sim_load_profiles_mw = asset_results["net_load_mw"]
+
+        # 5. Calculate Exposure (Vectorized over paths)
+        bill = self.stage_cache.fetch(
+            "billing", keys["billing"], lambda: self._bill_chunk(ctx, scenarios, sim_load_profiles_mw, asset_results is not None)
+        )
+        return {
+            "scenarios": scenarios,
+            "asset_results": asset_results,
+            "log_weights": prices["log_weights"],
+            **bill
+        }
+
+    def _bill_chunk(self,
+                    ctx: _RunContext,
+                    scenarios: np.ndarray,
+                    net_load_mw: np.ndarray,
+                    has_asset: bool) -> Dict[str, np.ndarray]:
+        """Per-path bills (plus state-comparison and control-variate bills when enabled)."""
+        if ctx.state_tariffs is None:
+            bill_results = ctx.tariff.calculate_bill(
+                contract_demand_kva=ctx.contract_demand_kva,
+                price_scenarios=scenarios,
+                load_profile_mw=net_load_mw
+            )
+            bill = {
+                "costs": bill_results["total_estimated_bill"],
+                "peak_costs": bill_results["components"]["peak_window_charges"]
+            }
+        else:
+            # One weighted reduction over the run's ToD (and peak) weights and every compared state's.
+            time_steps = scenarios.shape[1]
+            weights = np.column_stack([
+                ctx.tariff.tod_weights(time_steps),
+                ctx.tariff.peak_weights(time_steps),
+                ctx.state_tariffs.weights(time_steps)
+            ])
+            priced_energy_inr, energy_kwh = ctx.tariff.energy_totals(scenarios, net_load_mw, weights)
+            bill = {
+                "costs": ctx.tariff.bill_from_totals(ctx.contract_demand_kva, priced_energy_inr[:, 0], energy_kwh),
+                "peak_costs": priced_energy_inr[:, 1],
+                "state_costs": ctx.state_tariffs.bills(ctx.contract_demand_kva, priced_energy_inr[:, 2:].T, energy_kwh)
+            }
+
+        # Control variate: the baseline bill, whose mean is known analytically.
+        if ctx.variance_reduction == "control_variate":
+            if not has_asset and not ctx.load_noise:
+                bill["control_costs"] = bill["costs"]
+            else:
+                bill["control_costs"] = ctx.tariff.calculate_bill(
+                    contract_demand_kva=ctx.contract_demand_kva,
+                    price_scenarios=scenarios,
+                    load_profile_mw=ctx.load_profile_mw
+                )["total_estimated_bill"]
+        return bill
+
+    def _stage_keys(self, ctx: _RunContext, start: int, stop: int) -> Dict[str, Optional[Tuple]]:
+        """
+        Cache key per stage for paths [start, stop): exactly the inputs the stage
+        reads, with each downstream key embedding its upstream keys. Runs without
+        a pinned seed and price anchor never repeat, so they bypass the cache;
+        so do streaming and sharded runs, whose memory must not grow with the
+        path count.
+        """
+        if not ctx.seeded or ctx.summarized:
+            return dict.fromkeys(StageCache.STAGES)
+        prices = (
+            ctx.streams.seed, ctx.assumptions.version_id, ctx.assumptions.dam_volatility_sigma,
+            ctx.price_anchor, ctx.sampler, ctx.variance_reduction == "antithetic",
+            digest(ctx.shock_shift), ctx.shock_bank, start, stop
+        )
+        load = (ctx.streams.seed, digest(ctx.load_profile_mw), ctx.load_noise, start, stop)
+        configs = {"BESS": self.bess_sim.config, "HYDROGEN": self.h2_sim.config}
+        dispatch = (prices, load, tuple((name, astuple(configs[name])) for name in ctx.assets))
+        billing = (
+            dispatch, ctx.tariff.tariff_code, ctx.contract_demand_kva,
+            ctx.state_tariffs.codes if ctx.state_tariffs is not None else None,
+            ctx.variance_reduction == "control_variate"
+        )
+        return {"load": load, "prices": prices, "dispatch": dispatch, "billing": billing}
+
+    def _cache_report(self, before: Dict[str, Any]) -> Dict[str, Any]:
+        """Stage cache hits and misses during this run, plus the cache's current size."""
+        after = self.stage_cache.stats()
+        return {
+            "hits": {stage: after["hits"][stage] - before["hits"][stage] for stage in StageCache.STAGES},
+            "misses": {stage: after["misses"][stage] - before["misses"][stage] for stage in StageCache.STAGES},
+            "bytes": after["bytes"]
+        }
+
+    def _path_loads(self,
+                    ctx: _RunContext,
+                    start: int,
+                    stop: int,
+                    day: int = 0,
+                    profile_mw: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Load for paths [start, stop): the shared (T,) profile, which every
+        consumer broadcasts, or (N, T) noisy rows drawn for this chunk only.
+        """
+        profile_mw = ctx.load_profile_mw if profile_mw is None else profile_mw
+        if not ctx.load_noise:
+            return profile_mw
+        return self.load_generator.path_loads(profile_mw, ctx.streams.for_day(day), start, stop, ctx.load_noise)
+
+    def _period_load(self, ctx: _RunContext) -> np.ndarray:
+        """(days, 96) load per day of the billing period: one day repeated, or the given period."""
+        profile = np.asarray(ctx.load_profile_mw, dtype=np.float64)
+        if profile.shape == (BLOCKS_PER_DAY,):
+            return np.broadcast_to(profile, (ctx.billing_days, BLOCKS_PER_DAY))
+        if profile.shape == (ctx.billing_days * BLOCKS_PER_DAY,):
+            return profile.reshape(ctx.billing_days, BLOCKS_PER_DAY)
+        raise ValueError(
+            f"A {ctx.billing_days}-day billing period needs a load profile of {BLOCKS_PER_DAY} "
+            f"or {ctx.billing_days * BLOCKS_PER_DAY} blocks, got {profile.shape}."
+        )
+
+    def _simulate_period_chunk(self,
+                               ctx: _RunContext,
+                               start: int,
+                               stop: int,
+                               record_paths: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+        """
+        Generates, dispatches and bills paths [start, stop) over a billing period,
+        one day at a time. Only the day's (N, 96) prices and net load are live:
+        the OU state and asset kernels carry across midnight, and each path keeps
+        running totals (ToD energy charge, kWh, peak-window charge, maximum
+        demand, highest price) that are billed once at period end.
+        """
+        n_paths = stop - start
+        daily_load_mw = self._period_load(ctx)
+        if record_paths is None:
+            record_paths = [0] if start == 0 else []
+        weights = np.column_stack([
+            ctx.tariff.tod_weights(BLOCKS_PER_DAY),
+            ctx.tariff.peak_weights(BLOCKS_PER_DAY)
+        ])
+
+        pipeline = None
+        if ctx.assets:
+            self.bess_sim.reset()
+            pipeline = AssetPipeline(ctx.assets, self.bess_sim, self.h2_sim)
+
+        # One day buffer, regenerated in place; its last column seeds the next day.
+        prices = np.empty((n_paths, BLOCKS_PER_DAY))
+        closing = None
+        priced_energy_inr = np.zeros((n_paths, 2))
+        energy_kwh = np.zeros(n_paths)
+        max_demand_mw = np.zeros(n_paths)
+        max_price = np.full(n_paths, -np.inf)
+        peak_block = np.zeros(n_paths, dtype=np.intp)
+        asset_results = None
+        trails: Dict[str, List[np.ndarray]] = {}
+
+        for day in range(ctx.billing_days):
+            mc_engine = MonteCarloEngine(
+                num_scenarios=n_paths,
+                streams=ctx.streams.for_day(day),
+                antithetic=ctx.variance_reduction == "antithetic",
+                sampler=ctx.sampler
+            )
+            mc_engine.generate_price_paths(
+                base_price=ctx.price_anchor,
+                volatility=ctx.assumptions.dam_volatility_sigma,
+                out=prices,
+                path_offset=start,
+                initial_prices=closing
+            )
+
+            net_load_mw = self._path_loads(ctx, start, stop, day, daily_load_mw[day])
+            if pipeline is not None:
+                asset_results = pipeline.dispatch(prices, net_load_mw, record_paths=record_paths, carry_state=day > 0)
+                net_load_mw = asset_results.pop("net_load_mw")
+                for key in ("bess_action_mw", "soc_trail", "asset_load_mw"):
+                    if key in asset_results:
+                        trails.setdefault(key, []).append(asset_results[key])
+
+            day_priced_inr, day_kwh = ctx.tariff.energy_totals(prices, net_load_mw, weights)
+            priced_energy_inr += day_priced_inr
+            energy_kwh += day_kwh
+            np.maximum(max_demand_mw, np.max(net_load_mw, axis=-1), out=max_demand_mw)
+
+            day_max = np.max(prices, axis=1)
+            new_high = day_max > max_price
+            peak_block[new_high] = day * BLOCKS_PER_DAY + np.argmax(prices[new_high], axis=1)
+            np.maximum(max_price, day_max, out=max_price)
+            closing = prices[:, -1]
+
+        if asset_results is not None:
+            # Kernel totals are cumulative; trails span the whole period.
+            asset_results.update({key: np.concatenate(days, axis=1) for key, days in trails.items()})
+
+        billing_demand_kva = ctx.tariff.billing_demand_kva(ctx.contract_demand_kva, max_demand_mw)
+        return {
+            "asset_results": asset_results,
+            "costs": ctx.tariff.bill_from_totals(billing_demand_kva, priced_energy_inr[:, 0], energy_kwh),
+            "peak_costs": priced_energy_inr[:, 1],
+            "log_weights": None,
+            "max_demand_kva": max_demand_mw * 1000.0 / 0.9,
+            "billing_demand_kva": billing_demand_kva,
+            "max_price": max_price,
+            "peak_block": peak_block
+        }
+
+    def _baseline_bill(self, ctx: _RunContext, prices: np.ndarray) -> np.ndarray:
+        """Bill of the (asset-free) load profile for each row of prices."""
+        return ctx.tariff.calculate_bill(
+            contract_demand_kva=ctx.contract_demand_kva,
+            price_scenarios=prices,
+            load_profile_mw=ctx.load_profile_mw
+        )["total_estimated_bill"]
+
+    def _bill_gradient(self, ctx: _RunContext, time_steps: int) -> np.ndarray:
+        """d(baseline bill)/d(price_t): the bill is affine in price for a fixed load."""
+        return self._baseline_bill(ctx, np.eye(time_steps)) - self._baseline_bill(ctx, np.zeros((1, time_steps)))
+
+    def _control_variate(self, ctx: _RunContext, values: np.ndarray) -> vr.ControlVariate:
+        """
+        Baseline bill as a control. Its mean is the bill of the analytic OU mean
+        path and its std follows from the bill's price gradient and the OU covariance.
+        """
+        mc_engine = MonteCarloEngine(num_scenarios=1, streams=ctx.streams)
+        mean = float(self._baseline_bill(ctx, mc_engine.expected_path(ctx.price_anchor)[np.newaxis, :])[0])
+        gradient = self._bill_gradient(ctx, mc_engine.time_steps)
+        covariance = mc_engine.covariance_matrix(ctx.assumptions.dam_volatility_sigma)
+        std = float(np.sqrt(gradient @ covariance @ gradient))
+        return vr.ControlVariate(values=values, mean=mean, std=std)
+
+    def _tail_shift(self, ctx: _RunContext, magnitude: float) -> np.ndarray:
+        """
+        Mean shift for the standard shocks along the baseline bill's gradient in
+        shock space, scaled to `magnitude` standard deviations. For magnitude
+        z_0.99 the shifted measure centres the linear bill on its nominal P99.
+        """
+        mc_engine = MonteCarloEngine(num_scenarios=1, streams=ctx.streams)
+        loadings = mc_engine.shock_loadings(ctx.assumptions.dam_volatility_sigma)
+        direction = loadings.T @ self._bill_gradient(ctx, mc_engine.time_steps)
+        norm = float(np.linalg.norm(direction))
+        if norm == 0.0:
+            return np.zeros(mc_engine.time_steps)
+        return magnitude * direction / norm
+
+    def _state_comparison(self,
+                          tariffs: CompiledTariffs,
+                          summaries: List[CostSummary],
+                          state_costs: Optional[np.ndarray]) -> Dict[str, Any]:
+        """Per-state cost distribution: exact from the cost matrix, or from the sketches when streaming."""
+        states = {}
+        for row, code in enumerate(tariffs.codes):
+            if state_costs is not None:
+                costs = state_costs[row]
+                p05, p95, p99 = np.percentile(costs, [5, 95, 99])
+                volatility = float(np.std(costs))
+            else:
+                p05, p95, p99 = (summaries[row].quantile(q) for q in (0.05, 0.95, 0.99))
+                volatility = summaries[row].moments.std
+            states[code] = {
+                "name": tariffs.names[row],
+                "expected_cost_inr": float(summaries[row].moments.mean),
+                "p05_inr": float(p05),
+                "p95_inr": float(p95),
+                "tail_risk_at_p99_inr": float(p99),
+                "volatility": float(volatility)
+            }
+        return {
+            "states": states,
+            "lowest_expected_cost": min(states, key=lambda code: states[code]["expected_cost_inr"]),
+            "lowest_p95": min(states, key=lambda code: states[code]["p95_inr"])
+        }
+
+    def _asset_impact(self, ctx: _RunContext, asset_results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Asset summary anchored on path 0 (means are filled in once all chunks are folded)."""
+        if not ctx.assets:
+            return None
+        labels = {"BESS": "BESS (4h Li-ion)", "HYDROGEN": "Hydrogen Electrolyzer"}
+        impact: Dict[str, Any] = {"type": " + ".join(labels[name] for name in ctx.assets)}
+        if "BESS" in ctx.assets:
+            impact["soc_trail"] = asset_results["soc_trail"][0].tolist()
+            impact["mean_degradation_inr"] = 0.0
+        if "HYDROGEN" in ctx.assets:
+            impact["production_kg"] = 0.0
+            impact["load_trail"] = asset_results["asset_load_mw"][0].tolist()
+        return impact
+
+    def _tail_event(self, ctx: _RunContext, chunk: Dict[str, Any], path_index: int, chunk_start: int) -> Dict[str, Any]:
+        """Tail event record for a path of the given chunk."""
+        local_idx = path_index - chunk_start
+        if ctx.billing_days:
+            return self._period_tail_event(ctx, chunk, path_index, local_idx)
+        scenarios = chunk["scenarios"]
+        asset_results = chunk["asset_results"]
+        peak_time_idx = int(np.argmax(scenarios[local_idx]))
+
+        # Guarded access for asset-specific metrics
+        bess_soc_at_peak = 0.0
+        if asset_results and "soc_trail" in asset_results:
+            # Dispatch is path-independent, so replaying one row reproduces its SOC trail.
+            replay = self.bess_sim.simulate_dispatch(scenarios[local_idx:local_idx + 1], self._path_loads(ctx, path_index, path_index + 1))
+            bess_soc_at_peak = float(replay["soc_trail"][0][peak_time_idx])
+
+        return {
+            "path_index": int(path_index),
+            "max_price": float(np.max(scenarios[local_idx])),
+            "peak_hour": peak_time_idx,
+            "cost_inr": float(chunk["costs"][local_idx]),
+            "bess_soc_at_peak": bess_soc_at_peak
+        }
+
+    def _period_tail_event(self, ctx: _RunContext, chunk: Dict[str, Any], path_index: int, local_idx: int) -> Dict[str, Any]:
+        """Tail event over a billing period; the SOC comes from replaying that one path's month."""
+        peak_block = int(chunk["peak_block"][local_idx])
+        bess_soc_at_peak = 0.0
+        if chunk["asset_results"] and "soc_trail" in chunk["asset_results"]:
+            replay = self._simulate_period_chunk(ctx, path_index, path_index + 1, record_paths=[0])
+            bess_soc_at_peak = float(replay["asset_results"]["soc_trail"][0][peak_block])
+
+        return {
+            "path_index": int(path_index),
+            "max_price": float(chunk["max_price"][local_idx]),
+            "peak_hour": peak_block % BLOCKS_PER_DAY,
+            "peak_day": peak_block // BLOCKS_PER_DAY,
+            "cost_inr": float(chunk["costs"][local_idx]),
+            "max_demand_kva": float(chunk["max_demand_kva"][local_idx]),
+            "bess_soc_at_peak": bess_soc_at_peak
+        }
+
+# Per-process engine for shard workers (built on first use, no stage cache).
+_shard_engine: Optional[SimulationEngine] = None
+
+def _shard_worker(task: Tuple[_RunContext, Tuple[BESSConfig, HydrogenConfig], int, int]) -> _RunTotals:
+    global _shard_engine
+    ctx, (bess_config, h2_config), start, stop = task
+    if _shard_engine is None:
+        _shard_engine = SimulationEngine(cache_bytes=0)
+    _shard_engine.bess_sim = BESSSimulator(bess_config)
+    _shard_engine.h2_sim = HydrogenSimulator(h2_config)
+    return _shard_engine._simulate_shard(ctx, start, stop)
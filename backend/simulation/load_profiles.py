@@ -1,5 +1,6 @@
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from backend.simulation.random_streams import RandomStreams
 
 class LoadProfileGenerator:
     """
@@ -11,7 +12,8 @@ class LoadProfileGenerator:
         
     def generate_industrial_profile(self, 
                                   base_load_mw: float, 
-                                  shift_type: str = "1_SHIFT_DAY") -> np.ndarray:
+                                  shift_type: str = "1_SHIFT_DAY",
+                                  rng: Optional[np.random.Generator] = None) -> np.ndarray:
         
         t = np.arange(self.time_steps)
         daily_cycle = t % 96
@@ -29,7 +31,27 @@ class LoadProfileGenerator:
             pass # Mostly flat
             
         # Add 5% noise
-        noise = np.random.normal(0, 0.05 * base_load_mw, size=self.time_steps)
+        rng = rng if rng is not None else np.random.default_rng()
+        noise = rng.normal(0, 0.05 * base_load_mw, size=self.time_steps)
         profile = np.maximum(profile + noise, 0.0)
         
         return profile
+
+    @staticmethod
+    def path_loads(profile_mw: np.ndarray,
+                   streams: RandomStreams,
+                   start: int,
+                   stop: int,
+                   relative_std: float,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Per-path load uncertainty for paths [start, stop): the shared profile
+        with independent Gaussian noise of `relative_std` x load per block,
+        floored at zero. Drawn from the "load_noise" stream, so a path's load
+        does not depend on chunking; only the chunk's (N, T) rows are built.
+        """
+        out = streams.standard_normal("load_noise", start, stop, profile_mw.shape[-1], out=out)
+        out *= relative_std * profile_mw
+        out += profile_mw
+        np.maximum(out, 0.0, out=out)
+        return out
@@ -1,58 +1,325 @@
+import warnings
 import numpy as np
-from typing import Dict
+from functools import lru_cache, cached_property
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
+from backend.simulation.random_streams import RandomStreams
 
 @dataclass
 class SimulationResult:
+    """
+    Price paths plus on-demand statistics. The fan-chart bands and tail count
+    are computed on first access and memoized, so callers that only need the
+    paths never pay for them.
+    """
     scenarios: np.ndarray  # Shape: (num_scenarios, num_timesteps)
-    percentiles: Dict[str, np.ndarray] # p10, p50, p90
-    tail_risk_events: int # Count of scenarios exceeding safety thresholds
+    base_price: float # Anchor the tail threshold is measured against
+    log_weights: Optional[np.ndarray] = None # Per-path log likelihood ratios (shifted shocks only)
+
+    @cached_property
+    def percentiles(self) -> Dict[str, np.ndarray]:
+        """Per-timestep p10, p50, p90 bands (Axiom 60), from one multi-quantile pass."""
+        p10, p50, p90 = np.quantile(self.scenarios, [0.1, 0.5, 0.9], axis=0)
+        return {"p10": p10, "p50": p50, "p90": p90}
+
+    @cached_property
+    def tail_risk_events(self) -> int:
+        """Count of scenarios whose peak exceeds twice the anchor price."""
+        return int(np.count_nonzero(np.max(self.scenarios, axis=1) > self.base_price * 2.0))
 
 class MonteCarloEngine:
     """
     The Core Stochastic Engine.
     dX_t = theta * (mu - X_t) * dt + sigma * dW_t
+
+    Schemes:
+    - "euler": Step-by-step Euler-Maruyama loop (legacy reference).
+    - "exact": Loop-free exact OU transition, integrated in place.
+
+    Shocks come from the "price" stage of a RandomStreams hierarchy, so a path's
+    draws depend only on the seed and its global index (path_offset + row).
+    BankedStreams serves that stage from a prebuilt ShockBank instead, so the
+    engine only scales and integrates stored shocks.
+    With `antithetic=True`, paths 2k and 2k+1 share the shock row k with opposite signs.
+
+    Samplers:
+    - "pseudo": i.i.d. PCG64 normals (default).
+    - "sobol": Scrambled Sobol points mapped through a Brownian-bridge ordering,
+      so the leading (best-distributed) dimensions drive the coarse path shape.
+      Requires scipy.
+
+    Importance sampling: `shock_shift` (length time_steps) adds a deterministic
+    drift to every path's standard shocks; each path then carries the log
+    likelihood ratio log(phi(Z) / phi(Z - shift)) back to the nominal measure.
+
+    Continuation: with `initial_prices` (one per path, e.g. the previous day's
+    closing prices) column 0 is one OU step from that state instead of the
+    anchor, so consecutive calls form a single path across day boundaries.
     """
 
-    def __init__(self, num_scenarios: int = 500, time_steps: int = 96):
+    SCHEMES = ("euler", "exact")
+    SAMPLERS = ("pseudo", "sobol")
+    PRICE_FLOOR = 0.5
+
+    # Largest log-growth of the exact-scheme rescaling weights before the
+    # cumulative sum is split into time segments (exp(600) < float64 max).
+    _MAX_LOG_GROWTH = 600.0
+
+    def __init__(self,
+                 num_scenarios: int = 500,
+                 time_steps: int = 96,
+                 scheme: str = "euler",
+                 streams: Optional[RandomStreams] = None,
+                 antithetic: bool = False,
+                 sampler: str = "pseudo",
+                 shock_shift: Optional[np.ndarray] = None):
+        if scheme not in self.SCHEMES:
+            raise ValueError(f"Unknown OU scheme '{scheme}'. Expected one of {self.SCHEMES}.")
+        if sampler not in self.SAMPLERS:
+            raise ValueError(f"Unknown sampler '{sampler}'. Expected one of {self.SAMPLERS}.")
+        if sampler == "sobol" and antithetic:
+            raise ValueError("Antithetic pairing is not supported with the Sobol sampler.")
         self.num_scenarios = num_scenarios
         self.time_steps = time_steps
+        self.scheme = scheme
+        self.streams = streams if streams is not None else RandomStreams()
+        self.antithetic = antithetic
+        self.sampler = sampler
+        if shock_shift is not None:
+            shock_shift = np.asarray(shock_shift, dtype=np.float64)
+            if shock_shift.shape != (time_steps,):
+                raise ValueError(f"shock_shift must have shape ({time_steps},), got {shock_shift.shape}.")
+        self.shock_shift = shock_shift
 
-    def generate_price_paths(self, 
-                             base_price: float, 
-                             volatility: float, 
-                             mean_reversion_speed: float = 0.1) -> SimulationResult:
-        
-        # Initialize arrays efficiently
-        paths = np.empty((self.num_scenarios, self.time_steps))
-        paths[:, 0] = base_price
-        
+    def generate_price_paths(self,
+                             base_price: float,
+                             volatility: float,
+                             mean_reversion_speed: float = 0.1,
+                             out: Optional[np.ndarray] = None,
+                             path_offset: int = 0,
+                             initial_prices: Optional[np.ndarray] = None) -> SimulationResult:
+        """
+        Generates paths [path_offset, path_offset + num_scenarios) of the seeded path set.
+        `initial_prices` (num_scenarios,) continues each path from a carried state;
+        it is read before `out` is written, so it may alias out[:, -1].
+        """
         dt = 1.0
-        shocks = np.random.normal(0, np.sqrt(dt), size=(self.num_scenarios, self.time_steps))
-        
+        if initial_prices is not None:
+            initial_prices = np.array(initial_prices, dtype=np.float64).reshape(-1)
+            if initial_prices.shape != (self.num_scenarios,):
+                raise ValueError(f"initial_prices must have shape ({self.num_scenarios},), got {initial_prices.shape}.")
+        if self.scheme == "exact":
+            paths, log_weights = self._exact_paths(base_price, volatility, mean_reversion_speed, dt, out, path_offset, initial_prices)
+        else:
+            paths, log_weights = self._euler_paths(base_price, volatility, mean_reversion_speed, dt, out, path_offset, initial_prices)
+
+        # Quantile bands and tail counts are derived lazily by SimulationResult.
+        return SimulationResult(scenarios=paths, base_price=base_price, log_weights=log_weights)
+
+    def _allocate(self, out: Optional[np.ndarray]) -> np.ndarray:
+        shape = (self.num_scenarios, self.time_steps)
+        if out is None:
+            return np.empty(shape)
+        if out.shape != shape or out.dtype != np.float64:
+            raise ValueError(f"Output buffer must be float64 with shape {shape}, got {out.dtype} {out.shape}.")
+        return out
+
+    def expected_path(self, base_price: float) -> np.ndarray:
+        """
+        Analytic mean path E[X_t]. Both schemes start at, and revert to, the anchor,
+        so the mean is flat at base_price (ignoring the rarely-binding 0.5 floor).
+        """
+        return np.full(self.time_steps, float(base_price))
+
+    def shock_loadings(self, volatility: float, mean_reversion_speed: float = 0.1) -> np.ndarray:
+        """
+        (T, T) linear map from standard shocks to price deviations, ignoring the floor:
+        X_t - mu = sum_s L[t, s] * Z_s with L[t, s] = s * a^(t - s) for 1 <= s <= t.
+        """
+        dt = 1.0
+        theta = mean_reversion_speed
+        if self.scheme == "exact" and theta > 0:
+            decay = np.exp(-theta * dt)
+            step_std = volatility * np.sqrt((1.0 - decay ** 2) / (2.0 * theta))
+        else:
+            decay = 1.0 - theta * dt
+            step_std = volatility * np.sqrt(dt)
+
+        t = np.arange(self.time_steps)
+        lag = np.subtract.outer(t, t)
+        loadings = np.where(lag >= 0, step_std * decay ** np.maximum(lag, 0), 0.0)
+        loadings[:, 0] = 0.0
+        return loadings
+
+    def covariance_matrix(self, volatility: float, mean_reversion_speed: float = 0.1) -> np.ndarray:
+        """Analytic (T, T) price covariance of the path set started at the anchor."""
+        loadings = self.shock_loadings(volatility, mean_reversion_speed)
+        return loadings @ loadings.T
+
+    def _draw_shocks(self, path_offset: int, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Standard shocks for the chunk, shifted when importance sampling."""
+        shocks = self._standard_normal(path_offset, out)
+        if self.shock_shift is None:
+            return shocks, None
+        shift = self.shock_shift.copy()
+        shift[0] = 0.0  # column 0 is the anchor, not a shock
+        shocks += shift
+        log_weights = 0.5 * float(np.dot(shift, shift)) - shocks @ shift
+        return shocks, log_weights
+
+    def _standard_normal(self, path_offset: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        stop = path_offset + self.num_scenarios
+        if self.sampler == "sobol":
+            return self._sobol_normal(path_offset, out)
+        if not self.antithetic:
+            return self.streams.standard_normal("price", path_offset, stop, self.time_steps, out=out)
+
+        # One stream row per antithetic pair keeps pairing chunk-invariant.
+        first_pair = path_offset // 2
+        rows = self.streams.standard_normal("price", first_pair, (stop + 1) // 2, self.time_steps)
+        if out is None:
+            out = np.empty((self.num_scenarios, self.time_steps))
+        skip = path_offset - 2 * first_pair
+        out[:] = np.repeat(rows, 2, axis=0)[skip:skip + self.num_scenarios]
+        # Odd global indices carry the mirrored shocks.
+        out[(path_offset + 1) % 2::2] *= -1.0
+        return out
+
+    def _sobol_normal(self, path_offset: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Rows [path_offset, path_offset + num_scenarios) of one scrambled Sobol
+        sequence, turned into Brownian increments. The scramble is seeded from the
+        "sobol" stream and the sequence is fast-forwarded, so chunks stay consistent.
+        """
+        try:
+            from scipy.stats import qmc
+            from scipy.special import ndtri
+        except ImportError as e:
+            raise ImportError("The 'sobol' sampler requires scipy (pip install scipy).") from e
+
+        steps = self.time_steps - 1
+        rng = self.streams.generator("sobol")
+        try:
+            sobol = qmc.Sobol(d=steps, scramble=True, rng=rng)
+        except TypeError:
+            # scipy < 1.15 names the argument `seed`
+            sobol = qmc.Sobol(d=steps, scramble=True, seed=rng)
+        with warnings.catch_warnings():
+            # Balance warnings concern the chunk size, not the full power-of-two run.
+            warnings.simplefilter("ignore", UserWarning)
+            if path_offset:
+                sobol.fast_forward(path_offset)
+            points = sobol.random(self.num_scenarios)
+
+        eps = np.finfo(np.float64).eps
+        normals = ndtri(np.clip(points, eps, 1.0 - eps))
+
+        if out is None:
+            out = np.empty((self.num_scenarios, self.time_steps))
+        out[:, 0] = 0.0
+        out[:, 1:] = self._brownian_bridge(normals)
+        return out
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _bridge_schedule(steps: int) -> List[Tuple[int, int, int, float, float, float]]:
+        """(mid, left, right, w_left, w_right, std) fill order for W_1..W_steps, breadth-first."""
+        schedule = []
+        queue = [(0, steps)]
+        while queue:
+            left, right = queue.pop(0)
+            if right - left < 2:
+                continue
+            mid = (left + right) // 2
+            span = right - left
+            schedule.append((
+                mid, left, right,
+                (right - mid) / span,
+                (mid - left) / span,
+                np.sqrt((mid - left) * (right - mid) / span)
+            ))
+            queue.extend([(left, mid), (mid, right)])
+        return schedule
+
+    def _brownian_bridge(self, normals: np.ndarray) -> np.ndarray:
+        """Maps (n, steps) normals to unit-variance increments via a Brownian bridge."""
+        steps = normals.shape[1]
+        walk = np.zeros((normals.shape[0], steps + 1))
+        walk[:, steps] = np.sqrt(steps) * normals[:, 0]
+        for k, (mid, left, right, w_left, w_right, std) in enumerate(self._bridge_schedule(steps), start=1):
+            walk[:, mid] = w_left * walk[:, left] + w_right * walk[:, right] + std * normals[:, k]
+        return np.diff(walk, axis=1)
+
+    def _euler_paths(self, base_price: float, volatility: float, mean_reversion_speed: float,
+                     dt: float, out: Optional[np.ndarray], path_offset: int,
+                     initial_prices: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        # Initialize arrays efficiently
+        paths = self._allocate(out)
+
+        shocks, log_weights = self._draw_shocks(path_offset)
+        shocks *= np.sqrt(dt)
+
         # Optimized OU Loop
-        current_paths = np.full(self.num_scenarios, base_price)
+        if initial_prices is None:
+            current_paths = np.full(self.num_scenarios, base_price)
+        else:
+            # Carried state: column 0 is a regular step from the previous close
+            drift = mean_reversion_speed * (base_price - initial_prices) * dt
+            current_paths = np.maximum(initial_prices + drift + volatility * shocks[:, 0], self.PRICE_FLOOR)
+        paths[:, 0] = current_paths
         for t in range(1, self.time_steps):
             drift = mean_reversion_speed * (base_price - current_paths) * dt
             diffusion = volatility * shocks[:, t]
-            current_paths = np.maximum(current_paths + drift + diffusion, 0.5)
+            current_paths = np.maximum(current_paths + drift + diffusion, self.PRICE_FLOOR)
             paths[:, t] = current_paths
 
-        # High-Resolution Quantile Mapping (Axiom 60)
-        p10 = np.percentile(paths, 10, axis=0)
-        p50 = np.percentile(paths, 50, axis=0)
-        p90 = np.percentile(paths, 90, axis=0)
-        
-        # Identify Tail Risks (Prices > 2x Mean)
-        tail_threshold = base_price * 2.0
-        tail_count = np.sum(np.max(paths, axis=1) > tail_threshold)
-
-        return SimulationResult(
-            scenarios=paths,
-            percentiles={
-                "p10": p10,
-                "p50": p50,
-                "p90": p90
-            },
-            tail_risk_events=int(tail_count)
-        )
+        return paths, log_weights
+
+    def _exact_paths(self, base_price: float, volatility: float, mean_reversion_speed: float,
+                     dt: float, out: Optional[np.ndarray], path_offset: int,
+                     initial_prices: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Exact OU transition, X_t = mu + a * (X_{t-1} - mu) + s * Z_t with
+        a = exp(-theta * dt) and s = sigma * sqrt((1 - a^2) / (2 * theta)).
+
+        The AR(1) recursion is unrolled as Y_t = a^t * cumsum(a^-k * s * Z_k),
+        so the shocks are drawn straight into the output buffer and every
+        subsequent step (scaling, cumsum, floor) runs in place over it.
+        The 0.5 floor clamps the realised path instead of reflecting the state;
+        both schemes agree whenever the floor is not touched.
+        """
+        paths = self._allocate(out)
+        if initial_prices is not None:
+            deviation = initial_prices - base_price
+        _, log_weights = self._draw_shocks(path_offset, out=paths)
+
+        theta = mean_reversion_speed
+        if theta > 0:
+            decay = np.exp(-theta * dt)
+            step_std = volatility * np.sqrt((1.0 - decay ** 2) / (2.0 * theta))
+            segment = max(1, int(self._MAX_LOG_GROWTH / (theta * dt)))
+        else:
+            decay = 1.0
+            step_std = volatility * np.sqrt(dt)
+            segment = self.time_steps
+
+        if initial_prices is None:
+            paths[:, 0] = 0.0
+        else:
+            # Carried state: column 0 is one exact transition from the previous close
+            paths[:, 0] *= step_std
+            paths[:, 0] += decay * deviation
+
+        # Deviations from the mean, one segment of the cumulative sum at a time.
+        for start in range(1, self.time_steps, segment):
+            stop = min(start + segment, self.time_steps)
+            lags = np.arange(1, stop - start + 1)
+            block = paths[:, start:stop]
+            block *= step_std * decay ** -lags
+            np.cumsum(block, axis=1, out=block)
+            block += paths[:, start - 1:start]
+            block *= decay ** lags
+
+        paths += base_price
+        np.maximum(paths, self.PRICE_FLOOR, out=paths)
+        return paths, log_weights
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Any, List, Optional
+import numpy as np
+from backend.simulation.random_streams import RandomStreams
+
+class ShockBank:
+    """
+    A built bank of standard-normal price shocks, opened as a read-only memory map.
+
+    Row i holds the shocks of bank path i, one column per time step, exactly as
+    RandomStreams(seed) draws path i from its "price" stage. Every process that
+    opens a bank maps the same file, so the rows live once in the page cache
+    however many API or pool workers read them. Pickling a bank sends its
+    location, not its rows: the receiving process maps the file itself.
+    """
+
+    def __init__(self, root: str, bank_id: str):
+        self.root = root
+        self.bank_id = bank_id
+        with open(os.path.join(root, f"{bank_id}.json")) as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        self.shocks: np.ndarray = np.load(os.path.join(root, f"{bank_id}.npy"), mmap_mode="r")
+        if self.shocks.shape != (self.meta["paths"], self.meta["time_steps"]):
+            raise ValueError(f"Shock bank '{bank_id}' does not match its metadata; rebuild it under a new id.")
+
+    def __reduce__(self):
+        return (ShockBank, (self.root, self.bank_id))
+
+    @property
+    def paths(self) -> int:
+        return self.meta["paths"]
+
+    @property
+    def time_steps(self) -> int:
+        return self.meta["time_steps"]
+
+    @property
+    def digest(self) -> str:
+        return self.meta["digest"]
+
+    def rows(self, start: int, stop: int) -> np.ndarray:
+        """(stop - start, time_steps) read-only view of bank paths [start, stop)."""
+        if start < 0 or stop > self.paths:
+            raise ValueError(f"Shock bank '{self.bank_id}' holds {self.paths:,} paths; rows [{start:,}, {stop:,}) are out of range.")
+        return self.shocks[start:stop]
+
+class BankedStreams(RandomStreams):
+    """
+    RandomStreams whose "price" stage reads rows of a ShockBank, starting at
+    `offset`, instead of drawing them. Path i of the run uses bank row
+    offset + i; every other stage (load, noise, bootstrap) still derives from
+    the seed. A bank built from seed s replayed at offset 0 with seed s gives
+    the same paths as drawing from s.
+    """
+
+    def __init__(self, bank: ShockBank, offset: int = 0, seed: Optional[int] = None,
+                 block_size: int = RandomStreams.DEFAULT_BLOCK_SIZE):
+        if offset < 0:
+            raise ValueError(f"bank_offset must be non-negative, got {offset}.")
+        super().__init__(seed, block_size)
+        self.bank = bank
+        self.offset = offset
+
+    def for_day(self, day: int) -> "RandomStreams":
+        if day:
+            raise ValueError("Shock banks hold one day of shocks per path; multi-day horizons draw their own.")
+        return self
+
+    def standard_normal(self,
+                        stage: str,
+                        start: int,
+                        stop: int,
+                        width: int,
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+        if stage != "price":
+            return super().standard_normal(stage, start, stop, width, out=out)
+        if width != self.bank.time_steps:
+            raise ValueError(f"Shock bank '{self.bank.bank_id}' has {self.bank.time_steps} time steps, the run needs {width}.")
+        rows = self.bank.rows(self.offset + start, self.offset + stop)
+        # Callers scale and integrate in place, so the rows are copied, never handed out.
+        if out is None:
+            return np.array(rows)
+        np.copyto(out, rows)
+        return out
+
+class ShockBankStore:
+    """
+    Layer 3 Service: Versioned Shock Banks
+
+    Responsibility: Build and serve banks of standard-normal price shocks so
+    requests scale and integrate stored shocks instead of sampling fresh ones.
+
+    Layout under `root`: `<bank_id>.npy`, a C-ordered (paths, time_steps)
+    float64 array, and `<bank_id>.json` with the seed, block size, numpy version
+    and a content digest. A bank id names one immutable build; building new
+    shocks means a new id, so (bank id, offset) replays a run on any machine.
+    """
+
+    FORMAT_VERSION = 1
+    # Rows drawn and hashed per pass while building (~50 MB at 96 steps).
+    BUILD_BLOCK_ROWS = 65536
+    _ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+    def __init__(self, root: str):
+        self.root = root
+        self._banks: Dict[str, ShockBank] = {}
+
+    def banks(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.root) if name.endswith(".json"))
+
+    def get(self, bank_id: str) -> ShockBank:
+        """The bank mapped once per store (opening it reads no rows)."""
+        if bank_id not in self._banks:
+            if bank_id not in self.banks():
+                raise ValueError(f"Unknown shock bank '{bank_id}'. Built banks: {self.banks()}.")
+            self._banks[bank_id] = ShockBank(self.root, bank_id)
+        return self._banks[bank_id]
+
+    def build(self, bank_id: str, seed: int, paths: int, time_steps: int = 96,
+              block_size: int = RandomStreams.DEFAULT_BLOCK_SIZE) -> ShockBank:
+        """Draws `paths` rows of price shocks from RandomStreams(seed) into a new bank."""
+        if not self._ID_PATTERN.match(bank_id):
+            raise ValueError(f"Bank id '{bank_id}' may only contain letters, digits, '_', '-' and '.'.")
+        if bank_id in self.banks():
+            raise ValueError(f"Shock bank '{bank_id}' already exists; banks are immutable, build under a new id.")
+        if paths < 1 or time_steps < 1:
+            raise ValueError("A shock bank needs at least one path and one time step.")
+
+        os.makedirs(self.root, exist_ok=True)
+        streams = RandomStreams(seed, block_size)
+        path = os.path.join(self.root, f"{bank_id}.npy")
+        staging = path + ".tmp"
+        shocks = np.lib.format.open_memmap(staging, mode="w+", dtype=np.float64, shape=(paths, time_steps))
+        content = hashlib.blake2b(digest_size=16)
+        for start in range(0, paths, self.BUILD_BLOCK_ROWS):
+            stop = min(start + self.BUILD_BLOCK_ROWS, paths)
+            block = streams.standard_normal("price", start, stop, time_steps, out=shocks[start:stop])
+            content.update(block.tobytes())
+        shocks.flush()
+        del shocks
+        os.replace(staging, path)
+
+        # The metadata file is written last: a bank is listed only once complete.
+        meta = {
+            "format_version": self.FORMAT_VERSION,
+            "seed": int(seed),
+            "block_size": block_size,
+            "paths": paths,
+            "time_steps": time_steps,
+            "dtype": "float64",
+            "numpy_version": np.__version__,
+            "digest": content.hexdigest()
+        }
+        with open(os.path.join(self.root, f"{bank_id}.json"), "w") as f:
+            json.dump(meta, f, indent=2, sort_keys=True)
+        return self.get(bank_id)
@@ -0,0 +1,118 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Optional, Tuple
+import numpy as np
+
+class StageCache:
+    """
+    Memoized Pipeline Stages (Axiom 50: Vectorized Scaling)
+
+    Holds the outputs of SimulationEngine's stages (load profile, price paths,
+    asset dispatch, billing), each keyed by exactly the inputs it depends on.
+    A downstream key embeds the keys of the stages it consumes, so changing
+    an input (tariff code, asset config, seed...) misses that stage and
+    everything after it, while the stages upstream of the change still hit.
+
+    Entries are evicted least-recently-used once the stored bytes exceed
+    `max_bytes`; an entry larger than the whole budget is not kept. Cached
+    arrays are made read-only, since every hit hands out the same objects.
+    """
+
+    # Stage -> stages whose outputs it consumes
+    STAGES = {
+        "load": (),
+        "prices": (),
+        "dispatch": ("load", "prices"),
+        "billing": ("dispatch",),
+    }
+
+    def __init__(self, max_bytes: int):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative.")
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {stage: 0 for stage in self.STAGES}
+        self.misses = {stage: 0 for stage in self.STAGES}
+
+    def fetch(self, stage: str, key: Optional[Hashable], compute: Callable[[], Any]) -> Any:
+        """Cached output of `stage` for `key`, computing and storing it on a miss. A None key bypasses the cache."""
+        if stage not in self.STAGES:
+            raise KeyError(f"Unknown cache stage '{stage}'.")
+        if key is None or self.max_bytes == 0:
+            return compute()
+        with self._lock:
+            entry = self._entries.get((stage, key))
+            if entry is not None:
+                self._entries.move_to_end((stage, key))
+                self.hits[stage] += 1
+                return entry[0]
+            self.misses[stage] += 1
+
+        value = compute()
+        size = _freeze(value)
+        with self._lock:
+            if size <= self.max_bytes and (stage, key) not in self._entries:
+                self._entries[(stage, key)] = (value, size)
+                self.nbytes += size
+                while self.nbytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.nbytes -= evicted
+        return value
+
+    def invalidate(self, stage: str):
+        """Drops a stage's entries and those of every stage downstream of it."""
+        doomed = self.downstream(stage)
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] in doomed]:
+                self.nbytes -= self._entries.pop(entry_key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    @classmethod
+    def downstream(cls, stage: str) -> set:
+        """The stage itself plus every stage that (transitively) consumes it."""
+        found = {stage}
+        changed = True
+        while changed:
+            changed = False
+            for name, inputs in cls.STAGES.items():
+                if name not in found and found.intersection(inputs):
+                    found.add(name)
+                    changed = True
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": dict(self.hits),
+                "misses": dict(self.misses)
+            }
+
+def digest(array: Optional[np.ndarray]) -> Optional[str]:
+    """Content key for an input array (load profile, shock shift)."""
+    if array is None:
+        return None
+    array = np.ascontiguousarray(array)
+    return hashlib.blake2b(array.tobytes() + str(array.shape).encode(), digest_size=16).hexdigest()
+
+def _freeze(value: Any) -> int:
+    """Marks the arrays inside a stage output read-only and returns their total bytes."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_freeze(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_freeze(v) for v in value)
+    if hasattr(value, "__dict__"):
+        return sum(_freeze(v) for v in vars(value).values())
+    return 0
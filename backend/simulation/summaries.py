@@ -0,0 +1,207 @@
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+from backend.simulation import confidence
+
+class _BucketStore:
+    """Dense, growable histogram of integer bucket indices."""
+
+    def __init__(self):
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def _extend(self, lo: int, hi: int):
+        if self.counts.size == 0:
+            self.offset = lo
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            return
+        new_lo = min(lo, self.offset)
+        new_hi = max(hi, self.offset + self.counts.size - 1)
+        if new_lo == self.offset and new_hi == self.offset + self.counts.size - 1:
+            return
+        grown = np.zeros(new_hi - new_lo + 1, dtype=np.int64)
+        grown[self.offset - new_lo:self.offset - new_lo + self.counts.size] = self.counts
+        self.offset = new_lo
+        self.counts = grown
+
+    def add(self, indices: np.ndarray):
+        if indices.size == 0:
+            return
+        self._extend(int(indices.min()), int(indices.max()))
+        self.counts += np.bincount(indices - self.offset, minlength=self.counts.size)
+
+    def merge(self, other: "_BucketStore"):
+        if other.counts.size == 0:
+            return
+        self._extend(other.offset, other.offset + other.counts.size - 1)
+        start = other.offset - self.offset
+        self.counts[start:start + other.counts.size] += other.counts
+
+class QuantileSketch:
+    """
+    Mergeable relative-error quantile sketch (DDSketch construction).
+
+    Values are bucketed on a logarithmic grid with ratio gamma = (1 + a) / (1 - a),
+    so any quantile is returned within a relative error `a` of the exact
+    linearly-interpolated (np.percentile) value. Merging two sketches is exact:
+    bucket counts simply add, which makes the sketch safe to fold chunk by chunk
+    or shard by shard.
+    """
+
+    def __init__(self, relative_accuracy: float = 1e-4):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must lie in (0, 1).")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self._positive = _BucketStore()
+        self._negative = _BucketStore()
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, magnitudes: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def _value(self, index: int) -> float:
+        return 2.0 * self.gamma ** index / (self.gamma + 1.0)
+
+    def add(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        positive = values[values > 0]
+        negative = values[values < 0]
+        self._positive.add(self._index(positive))
+        self._negative.add(self._index(-negative))
+        self.zero_count += int(values.size - positive.size - negative.size)
+        self.count += int(values.size)
+
+    def merge(self, other: "QuantileSketch"):
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy.")
+        self._positive.merge(other._positive)
+        self._negative.merge(other._negative)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def rank_value(self, rank: int) -> float:
+        """Approximate value of the rank-th order statistic (0-based), within relative_accuracy."""
+        neg = self._negative
+        neg_total = neg.total
+        if rank < neg_total:
+            # Most negative values sit in the highest magnitude buckets.
+            cumulative = np.cumsum(neg.counts[::-1])
+            pos = int(np.searchsorted(cumulative, rank, side="right"))
+            return -self._value(neg.offset + neg.counts.size - 1 - pos)
+        rank -= neg_total
+        if rank < self.zero_count:
+            return 0.0
+        rank -= self.zero_count
+        cumulative = np.cumsum(self._positive.counts)
+        pos = int(np.searchsorted(cumulative, rank, side="right"))
+        return self._value(self._positive.offset + pos)
+
+    def quantile(self, q: float) -> float:
+        """Quantile q in [0, 1], interpolated like np.percentile's default."""
+        if self.count == 0:
+            raise ValueError("Cannot query an empty sketch.")
+        position = q * (self.count - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, self.count - 1)
+        frac = position - lower
+        low_value = self.rank_value(lower)
+        if frac == 0 or upper == lower:
+            return low_value
+        return low_value + frac * (self.rank_value(upper) - low_value)
+
+class RunningMoments:
+    """Mergeable count/mean/variance accumulator (Chan et al. parallel update)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, count: int, mean: float, m2: float):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    def add(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        mean = float(np.mean(values))
+        self._combine(values.size, mean, float(np.sum((values - mean) ** 2)))
+
+    def merge(self, other: "RunningMoments"):
+        self._combine(other.count, other.mean, other.m2)
+
+    @property
+    def variance(self) -> float:
+        """Population variance (ddof=0, matching np.std's default)."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+class CostSummary:
+    """
+    Streaming summary of per-path costs: moments, quantile sketch and the worst path.
+
+    `worst` holds whatever detail the caller attaches to the current worst path
+    (e.g. the tail event record); ties keep the lowest global path index.
+    """
+
+    def __init__(self, relative_accuracy: float = 1e-4):
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.worst_cost = -np.inf
+        self.worst_index = -1
+        self.worst: Optional[Dict[str, Any]] = None
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    def add(self, costs: np.ndarray, path_offset: int = 0) -> bool:
+        """Folds a chunk of costs. Returns True if the chunk holds the new worst path."""
+        self.moments.add(costs)
+        self.sketch.add(costs)
+        if costs.size == 0:
+            return False
+        local = int(np.argmax(costs))
+        if costs[local] > self.worst_cost:
+            self.worst_cost = float(costs[local])
+            self.worst_index = path_offset + local
+            self.worst = None
+            return True
+        return False
+
+    def merge(self, other: "CostSummary"):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        if other.worst_cost > self.worst_cost or (
+                other.worst_cost == self.worst_cost and 0 <= other.worst_index < self.worst_index):
+            self.worst_cost = other.worst_cost
+            self.worst_index = other.worst_index
+            self.worst = other.worst
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q)
+
+    def quantile_interval(self, q: float, level: float = 0.95) -> Tuple[float, float]:
+        """
+        Order-statistic confidence interval for the q-quantile, read from the
+        sketch and widened by its relative accuracy (the bounds are bucket values).
+        """
+        lower, upper = confidence.order_statistic_ranks(self.count, q, level)
+        low, high = self.sketch.rank_value(lower), self.sketch.rank_value(upper)
+        accuracy = self.sketch.relative_accuracy
+        return (low - abs(low) * accuracy, high + abs(high) * accuracy)
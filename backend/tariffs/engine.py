@@ -1,18 +1,71 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass
 import numpy as np
 
+# 15-minute settlement blocks per day
+BLOCKS_PER_DAY = 96
+# HT billing demand: the higher of the recorded maximum demand and this share of contract demand
+MIN_BILLING_DEMAND_FRACTION = 0.75
+# Power factor assumed when converting MW demand to kVA (as for contract demand)
+DEMAND_POWER_FACTOR = 0.9
+
+@dataclass(frozen=True)
+class CompiledTariffs:
+    """
+    A set of state tariffs as parallel arrays (one entry per state), so every
+    state can be billed against the same energy totals with broadcasting.
+    """
+    codes: Tuple[str, ...]
+    names: Tuple[str, ...]
+    fixed_inr_per_kva: np.ndarray
+    tod_weights: np.ndarray  # (S, 96) per-block ToD multipliers
+    surcharge_inr_per_kwh: np.ndarray  # FPPCA + CSS
+    duty_rate: np.ndarray
+
+    def weights(self, time_steps: int) -> np.ndarray:
+        """(T, S) ToD weights, tiled over whole days, ready for one GEMM."""
+        return np.tile(self.tod_weights, (1, _days(time_steps))).T
+
+    def bills(self,
+              contract_demand_kva: float,
+              priced_energy_inr: np.ndarray,
+              energy_kwh: np.ndarray) -> np.ndarray:
+        """
+        (S, ...) total bills from ToD-weighted priced energy of shape (S, ...);
+        same arithmetic as TariffEngine.calculate_bill per state.
+        """
+        def column(values):
+            return values.reshape((-1,) + (1,) * (np.ndim(priced_energy_inr) - 1))
+
+        fixed_cost = contract_demand_kva * column(self.fixed_inr_per_kva)
+        variable_cost_total = priced_energy_inr + energy_kwh * column(self.surcharge_inr_per_kwh)
+        duty = (fixed_cost + variable_cost_total) * column(self.duty_rate)
+        return fixed_cost + variable_cost_total + duty
+
+def _days(time_steps: int) -> int:
+    if time_steps % BLOCKS_PER_DAY:
+        raise ValueError(f"ToD billing needs whole days of {BLOCKS_PER_DAY} blocks, got {time_steps} steps.")
+    return time_steps // BLOCKS_PER_DAY
+
 class TariffEngine:
     """
     Layer 2 Service: Tariff Engine
-    
+
     Responsibility: Deterministic calculation of specific valid tariff rules.
     Architecture Ref: System Architecture Section 2 (Layer 2)
-    
+
     Axiom Compliance:
     - No Prediction: This engine calculates *costs* based on inputs, it does not forecast rates.
     - Visibility: Breakdown of Fixed vs. Variable vs. Regulatory charges.
+
+    Time-of-Day: each tariff's `tod_multiplier` applies to normal hours and its
+    `tod_windows` override it in peak / off-peak windows ([start, end) hours,
+    wrapping past midnight). Windows are compiled once into cached length-96
+    weight vectors; `energy_totals` prices them with an elementwise product and
+    a per-path row sum, building (N, T) temporaries once per weighting (a Python
+    loop over the K columns when several are stacked).
     """
-    
+
     def __init__(self, tariff_code: str = "MH_MSEDCL_HT"):
         """
         Initialize the multi-state tariff registry.
@@ -23,7 +76,11 @@ class TariffEngine:
                 "name": "Maharashtra (MSEDCL)",
                 "fixed_charges_inr_per_kva": 550.0,
                 "energy_base_inr_per_kwh": 8.20,
-                "tod_multiplier": 1.15, # Peak period impact simulated
+                "tod_multiplier": 1.15, # Normal hours
+                "tod_windows": {
+                    "peak": {"hours": [(9, 12), (18, 22)], "multiplier": 1.30},
+                    "off_peak": {"hours": [(22, 6)], "multiplier": 1.00}
+                },
                 "surcharges": {"fppca": 1.65, "duty": 0.16, "css": 0.80}
             },
             "KA_BESCOM_HT": {
@@ -31,6 +88,10 @@ class TariffEngine:
                 "fixed_charges_inr_per_kva": 475.0,
                 "energy_base_inr_per_kwh": 7.60,
                 "tod_multiplier": 1.10,
+                "tod_windows": {
+                    "peak": {"hours": [(6, 10), (18, 22)], "multiplier": 1.25},
+                    "off_peak": {"hours": [(22, 6)], "multiplier": 0.95}
+                },
                 "surcharges": {"fppca": 1.45, "duty": 0.09, "css": 0.65}
             },
             "GJ_GUVNL_HT": {
@@ -38,6 +99,10 @@ class TariffEngine:
                 "fixed_charges_inr_per_kva": 420.0,
                 "energy_base_inr_per_kwh": 6.90,
                 "tod_multiplier": 1.05,
+                "tod_windows": {
+                    "peak": {"hours": [(7, 11), (18, 22)], "multiplier": 1.15},
+                    "off_peak": {"hours": [(22, 6)], "multiplier": 0.95}
+                },
                 "surcharges": {"fppca": 1.20, "duty": 0.15, "css": 0.40}
             },
             "TN_TANGEDCO_HT": {
@@ -45,6 +110,10 @@ class TariffEngine:
                 "fixed_charges_inr_per_kva": 600.0,
                 "energy_base_inr_per_kwh": 7.50,
                 "tod_multiplier": 1.25, # High peak sensitivity
+                "tod_windows": {
+                    "peak": {"hours": [(6, 10), (18, 22)], "multiplier": 1.45},
+                    "off_peak": {"hours": [(22, 5)], "multiplier": 1.10}
+                },
                 "surcharges": {"fppca": 1.30, "duty": 0.10, "css": 1.20} # High CSS
             },
             "DL_BRPL_HT": {
@@ -52,11 +121,109 @@ class TariffEngine:
                 "fixed_charges_inr_per_kva": 250.0,
                 "energy_base_inr_per_kwh": 8.50,
                 "tod_multiplier": 1.05,
+                "tod_windows": {
+                    "peak": {"hours": [(14, 17), (22, 1)], "multiplier": 1.25}, # Summer evening + late-night peaks
+                    "off_peak": {"hours": [(4, 10)], "multiplier": 0.85}
+                },
                 "surcharges": {"fppca": 3.20, "duty": 0.22, "css": 0.00} # PPAC is 35%+ in DL
             }
         }
+        self._tod_cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._compiled = self._compile(list(self._registry))
         self.set_tariff(tariff_code)
 
+    @property
+    def codes(self) -> List[str]:
+        return list(self._registry)
+
+    def _day_weights(self, code: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached (96,) ToD weights and peak-window mask for a tariff."""
+        if code not in self._tod_cache:
+            structure = self._registry[code]
+            hours = np.arange(BLOCKS_PER_DAY) / 4.0
+            weights = np.full(BLOCKS_PER_DAY, structure["tod_multiplier"])
+            masks = {}
+            for window, spec in structure.get("tod_windows", {}).items():
+                mask = np.zeros(BLOCKS_PER_DAY, dtype=bool)
+                for start, end in spec["hours"]:
+                    mask |= (hours >= start) & (hours < end) if start < end else (hours >= start) | (hours < end)
+                weights[mask] = spec["multiplier"]
+                masks[window] = mask
+            peak = masks.get("peak", np.zeros(BLOCKS_PER_DAY, dtype=bool))
+            weights.flags.writeable = False
+            peak.flags.writeable = False
+            self._tod_cache[code] = (weights, peak)
+        return self._tod_cache[code]
+
+    def tod_weights(self, time_steps: int = BLOCKS_PER_DAY, code: Optional[str] = None) -> np.ndarray:
+        """Per-block ToD multipliers for the active (or given) tariff, tiled over whole days."""
+        return np.tile(self._day_weights(code or self.tariff_code)[0], _days(time_steps))
+
+    def peak_weights(self, time_steps: int = BLOCKS_PER_DAY, code: Optional[str] = None) -> np.ndarray:
+        """ToD weights restricted to the peak windows (zero elsewhere), tiled over whole days."""
+        weights, peak = self._day_weights(code or self.tariff_code)
+        return np.tile(weights * peak, _days(time_steps))
+
+    def _compile(self, codes: Sequence[str]) -> CompiledTariffs:
+        structures = [self._registry[code] for code in codes]
+        return CompiledTariffs(
+            codes=tuple(codes),
+            names=tuple(st["name"] for st in structures),
+            fixed_inr_per_kva=np.array([st["fixed_charges_inr_per_kva"] for st in structures]),
+            tod_weights=np.array([self._day_weights(code)[0] for code in codes]).reshape(len(codes), BLOCKS_PER_DAY),
+            surcharge_inr_per_kwh=np.array([st["surcharges"]["fppca"] + st["surcharges"]["css"] for st in structures]),
+            duty_rate=np.array([st["surcharges"]["duty"] for st in structures])
+        )
+
+    def compiled(self, codes: Optional[Sequence[str]] = None) -> CompiledTariffs:
+        """Array form of every registered tariff, or of a chosen subset (in the given order)."""
+        if codes is None:
+            return self._compiled
+        unknown = [code for code in codes if code not in self._registry]
+        if unknown:
+            raise ValueError(f"Unknown tariff code(s) {unknown}. Expected any of {self.codes}.")
+        return self._compile(codes)
+
+    def compare_bills(self,
+                      contract_demand_kva: float,
+                      price_scenarios: np.ndarray,
+                      load_profile_mw: np.ndarray,
+                      codes: Optional[Sequence[str]] = None) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """
+        Bills every state (or `codes`) against the same price/load tensors. The
+        energy-cost reduction weights one (N, T) priced-energy tensor by every
+        state's ToD weights; returns (codes, bills of shape (S, N)).
+        """
+        tariffs = self.compiled(codes)
+        priced_energy_inr, path_total_load_kwh = self.energy_totals(
+            price_scenarios, load_profile_mw, tariffs.weights(price_scenarios.shape[-1])
+        )
+        return tariffs.codes, tariffs.bills(contract_demand_kva, priced_energy_inr.T, path_total_load_kwh)
+
+    @staticmethod
+    def energy_totals(price_scenarios: np.ndarray,
+                      load_profile_mw: np.ndarray,
+                      weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-path ToD-weighted sum_t(w_t * price_t * kWh_t) and sum_t(kWh_t): every
+        tariff's variable charge is linear in these two totals. `weights` is (T,)
+        or (T, K) for K weightings at once.
+        Each path is reduced on its own (elementwise product, then a row sum) so
+        a path's bill does not depend on how many rows are billed together; a
+        BLAS product rounds differently with the row count, which would break
+        chunk invariance.
+        """
+        # load_profile_mw could be (T,) or (N, T); both broadcast against (N, T) prices
+        energy_per_block_kwh = load_profile_mw * 250.0
+        priced_blocks_inr = price_scenarios * energy_per_block_kwh
+        if weights.ndim == 1:
+            priced_energy_inr = np.sum(priced_blocks_inr * weights, axis=-1)
+        else:
+            priced_energy_inr = np.stack(
+                [np.sum(priced_blocks_inr * weights[:, k], axis=-1) for k in range(weights.shape[1])], axis=-1
+            )
+        return priced_energy_inr, np.sum(energy_per_block_kwh, axis=-1)
+
     def set_tariff(self, code: str):
         if code in self._registry:
             self.tariff_code = code
@@ -66,8 +233,8 @@ class TariffEngine:
             self.tariff_code = "KA_BESCOM_HT"
             self.structure = self._registry["KA_BESCOM_HT"]
 
-    def calculate_bill(self, 
-                      contract_demand_kva: float, 
+    def calculate_bill(self,
+                      contract_demand_kva: float,
                       price_scenarios: np.ndarray,
                       load_profile_mw: np.ndarray = None,
                       **kwargs) -> Dict[str, Any]:
@@ -77,26 +244,17 @@ class TariffEngine:
         """
         # 1. Fixed Charges (Regulated)
         fixed_cost = contract_demand_kva * self.structure["fixed_charges_inr_per_kva"]
-        
+        peak_window_cost = 0.0
+
         # 2. Variable Energy (Full Vectorization)
         if price_scenarios is not None and load_profile_mw is not None:
-            # Handle Load Shaping per path
-            # load_profile_mw could be (T,) or (N, T)
-            energy_per_block_kwh = load_profile_mw * 250.0 
-            path_total_load_kwh = np.sum(energy_per_block_kwh, axis=-1)
-            
-            # Application of ToD Multiplier (Systemic Peak Exposure)
-            tod_impact = self.structure["tod_multiplier"]
-            
-            # Base Market Cost (Vectorized product of Price and Volume)
-            # If load is (T,) and price is (N, T), NumPy broadcasts correctly.
-            # If both are (N, T), it performs path-wise dot products.
-            base_variable_cost = np.sum(price_scenarios * energy_per_block_kwh, axis=-1) * tod_impact
-            
-            # State Surcharges (FPPCA + CSS applied to path-specific volume)
-            surcharges_per_unit = self.structure["surcharges"]["fppca"] + self.structure["surcharges"]["css"]
-            variable_cost_total = base_variable_cost + (path_total_load_kwh * surcharges_per_unit)
-            
+            # ToD energy charge and its peak-window share from one (T, 2) weighting
+            time_steps = np.shape(price_scenarios)[-1]
+            weights = np.column_stack([self.tod_weights(time_steps), self.peak_weights(time_steps)])
+            priced, path_total_load_kwh = self.energy_totals(price_scenarios, load_profile_mw, weights)
+            priced_energy_inr, peak_window_cost = priced[..., 0], priced[..., 1]
+            variable_cost_total = self._variable_cost(priced_energy_inr, path_total_load_kwh)
+
         else:
             # Deterministic Fallback (Legacy)
             load_kwh = kwargs.get("load_kwh", 0)
@@ -105,17 +263,46 @@ class TariffEngine:
             path_total_load_kwh = load_kwh
 
         # 3. Regulatory Duty (State Tax)
-        duty = (fixed_cost + variable_cost_total) * self.structure["surcharges"]["duty"]
+        duty, total_bill = self._duty_and_total(fixed_cost, variable_cost_total)
 
-        total_bill = fixed_cost + variable_cost_total + duty
-        
         return {
             "state_manifest": self.structure["name"],
             "components": {
                 "fixed_charges": float(fixed_cost),
                 "variable_charges": variable_cost_total,
+                "peak_window_charges": peak_window_cost, # ToD energy charge inside peak windows (pre-duty)
                 "regulatory_charges": duty,
             },
             "total_estimated_bill": total_bill,
             "effective_rate": total_bill / path_total_load_kwh if np.any(path_total_load_kwh > 0) else 0
         }
+
+    def bill_from_totals(self,
+                         contract_demand_kva: Union[float, np.ndarray],
+                         priced_energy_inr: np.ndarray,
+                         energy_kwh: np.ndarray) -> np.ndarray:
+        """
+        Total bill from per-path energy totals, for any broadcastable shape.
+        The variable charge is linear in load, so the ToD-weighted
+        sum_t(w_t * price_t * kWh_t) (weights from tod_weights()) and sum_t(kWh_t)
+        are sufficient: callers comparing many load shapes against the same
+        prices (e.g. asset sweeps) can bill them without (N, T) tensors.
+        """
+        fixed_cost = contract_demand_kva * self.structure["fixed_charges_inr_per_kva"]
+        variable_cost_total = self._variable_cost(priced_energy_inr, energy_kwh)
+        return self._duty_and_total(fixed_cost, variable_cost_total)[1]
+
+    def billing_demand_kva(self, contract_demand_kva: float, max_demand_mw: np.ndarray) -> np.ndarray:
+        """Billed demand per path: max(recorded 15-min maximum demand, 75% of contract demand)."""
+        recorded_kva = np.asarray(max_demand_mw) * 1000.0 / DEMAND_POWER_FACTOR
+        return np.maximum(recorded_kva, MIN_BILLING_DEMAND_FRACTION * contract_demand_kva)
+
+    def _variable_cost(self, priced_energy_inr, energy_kwh):
+        # ToD multipliers are already folded into priced_energy_inr (Systemic Peak Exposure)
+        # State Surcharges (FPPCA + CSS applied to path-specific volume)
+        surcharges_per_unit = self.structure["surcharges"]["fppca"] + self.structure["surcharges"]["css"]
+        return priced_energy_inr + (energy_kwh * surcharges_per_unit)
+
+    def _duty_and_total(self, fixed_cost, variable_cost_total):
+        duty = (fixed_cost + variable_cost_total) * self.structure["surcharges"]["duty"]
+        return duty, fixed_cost + variable_cost_total + duty
@@ -0,0 +1,44 @@
+import argparse
+import time
+from backend.simulation.engine import SimulationEngine
+
+BASE_PRICE = 4.15
+
+STATES = ["MH_MSEDCL_HT", "KA_BESCOM_HT", "TN_TANGEDCO_HT"]
+LOADS_MW = [0.5, 1.0, 2.0, 4.0]
+SHIFTS = ["1_SHIFT_DAY", "3_SHIFT_CONTINUOUS"]
+
+def build_requests(n: int, with_asset: bool):
+    """A tariff sweep: every state x load x shift against one market view."""
+    return [
+        dict(state_code=state, load_mw=load_mw, shift_type=shift, with_asset=with_asset,
+             seed=11, num_scenarios=n, price_anchor=BASE_PRICE)
+        for state in STATES for load_mw in LOADS_MW for shift in SHIFTS
+    ]
+
+def timed(fn, *args):
+    start_time = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start_time
+
+def run_benchmark(n: int):
+    print(f"{'Sweep':<12} | {'Requests':<8} | {'Individual (s)':<14} | {'Stage cache (s)':<15} | {'Batch (s)':<9} | {'Speedup':<7} | Identical")
+    print("-" * 96)
+    for with_asset in (False, True):
+        requests = build_requests(n, with_asset)
+        uncached, cached = SimulationEngine(cache_bytes=0), SimulationEngine()
+        individual, t_individual = timed(lambda: [uncached.run_simulation(**r) for r in requests])
+        _, t_cached = timed(lambda: [cached.run_simulation(**r) for r in requests])
+        batched, t_batch = timed(uncached.run_batch, requests)
+        identical = all(a["raw_costs"] == b["raw_costs"] for a, b in zip(individual, batched))
+        label = "with BESS" if with_asset else "bare load"
+        print(f"{label:<12} | {len(requests):<8} | {t_individual:<14.3f} | {t_cached:<15.3f} | {t_batch:<9.3f} | "
+              f"{t_individual / t_batch:<7.1f} | {identical}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise batch simulation benchmark")
+    parser.add_argument("--paths", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"Voltwise Batch Benchmark ({args.paths:,} paths per request, shared seed)")
+    run_benchmark(args.paths)
@@ -0,0 +1,110 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+from backend.simulation.monte_carlo import MonteCarloEngine
+from backend.simulation.random_streams import RandomStreams
+from backend.simulation.assets.bess_model import BESSSimulator, BESSConfig
+
+BASE_PRICE = 4.15
+VOLATILITY = 0.4
+
+def legacy_dispatch(config: BESSConfig, price_paths: np.ndarray, load_profiles_mw: np.ndarray):
+    """The pre-kernel dispatch loop (fresh arrays, fancy indexing, full trails), kept as the baseline."""
+    n_paths, t_steps = price_paths.shape
+    bess_action_mw = np.zeros((n_paths, t_steps))
+    soc_trail = np.zeros((n_paths, t_steps))
+    current_soc = np.full(n_paths, config.initial_soc)
+    current_energy_mwh = current_soc * config.capacity_mwh
+    cycle_count = np.zeros(n_paths)
+    price_means = np.mean(price_paths, axis=1)
+    charge_thresholds = price_means * 0.8
+    discharge_thresholds = price_means * 1.2
+
+    for t in range(t_steps):
+        prices = price_paths[:, t]
+        wants_charge = (prices < charge_thresholds) & (current_soc < config.max_soc)
+        wants_discharge = (prices > discharge_thresholds) & (current_soc > config.min_soc)
+        avail_cap = (config.max_soc - current_soc) * config.capacity_mwh
+        charge_power = np.minimum(config.power_mw, avail_cap / 0.25)
+        avail_energy = (current_soc - config.min_soc) * config.capacity_mwh
+        discharge_power = np.minimum(config.power_mw, avail_energy / 0.25)
+        actions = np.zeros(n_paths)
+        actions[wants_charge] = charge_power[wants_charge]
+        actions[wants_discharge] = -discharge_power[wants_discharge]
+        energy_change = np.where(actions > 0, actions * 0.25 * config.round_trip_efficiency, actions * 0.25)
+        current_energy_mwh += energy_change
+        current_soc = current_energy_mwh / config.capacity_mwh
+        current_soc = np.clip(current_soc, config.min_soc, config.max_soc)
+        current_energy_mwh = current_soc * config.capacity_mwh
+        bess_action_mw[:, t] = actions
+        soc_trail[:, t] = current_soc
+        cycle_count += np.where(actions > 0, (actions * 0.25) / config.capacity_mwh, 0)
+
+    degradation_inr = cycle_count * config.degradation_cost_per_cycle_inr
+    return {
+        "bess_action_mw": bess_action_mw,
+        "soc_trail": soc_trail,
+        "net_load_mw": load_profiles_mw + bess_action_mw,
+        "path_degradation_inr": degradation_inr,
+    }
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def measure(kernel: str, n: int) -> dict:
+    """Runs one kernel in this process and reports time, RSS growth and a checksum."""
+    prices = MonteCarloEngine(num_scenarios=n, streams=RandomStreams(7)).generate_price_paths(BASE_PRICE, VOLATILITY).scenarios
+    loads = np.ones((n, prices.shape[1]))
+    rss_before = peak_rss_mb()
+
+    start_time = time.perf_counter()
+    if kernel == "legacy":
+        result = legacy_dispatch(BESSConfig(), prices, loads)
+    else:
+        result = BESSSimulator().simulate_dispatch(prices, loads, record_paths=[0])
+    duration = time.perf_counter() - start_time
+
+    return {
+        "time_s": duration,
+        "peak_rss_mb": peak_rss_mb(),
+        "dispatch_rss_mb": peak_rss_mb() - rss_before,
+        "net_load_sum": float(np.sum(result["net_load_mw"])),
+        "degradation_sum": float(np.sum(result["path_degradation_inr"])),
+    }
+
+def run_benchmark(n: int):
+    # Each kernel runs in a fresh interpreter so peak RSS is not shared.
+    rows = {}
+    for kernel in ("legacy", "kernel"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", kernel, "--paths", str(n)],
+            capture_output=True, text=True, check=True
+        )
+        rows[kernel] = json.loads(out.stdout)
+
+    print(f"{'Kernel':<8} | {'Time (s)':<9} | {'Peak RSS (MB)':<14} | {'Dispatch RSS (MB)':<18}")
+    print("-" * 58)
+    for kernel, row in rows.items():
+        print(f"{kernel:<8} | {row['time_s']:<9.3f} | {row['peak_rss_mb']:<14.1f} | {row['dispatch_rss_mb']:<18.1f}")
+
+    legacy, kernel = rows["legacy"], rows["kernel"]
+    print(f"\nSpeedup: {legacy['time_s'] / kernel['time_s']:.2f}x | Dispatch memory: "
+          f"{legacy['dispatch_rss_mb']:.0f} MB -> {kernel['dispatch_rss_mb']:.0f} MB")
+    identical = legacy["net_load_sum"] == kernel["net_load_sum"] and legacy["degradation_sum"] == kernel["degradation_sum"]
+    print(f"RESULT: {'PASS' if identical else 'FAIL'} - net load and degradation {'match' if identical else 'differ from'} the legacy kernel.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise BESS dispatch kernel benchmark")
+    parser.add_argument("--paths", type=int, default=100000)
+    parser.add_argument("--child", choices=["legacy", "kernel"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.paths)))
+    else:
+        print(f"Voltwise BESS Dispatch Benchmark ({args.paths:,} paths x 96 steps)")
+        run_benchmark(args.paths)
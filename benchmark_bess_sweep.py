@@ -0,0 +1,62 @@
+import argparse
+import time
+import numpy as np
+from dataclasses import replace
+from backend.simulation.engine import SimulationEngine
+from backend.simulation.assets.bess_model import BESSSimulator
+
+BASE_PRICE = 4.15
+CAPACITIES = [2.0, 4.0, 8.0]
+POWERS = [0.5, 1.0, 2.0]
+EFFICIENCIES = [0.85, 0.88, 0.92]
+
+def per_config_runs(n: int, seed: int) -> np.ndarray:
+    """Legacy sizing: one full run_simulation per BESSConfig."""
+    engine = SimulationEngine()
+    default = engine.bess_sim.config
+    p95 = []
+    for c in CAPACITIES:
+        for p in POWERS:
+            for e in EFFICIENCIES:
+                engine.bess_sim = BESSSimulator(replace(default, capacity_mwh=c, power_mw=p, round_trip_efficiency=e))
+                result = engine.run_simulation(num_scenarios=n, seed=seed, price_anchor=BASE_PRICE)
+                p95.append(result["financials"]["p95_inr"])
+    return np.array(p95)
+
+def sweep(n: int, seed: int) -> np.ndarray:
+    result = SimulationEngine().run_bess_sweep(CAPACITIES, POWERS, EFFICIENCIES, num_scenarios=n, seed=seed, price_anchor=BASE_PRICE)
+    return np.array([cfg["p95_inr"] for cfg in result["configs"]])
+
+def run_benchmark(n: int):
+    grid_size = len(CAPACITIES) * len(POWERS) * len(EFFICIENCIES)
+    print(f"{'Method':<22} | {'Configs':<7} | {'Time (s)':<9} | {'Max |P95 diff| (INR)':<20}")
+    print("-" * 68)
+
+    start_time = time.perf_counter()
+    legacy = per_config_runs(n, seed=0)
+    legacy_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    swept = sweep(n, seed=0)
+    sweep_time = time.perf_counter() - start_time
+
+    diff = float(np.max(np.abs(legacy - swept)))
+    print(f"{'run_simulation x grid':<22} | {grid_size:<7} | {legacy_time:<9.3f} | {'-':<20}")
+    print(f"{'run_bess_sweep':<22} | {grid_size:<7} | {sweep_time:<9.3f} | {diff:<20.6f}")
+    print(f"\nSpeedup: {legacy_time / sweep_time:.1f}x")
+
+    # Common random numbers: the spread of a P95 *difference* between two configs
+    # across seeds, shared paths vs independent paths per config.
+    seeds = range(8)
+    shared = [np.diff(sweep(2000, s)[[0, -1]])[0] for s in seeds]
+    independent = [sweep(2000, s)[-1] - sweep(2000, s + 100)[0] for s in seeds]
+    print(f"SD of P95(largest) - P95(smallest) over seeds: shared paths {np.std(shared):.1f} INR | "
+          f"independent paths {np.std(independent):.1f} INR")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise BESS sizing sweep benchmark")
+    parser.add_argument("--paths", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"Voltwise BESS Sizing Sweep Benchmark ({args.paths:,} paths)")
+    run_benchmark(args.paths)
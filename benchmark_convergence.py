@@ -0,0 +1,90 @@
+import argparse
+import numpy as np
+from core.assumptions.registry import params
+from backend.simulation.monte_carlo import MonteCarloEngine
+from backend.simulation.random_streams import RandomStreams
+from backend.simulation.load_profiles import LoadProfileGenerator
+from backend.simulation.assets.bess_model import BESSSimulator
+from backend.tariffs.engine import TariffEngine
+
+BASE_PRICE = 4.15
+LOAD_MW = 1.0
+
+def simulate_costs(n: int, sampler: str, seed: int, load_profile_mw: np.ndarray) -> np.ndarray:
+    """Price paths -> BESS dispatch -> bill, on a fixed load profile."""
+    mc = MonteCarloEngine(num_scenarios=n, sampler=sampler, streams=RandomStreams(seed))
+    prices = mc.generate_price_paths(base_price=BASE_PRICE, volatility=params.get_latest().dam_volatility_sigma).scenarios
+    loads = np.tile(load_profile_mw, (n, 1))
+    dispatch = BESSSimulator().simulate_dispatch(prices, loads)
+    bill = TariffEngine("MH_MSEDCL_HT").calculate_bill(
+        contract_demand_kva=LOAD_MW * 1000 / 0.9,
+        price_scenarios=prices,
+        load_profile_mw=dispatch["net_load_mw"]
+    )
+    return bill["total_estimated_bill"]
+
+def run_benchmark(replications: int, plot_path: str):
+    load_profile_mw = LoadProfileGenerator().generate_industrial_profile(
+        LOAD_MW, rng=RandomStreams(0).generator("load")
+    )
+
+    # Reference values from one large scrambled Sobol run (2^17 paths)
+    reference = simulate_costs(2 ** 17, "sobol", 10 ** 6, load_profile_mw)
+    ref_mean, ref_p95 = np.mean(reference), np.percentile(reference, 95)
+    print(f"Reference (2^17 Sobol): mean ₹{ref_mean:,.2f} | P95 ₹{ref_p95:,.2f}\n")
+
+    scales = [2 ** k for k in range(7, 15)]
+    errors = {"pseudo": {"mean": [], "p95": []}, "sobol": {"mean": [], "p95": []}}
+
+    print(f"{'Paths':<8} | {'Pseudo RMSE mean':<17} | {'Sobol RMSE mean':<16} | {'Pseudo RMSE P95':<16} | {'Sobol RMSE P95':<15}")
+    print("-" * 86)
+    for n in scales:
+        row = {}
+        for sampler in ("pseudo", "sobol"):
+            runs = [simulate_costs(n, sampler, seed, load_profile_mw) for seed in range(replications)]
+            mean_rmse = np.sqrt(np.mean([(np.mean(c) - ref_mean) ** 2 for c in runs]))
+            p95_rmse = np.sqrt(np.mean([(np.percentile(c, 95) - ref_p95) ** 2 for c in runs]))
+            errors[sampler]["mean"].append(mean_rmse)
+            errors[sampler]["p95"].append(p95_rmse)
+            row[sampler] = (mean_rmse, p95_rmse)
+        print(f"{n:<8} | {row['pseudo'][0]:<17.2f} | {row['sobol'][0]:<16.2f} | {row['pseudo'][1]:<16.2f} | {row['sobol'][1]:<15.2f}")
+
+    # Paths saved at the default 1000-path setting: fit the pseudo error as c / sqrt(N)
+    # and find the pseudo path count that matches Sobol's error at N = 1000.
+    print("\n--- Equivalent Pseudo-Random Paths at N = 1000 ---")
+    log_n = np.log(scales)
+    for metric in ("mean", "p95"):
+        pseudo_c = np.exp(np.mean(np.log(errors["pseudo"][metric]) + 0.5 * log_n))
+        sobol_fit = np.polyfit(log_n, np.log(errors["sobol"][metric]), 1)
+        sobol_at_1000 = np.exp(np.polyval(sobol_fit, np.log(1000)))
+        equivalent = (pseudo_c / sobol_at_1000) ** 2
+        print(f"{metric.upper():<5}: Sobol rate N^{sobol_fit[0]:.2f} | 1000 Sobol paths ~ {equivalent:,.0f} pseudo paths ({equivalent / 1000:.1f}x)")
+
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("\nmatplotlib not installed; skipping the convergence plot.")
+        return
+
+    fig, axes = plt.subplots(1, 2, figsize=(11, 4))
+    for ax, metric in zip(axes, ("mean", "p95")):
+        for sampler in ("pseudo", "sobol"):
+            ax.loglog(scales, errors[sampler][metric], marker="o", label=sampler)
+        ax.set_title(f"RMSE of {'expected cost' if metric == 'mean' else 'P95'} (INR)")
+        ax.set_xlabel("Paths (N)")
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(plot_path, dpi=120)
+    print(f"\nConvergence plot written to {plot_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise QMC convergence benchmark")
+    parser.add_argument("--replications", type=int, default=16)
+    parser.add_argument("--plot", default="convergence.png")
+    args = parser.parse_args()
+
+    print("Voltwise Convergence Benchmark (Pseudo-Random vs Sobol + Brownian Bridge)")
+    run_benchmark(args.replications, args.plot)
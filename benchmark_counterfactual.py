@@ -0,0 +1,43 @@
+import argparse
+import time
+import numpy as np
+from backend.simulation.engine import SimulationEngine
+
+BASE_PRICE = 4.15
+
+def two_calls(engine: SimulationEngine, n: int, seed: int, **kwargs):
+    """The frontend's legacy pattern: asset and baseline runs on independent draws."""
+    asset = engine.run_simulation(num_scenarios=n, seed=seed, price_anchor=BASE_PRICE, **kwargs)["financials"]
+    base = engine.run_simulation(num_scenarios=n, seed=seed + 10_000, price_anchor=BASE_PRICE, with_asset=False, **kwargs)["financials"]
+    return asset["expected_cost_inr"] - base["expected_cost_inr"], asset["p95_inr"] - base["p95_inr"]
+
+def one_call(engine: SimulationEngine, n: int, seed: int, **kwargs):
+    delta = engine.run_counterfactual(["BESS"], num_scenarios=n, seed=seed, price_anchor=BASE_PRICE, n_resamples=50, **kwargs)
+    delta = delta["scenarios"]["BESS"]["delta"]
+    return delta["expected_cost_inr"]["estimate"], delta["p95_inr"]["estimate"]
+
+def run_benchmark(n: int, replications: int):
+    engine = SimulationEngine(cache_bytes=0)
+    fixed_profile = engine.load_generator.generate_industrial_profile(1.0, rng=np.random.default_rng(0))
+
+    print(f"{'Load profile':<16} | {'Method':<16} | {'SD dMean (INR)':<14} | {'SD dP95 (INR)':<13} | {'Time/rep (s)':<12}")
+    print("-" * 84)
+    for label, kwargs in [("per seed", {}), ("fixed", {"load_profile_mw": fixed_profile})]:
+        rows = {}
+        for method, fn in [("two calls", two_calls), ("counterfactual", one_call)]:
+            start_time = time.perf_counter()
+            deltas = np.array([fn(engine, n, seed, **kwargs) for seed in range(replications)])
+            elapsed = (time.perf_counter() - start_time) / replications
+            rows[method] = deltas.std(axis=0, ddof=1)
+            print(f"{label:<16} | {method:<16} | {rows[method][0]:<14.1f} | {rows[method][1]:<13.1f} | {elapsed:<12.3f}")
+        ratio = (rows["two calls"] / rows["counterfactual"]) ** 2
+        print(f"{'':<16} | variance reduction: dMean {ratio[0]:.1f}x, dP95 {ratio[1]:.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise counterfactual (common random numbers) benchmark")
+    parser.add_argument("--paths", type=int, default=2000)
+    parser.add_argument("--replications", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Voltwise Counterfactual Benchmark ({args.paths:,} paths x {args.replications} seeds, BESS vs baseline)")
+    run_benchmark(args.paths, args.replications)
@@ -0,0 +1,80 @@
+import argparse
+import csv
+import os
+import tempfile
+import time
+import numpy as np
+from backend.data.interval_store import IntervalStore
+from backend.simulation.engine import SimulationEngine
+
+def write_history(path: str, sites: int, years: int, seed: int = 0):
+    """Synthetic multi-site 15-minute history: a shift-shaped daily cycle plus noise."""
+    rng = np.random.default_rng(seed)
+    stamps = np.datetime64("2021-01-01T00:00") + np.arange(years * 365 * 96) * np.timedelta64(15, "m")
+    text = np.datetime_as_string(stamps)
+    shape = np.where((np.arange(96) >= 32) & (np.arange(96) <= 80), 1.0, 0.1)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "site", "load_mw"])
+        for s in range(sites):
+            load = np.tile(shape, years * 365) * (1 + s * 0.25) + rng.normal(0, 0.05, stamps.size)
+            writer.writerows(zip(text, [f"PLANT_{s:02d}"] * stamps.size, np.round(load, 4)))
+    return sites * stamps.size
+
+def csv_slice(path: str, site: str, start: str, days: int) -> np.ndarray:
+    """Per-request baseline: re-parse the whole CSV to pull one slice."""
+    first = np.datetime64(start, "m")
+    last = first + np.timedelta64(days * 96 * 15, "m")
+    rows = []
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for stamp, row_site, value in reader:
+            if row_site == site:
+                t = np.datetime64(stamp, "m")
+                if first <= t < last:
+                    rows.append(float(value))
+    return np.array(rows)
+
+def run_benchmark(sites: int, years: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.csv")
+        readings = write_history(path, sites, years)
+        print(f"History: {readings:,} readings, {os.path.getsize(path) / 1e6:.0f} MB CSV")
+
+        start_time = time.perf_counter()
+        IntervalStore(os.path.join(tmp, "store")).ingest(path)
+        ingest_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        store = IntervalStore(os.path.join(tmp, "store"))
+        month = store.period("PLANT_03", "2022-07-01", 31)
+        float(month.sum())
+        slice_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        parsed = csv_slice(path, "PLANT_03", "2022-07-01", 31)
+        parse_time = time.perf_counter() - start_time
+
+        store_mb = sum(os.path.getsize(os.path.join(tmp, "store", f)) for f in os.listdir(os.path.join(tmp, "store"))) / 1e6
+        print(f"{'Step':<28} | {'Time (s)':<9}")
+        print("-" * 40)
+        print(f"{'Ingest (once)':<28} | {ingest_time:<9.3f}")
+        print(f"{'Open store + month slice':<28} | {slice_time:<9.4f}")
+        print(f"{'Re-parse CSV for the slice':<28} | {parse_time:<9.3f}")
+        print(f"\nStore size: {store_mb:.1f} MB (float32) | slice matches CSV: {np.allclose(month, parsed, atol=1e-4)}")
+
+        result = SimulationEngine().run_simulation(
+            num_scenarios=1000, seed=0, price_anchor=4.15, billing_days=31, load_profile_mw=month
+        )
+        print(f"Metered July bill: expected ₹{result['financials']['expected_cost_inr']:,.0f} | "
+              f"P95 ₹{result['financials']['p95_inr']:,.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise interval store benchmark")
+    parser.add_argument("--sites", type=int, default=10)
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Voltwise Interval Store Benchmark ({args.sites} sites x {args.years} years)")
+    run_benchmark(args.sites, args.years)
@@ -0,0 +1,61 @@
+import time
+import numpy as np
+from backend.simulation.monte_carlo import MonteCarloEngine
+
+BASE_PRICE = 4.15
+VOLATILITY = 0.18
+
+def ks_statistic(a: np.ndarray, b: np.ndarray) -> float:
+    """Two-sample Kolmogorov-Smirnov distance between empirical CDFs."""
+    a = np.sort(a)
+    b = np.sort(b)
+    grid = np.concatenate([a, b])
+    cdf_a = np.searchsorted(a, grid, side="right") / a.size
+    cdf_b = np.searchsorted(b, grid, side="right") / b.size
+    return float(np.max(np.abs(cdf_a - cdf_b)))
+
+def time_scheme(scheme: str, n: int):
+    mc = MonteCarloEngine(num_scenarios=n, scheme=scheme)
+    start_time = time.time()
+    sim = mc.generate_price_paths(base_price=BASE_PRICE, volatility=VOLATILITY)
+    duration = time.time() - start_time
+    return duration, sim.scenarios
+
+def run_benchmark():
+    scales = [1000, 10000, 100000, 1000000]
+    print(f"{'Paths':<10} | {'Euler (s)':<10} | {'Exact (s)':<10} | {'Speedup':<8} | {'KS(final)':<10} | {'KS(daily mean)':<14}")
+    print("-" * 76)
+
+    for n in scales:
+        euler_time, euler_paths = time_scheme("euler", n)
+        # Reduce to the statistics we compare before freeing the tensor
+        euler_final = euler_paths[:, -1].copy()
+        euler_daily = euler_paths.mean(axis=1)
+        del euler_paths
+
+        exact_time, exact_paths = time_scheme("exact", n)
+        exact_final = exact_paths[:, -1].copy()
+        exact_daily = exact_paths.mean(axis=1)
+        del exact_paths
+
+        ks_final = ks_statistic(euler_final, exact_final)
+        ks_daily = ks_statistic(euler_daily, exact_daily)
+        print(f"{n:<10,d} | {euler_time:<10.4f} | {exact_time:<10.4f} | {euler_time / exact_time:<8.1f} | {ks_final:<10.4f} | {ks_daily:<14.4f}")
+
+    # Statistical agreement at the largest scale. Euler's AR(1) coefficient is
+    # (1 - theta) rather than exp(-theta), so its stationary std sits ~2.6% above
+    # the exact process; the tolerances below absorb that discretisation bias.
+    print("\n--- Scheme Agreement (1M Paths) ---")
+    mean_gap = abs(np.mean(euler_final) - np.mean(exact_final)) / BASE_PRICE
+    std_gap = abs(np.std(euler_final) - np.std(exact_final)) / np.std(exact_final)
+    daily_gap = abs(np.mean(euler_daily) - np.mean(exact_daily)) / BASE_PRICE
+    print(f"Final Mean Gap: {mean_gap:.4%} | Final Std Gap: {std_gap:.4%} | Daily Mean Gap: {daily_gap:.4%}")
+
+    if mean_gap < 0.005 and daily_gap < 0.005 and std_gap < 0.05:
+        print("RESULT: PASS - Exact and Euler schemes agree statistically.")
+    else:
+        print("RESULT: FAIL - Schemes diverge beyond discretisation tolerance.")
+
+if __name__ == "__main__":
+    print("Voltwise OU Scheme Benchmark (Euler loop vs Exact in-place)")
+    run_benchmark()
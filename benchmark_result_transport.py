@@ -0,0 +1,54 @@
+import argparse
+import json
+import time
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+from backend.simulation.engine import SimulationEngine
+from backend.api import result_formats
+
+BASE_PRICE = 4.15
+SEED = 20240601
+
+def best_of(fn, repeats: int = 3):
+    timings, out = [], None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        out = fn()
+        timings.append(time.perf_counter() - start_time)
+    return min(timings), out
+
+def encode(result, costs, media_type) -> bytes:
+    """Serializes a result the way /simulate does for `media_type`."""
+    body, media_type = result_formats.render(dict(result, raw_costs=costs), media_type)
+    if media_type == result_formats.BINARY:
+        return body
+    return json.dumps(jsonable_encoder(body)).encode("utf-8")
+
+def run_benchmark(path_counts):
+    engine = SimulationEngine()
+    print(f"{'Paths':<10} | {'Format':<8} | {'Bytes':>12} | {'Encode (ms)':>11} | {'Decode (ms)':>11} | Round-trip")
+    print("-" * 74)
+    for n in path_counts:
+        result = engine.run_simulation("MH_MSEDCL_HT", "I", 1.0, seed=SEED, num_scenarios=n,
+                                       price_anchor=BASE_PRICE, raw_costs_format="array")
+        costs = result.pop("raw_costs")
+        for name, media_type in [("json", result_formats.JSON), ("summary", result_formats.SUMMARY), ("binary", result_formats.BINARY)]:
+            encode_s, body = best_of(lambda: encode(result, costs, media_type))
+            if media_type == result_formats.BINARY:
+                decode_s, (_, decoded) = best_of(lambda: result_formats.decode_binary(body))
+                # float32 rounding only: relative error below 2^-24.
+                ok = decoded.size == costs.size and bool(np.allclose(decoded, costs, rtol=1e-7, atol=0))
+            else:
+                decode_s, decoded = best_of(lambda: json.loads(body))
+                if media_type == result_formats.JSON:
+                    ok = np.array_equal(np.asarray(decoded["raw_costs"]), costs)
+                else:
+                    ok = sum(decoded["cost_summary"]["histogram"]["counts"]) == n
+            print(f"{n:<10,d} | {name:<8} | {len(body):>12,d} | {encode_s * 1e3:>11.1f} | {decode_s * 1e3:>11.1f} | {'OK' if ok else 'MISMATCH'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise /simulate result transport benchmark")
+    parser.add_argument("--paths", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    print("--- Voltwise Result Transport: JSON vs Summary vs Binary ---")
+    run_benchmark(args.paths)
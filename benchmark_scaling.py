@@ -1,24 +1,57 @@
+import argparse
+import os
 import time
-import numpy as np
 from backend.simulation.engine import SimulationEngine
 
-def run_benchmark():
+BASE_PRICE = 4.15
+WORKER_COUNTS = [1, 2, 4, 8, 16]
+
+def run_benchmark(sampler: str = "pseudo"):
     engine = SimulationEngine()
-    
+
     scales = [100, 500, 1000, 5000, 10000, 50000, 100000]
     print(f"{'Paths':<10} | {'Execution Time (s)':<20} | {'P95 (INR)':<15}")
     print("-" * 50)
-    
+
     for n in scales:
         start_time = time.time()
-        results = engine.run_simulation(num_scenarios=n, with_asset=True)
+        results = engine.run_simulation(num_scenarios=n, with_asset=True, sampler=sampler)
         end_time = time.time()
-        
+
         duration = end_time - start_time
         p95 = results["financials"]["p95_inr"]
-        
+
         print(f"{n:<10} | {duration:<20.4f} | {p95:<15.2f}")
 
+def run_parallel_benchmark(n: int, sampler: str = "pseudo"):
+    # No stage cache: every worker count recomputes the full pipeline.
+    engine = SimulationEngine(cache_bytes=0)
+    kwargs = dict(num_scenarios=n, with_asset=True, sampler=sampler, seed=7, price_anchor=BASE_PRICE)
+
+    print(f"{'Workers':<8} | {'Execution Time (s)':<20} | {'Speedup':<8} | {'P95 (INR)':<12} | Matches 1 worker")
+    print("-" * 74)
+    baseline = None
+    for workers in WORKER_COUNTS:
+        # Warm-up on a small run so process start-up is not timed.
+        engine.run_simulation(**{**kwargs, "num_scenarios": workers * engine.DEFAULT_SHARD_SIZE}, workers=workers)
+        start_time = time.time()
+        results = engine.run_simulation(workers=workers, **kwargs)
+        duration = time.time() - start_time
+        if baseline is None:
+            baseline = (duration, results["financials"])
+        speedup = baseline[0] / duration
+        matches = results["financials"] == baseline[1]
+        print(f"{workers:<8} | {duration:<20.4f} | {speedup:<8.2f} | {results['financials']['p95_inr']:<12.2f} | {matches}")
+    engine.shutdown()
+
 if __name__ == "__main__":
-    print("Voltwise Scaling Benchmark (Axiom 50 Vectorized Dispatch)")
-    run_benchmark()
+    parser = argparse.ArgumentParser(description="Voltwise scaling benchmark")
+    parser.add_argument("--sampler", choices=["pseudo", "sobol"], default="pseudo")
+    parser.add_argument("--parallel-paths", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"Voltwise Scaling Benchmark (Axiom 50 Vectorized Dispatch, sampler={args.sampler})")
+    run_benchmark(args.sampler)
+
+    print(f"\nSharded Across Worker Processes ({args.parallel_paths:,} paths, {os.cpu_count()} CPUs available)")
+    run_parallel_benchmark(args.parallel_paths, args.sampler)
@@ -0,0 +1,60 @@
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from backend.simulation.engine import SimulationEngine
+from backend.simulation.monte_carlo import MonteCarloEngine
+from backend.simulation.random_streams import RandomStreams
+from backend.simulation.shock_bank import ShockBankStore, BankedStreams
+
+BASE_PRICE = 4.15
+SEED = 20240601
+
+def best_of(fn, repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+def run_benchmark(bank_paths: int, root: str):
+    store = ShockBankStore(root)
+    bank_id = f"bench-{SEED}-{bank_paths}"
+    start_time = time.perf_counter()
+    bank = store.get(bank_id) if bank_id in store.banks() else store.build(bank_id, seed=SEED, paths=bank_paths)
+    print(f"Bank '{bank_id}': {bank.paths:,} x {bank.time_steps} shocks, {bank.shocks.nbytes / 1e6:.0f} MB "
+          f"(ready in {time.perf_counter() - start_time:.2f}s)")
+
+    print(f"\n{'Paths':<8} | {'Scheme':<6} | {'Drawn (s)':<9} | {'Banked (s)':<10} | {'Speedup':<7} | Identical")
+    print("-" * 64)
+    for n in [10000, 50000, 100000]:
+        if n > bank.paths:
+            continue
+        for scheme in MonteCarloEngine.SCHEMES:
+            def paths(streams):
+                engine = MonteCarloEngine(num_scenarios=n, scheme=scheme, streams=streams)
+                return engine.generate_price_paths(base_price=BASE_PRICE, volatility=0.15).scenarios
+            drawn = best_of(lambda: paths(RandomStreams(SEED)))
+            banked = best_of(lambda: paths(BankedStreams(bank, 0, SEED)))
+            identical = np.array_equal(paths(RandomStreams(SEED)), paths(BankedStreams(bank, 0, SEED)))
+            print(f"{n:<8,d} | {scheme:<6} | {drawn:<9.4f} | {banked:<10.4f} | {drawn / banked:<7.1f} | {identical}")
+
+    print("\n--- Full /simulate Pipeline (BESS, stage cache off) ---")
+    engine = SimulationEngine(cache_bytes=0)
+    n = min(50000, bank.paths)
+    kwargs = dict(num_scenarios=n, seed=SEED, price_anchor=BASE_PRICE)
+    drawn = best_of(lambda: engine.run_simulation(**kwargs))
+    banked = best_of(lambda: engine.run_simulation(shock_bank=bank, **kwargs))
+    same = engine.run_simulation(**kwargs)["raw_costs"] == engine.run_simulation(shock_bank=bank, **kwargs)["raw_costs"]
+    print(f"{n:,} paths: drawn {drawn:.3f}s | banked {banked:.3f}s | identical costs: {same}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise shock bank benchmark")
+    parser.add_argument("--bank-paths", type=int, default=100000)
+    parser.add_argument("--root", default=os.path.join(tempfile.gettempdir(), "voltwise_shock_banks"))
+    args = parser.parse_args()
+
+    print("Voltwise Shock Bank Benchmark (drawn vs memory-mapped standard shocks)")
+    run_benchmark(args.bank_paths, args.root)
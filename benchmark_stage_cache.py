@@ -0,0 +1,60 @@
+import argparse
+import time
+from fastapi.testclient import TestClient
+import backend.api.main as api
+from backend.simulation.engine import SimulationEngine
+
+BASE_PRICE = 4.15
+
+# A console session: each step flips one input of the previous request.
+SESSION = [
+    ("initial run", {}),
+    ("flip state", {"state": "KA_BESCOM_HT"}),
+    ("toggle asset off", {"state": "KA_BESCOM_HT", "with_asset": False}),
+    ("flip state back", {"with_asset": False}),
+    ("toggle asset on", {}),
+    ("compare all states", {"compare_states": "all"}),
+]
+
+def run_benchmark(n: int):
+    """Replays the session through POST /simulate, against an uncached and a cached engine."""
+    base = {"state": "MH_MSEDCL_HT", "category": "Industrial", "load_mw": 1.0,
+            "paths": n, "seed": 0, "price_anchor": BASE_PRICE}
+    cached, uncached = SimulationEngine(), SimulationEngine(cache_bytes=0)
+    client = TestClient(api.app)
+    print(f"{'Step':<20} | {'Uncached (s)':<12} | {'Cached (s)':<10} | {'Identical':<9} | Stages rerun")
+    print("-" * 86)
+    totals = [0.0, 0.0]
+    for label, options in SESSION:
+        timings, results = [], []
+        for engine in (uncached, cached):
+            api.engine = engine
+            start_time = time.perf_counter()
+            results.append(client.post("/simulate", json={**base, **options}).json())
+            timings.append(time.perf_counter() - start_time)
+        totals[0] += timings[0]
+        totals[1] += timings[1]
+        rerun = [stage for stage, count in results[1]["meta"]["stage_cache"]["misses"].items() if count]
+        identical = results[1]["raw_costs"] == results[0]["raw_costs"]
+        print(f"{label:<20} | {timings[0]:<12.3f} | {timings[1]:<10.3f} | {str(identical):<9} | {', '.join(rerun) or '-'}")
+
+    stats = cached.stage_cache.stats()
+    print(f"\nSession: {totals[0]:.2f}s uncached -> {totals[1]:.2f}s cached ({totals[0] / totals[1]:.1f}x) | "
+          f"cache holds {stats['entries']} entries, {stats['bytes'] / 1e6:.0f} MB of {stats['max_bytes'] / 1e6:.0f} MB")
+
+    # Without price_anchor the live mark moves between calls, so nothing can repeat.
+    live = {key: value for key, value in base.items() if key != "price_anchor"}
+    for _ in range(2):
+        result = client.post("/simulate", json=live).json()
+    report = result["meta"]["stage_cache"]
+    hits = [stage for stage, count in report["hits"].items() if count]
+    print(f"Seed without price_anchor (x2): stages hit {', '.join(hits) or '-'} | "
+          f"cache {stats['bytes'] / 1e6:.0f} MB -> {report['bytes'] / 1e6:.0f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise stage cache benchmark (through POST /simulate)")
+    parser.add_argument("--paths", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"Voltwise Stage Cache Benchmark ({args.paths:,} paths, seed and price_anchor pinned)")
+    run_benchmark(args.paths)
@@ -0,0 +1,65 @@
+import argparse
+import time
+import numpy as np
+from backend.simulation.engine import SimulationEngine
+from backend.simulation.load_profiles import LoadProfileGenerator
+from backend.simulation.random_streams import RandomStreams
+
+BASE_PRICE = 4.15
+
+# One fixed load profile, so the spread across seeds is pure price-sampling noise
+LOAD_PROFILE_MW = LoadProfileGenerator().generate_industrial_profile(1.0, rng=RandomStreams(0).generator("load"))
+
+def p99_spread(engine: SimulationEngine, n: int, tail_sampling: bool, replications: int,
+               with_asset: bool, tail_shift: float):
+    """Mean and std of the P99/CVaR estimates across independent seeds."""
+    p99s, cvars, ess = [], [], []
+    start_time = time.time()
+    for seed in range(replications):
+        result = engine.run_simulation(
+            num_scenarios=n, seed=seed, price_anchor=BASE_PRICE, load_profile_mw=LOAD_PROFILE_MW,
+            with_asset=with_asset, tail_sampling=tail_sampling, tail_shift=tail_shift
+        )
+        financials = result["financials"]
+        p99s.append(financials["tail_risk_at_p99_inr"])
+        if tail_sampling:
+            cvars.append(financials["cvar_99_inr"])
+            ess.append(financials["tail_sampling"]["tail_effective_sample_size"])
+        else:
+            costs = np.asarray(result["raw_costs"])
+            cvars.append(costs[costs >= financials["tail_risk_at_p99_inr"]].mean())
+            ess.append(float(np.sum(costs >= financials["tail_risk_at_p99_inr"])))
+    duration = (time.time() - start_time) / replications
+    return np.mean(p99s), np.std(p99s), np.mean(cvars), np.std(cvars), np.mean(ess), duration
+
+def run_benchmark(replications: int, with_asset: bool, tail_shift: float):
+    engine = SimulationEngine()
+    print(f"\n--- {'With BESS' if with_asset else 'Bare load (no asset)'} ---")
+    print(f"{'Mode':<18} | {'Paths':<7} | {'P99 (INR)':<12} | {'P99 SD':<8} | {'CVaR99 (INR)':<13} | {'CVaR SD':<8} | {'Tail ESS':<8} | {'Time (s)':<8}")
+    print("-" * 105)
+
+    rows = {}
+    for label, n, tail in [("Brute force", 10000, False), ("Brute force", 1000, False), ("Tail sampling", 1000, True)]:
+        stats = p99_spread(engine, n, tail, replications, with_asset, tail_shift)
+        rows[(label, n)] = stats
+        print(f"{label:<18} | {n:<7} | {stats[0]:<12,.0f} | {stats[1]:<8.1f} | {stats[2]:<13,.0f} | {stats[3]:<8.1f} | {stats[4]:<8.1f} | {stats[5]:<8.3f}")
+
+    brute_sd = rows[("Brute force", 10000)][1]
+    plain_sd = rows[("Brute force", 1000)][1]
+    tail_sd = rows[("Tail sampling", 1000)][1]
+    print(f"P99 variance reduction at 1k paths: {(plain_sd / tail_sd) ** 2:.1f}x")
+    print(f"P99 SD ratio (tail sampling @1k / brute force @10k): {tail_sd / brute_sd:.2f}")
+    if tail_sd <= brute_sd * 1.1:
+        print("RESULT: PASS - 1k tail-sampled paths match the P99 stability of 10k brute-force paths.")
+    else:
+        print("RESULT: FAIL - Tail sampling does not reach brute-force P99 stability at 10x fewer paths.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voltwise tail sampling benchmark")
+    parser.add_argument("--replications", type=int, default=20)
+    parser.add_argument("--tail-shift", type=float, default=SimulationEngine.DEFAULT_TAIL_SHIFT)
+    args = parser.parse_args()
+
+    print(f"Voltwise Tail Sampling Benchmark (Importance-Sampled P99 vs Brute Force, shift={args.tail_shift})")
+    for with_asset in (False, True):
+        run_benchmark(args.replications, with_asset, args.tail_shift)
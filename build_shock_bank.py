@@ -0,0 +1,23 @@
+import argparse
+import os
+import time
+from backend.simulation.shock_bank import ShockBankStore
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a versioned Voltwise shock bank")
+    parser.add_argument("bank_id", help="immutable id for this build, e.g. iex-2024-v1")
+    parser.add_argument("--seed", type=int, required=True)
+    parser.add_argument("--paths", type=int, default=1_000_000)
+    parser.add_argument("--time-steps", type=int, default=96)
+    parser.add_argument("--root", default=os.environ.get("VOLTWISE_SHOCK_BANKS", os.path.join("data", "shock_banks")))
+    args = parser.parse_args()
+
+    store = ShockBankStore(args.root)
+    start_time = time.perf_counter()
+    bank = store.build(args.bank_id, seed=args.seed, paths=args.paths, time_steps=args.time_steps)
+    print(f"Built '{bank.bank_id}': {bank.paths:,} x {bank.time_steps} shocks "
+          f"({bank.shocks.nbytes / 1e6:.0f} MB) in {time.perf_counter() - start_time:.2f}s, digest {bank.digest}")
+
+    for bank_id in store.banks():
+        meta = store.get(bank_id).meta
+        print(f"  {bank_id:<24} seed {meta['seed']:<12} {meta['paths']:>12,} paths  {meta['digest']}")
@@ -37,7 +37,9 @@ const RiskCommandCenter = ({ results }) => {
                             <TrendingUp className="w-4 h-4 text-gray-300" />
                         </div>
                         <div className="h-64">
-                            {results.raw_costs && results.raw_costs.length > 0 ? (
+                            {results.cost_summary ? (
+                                <RiskHistogram summary={results.cost_summary} p95={financials.p95_inr} />
+                            ) : results.raw_costs && results.raw_costs.length > 0 ? (
                                 <RiskHistogram costs={results.raw_costs} bins={40} />
                             ) : (
                                 <div className="h-full flex items-center justify-center text-xs text-slate-400">Computing Distribution...</div>
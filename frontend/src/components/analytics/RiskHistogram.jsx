@@ -1,8 +1,17 @@
 import React, { useMemo } from 'react';
 import { BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, Cell } from 'recharts';
 
-const RiskHistogram = ({ costs, bins = 40 }) => {
+// Takes either raw per-path `costs` or a server-side `summary` (cost_summary from /simulate).
+const RiskHistogram = ({ costs, summary, p95: summaryP95, bins = 40 }) => {
     const data = useMemo(() => {
+        if (summary) {
+            const { edges, counts } = summary.histogram;
+            return counts.map((count, i) => ({
+                name: `₹${(edges[i] / 100000).toFixed(1)}L`,
+                value: count,
+                originalStart: edges[i]
+            }));
+        }
         if (!costs || !Array.isArray(costs) || costs.length === 0) return [];
 
         // Safe Min/Max logic (loops instead of spread to avoid stack overflow on 100k items)
@@ -42,13 +51,14 @@ const RiskHistogram = ({ costs, bins = 40 }) => {
             value: b.count,
             originalStart: b.binStart
         }));
-    }, [costs, bins]);
+    }, [costs, summary, bins]);
 
     const p95 = useMemo(() => {
+        if (summary) return summaryP95 ?? summary.quantiles.values[95];
         if (!costs) return null;
         const sorted = [...costs].sort((a, b) => a - b);
         return sorted[Math.floor(sorted.length * 0.95)];
-    }, [costs]);
+    }, [costs, summary, summaryP95]);
 
     return (
         <div className="h-full w-full">
@@ -59,7 +69,7 @@ const RiskHistogram = ({ costs, bins = 40 }) => {
                         axisLine={false}
                         tickLine={false}
                         tick={{ fill: '#94a3b8', fontSize: 10 }}
-                        interval={Math.floor(bins / 4)}
+                        interval={Math.floor(data.length / 4)}
                     />
                     <YAxis hide />
                     <Tooltip
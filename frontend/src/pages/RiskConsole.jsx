@@ -113,7 +113,8 @@ const RiskConsole = () => {
         try {
             const response = await fetch('/api/simulate', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                // Server-side histogram + quantiles instead of every path's cost.
+                headers: { 'Content-Type': 'application/json', 'Accept': 'application/vnd.voltwise.summary+json' },
                 body: JSON.stringify(inputs)
             });
 
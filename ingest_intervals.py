@@ -0,0 +1,32 @@
+import argparse
+import os
+import time
+from backend.data.interval_store import IntervalStore
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest 15-minute meter data into the Voltwise interval store")
+    parser.add_argument("files", nargs="+", help=".csv or .parquet interval files")
+    parser.add_argument("--store", default=os.environ.get("VOLTWISE_INTERVAL_STORE", os.path.join("data", "intervals")))
+    parser.add_argument("--site", help="site id for single-site files without a site column")
+    parser.add_argument("--timestamp-column", default="timestamp")
+    parser.add_argument("--value-column", default="load_mw")
+    parser.add_argument("--site-column", default="site")
+    parser.add_argument("--unit", default="MW", choices=["MW", "kW"])
+    args = parser.parse_args()
+
+    store = IntervalStore(args.store)
+    for path in args.files:
+        start_time = time.perf_counter()
+        stored = store.ingest(
+            path,
+            site=args.site,
+            timestamp_column=args.timestamp_column,
+            value_column=args.value_column,
+            site_column=args.site_column,
+            unit=args.unit
+        )
+        print(f"{path}: {sum(stored.values()):,} readings for {len(stored)} site(s) in {time.perf_counter() - start_time:.2f}s")
+
+    for site in store.sites():
+        cov = store.coverage(site)
+        print(f"  {site:<16} {cov['first_date']} .. {cov['last_date']} ({cov['days']} days, {cov['filled_fraction']:.1%} filled)")
@@ -0,0 +1,76 @@
+import sys
+import os
+import json
+import time
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from fastapi.testclient import TestClient
+from backend.api.main import app
+
+REQUEST = {"state": "MH_MSEDCL_HT", "category": "Industrial", "load_mw": 1.0, "seed": 7, "price_anchor": 4.15}
+
+def wait_for(client, job_id, poll_s=0.02):
+    """Polls a job to completion; returns its final state and every progress value seen."""
+    seen = []
+    while True:
+        job = client.get(f"/jobs/{job_id}").json()
+        seen.append(job["progress"]["paths_completed"])
+        if job["status"] in ("succeeded", "failed", "cancelled"):
+            return job, seen
+        time.sleep(poll_s)
+
+def verify_jobs():
+    print("--- Voltwise Simulation Jobs Verification ---")
+    with TestClient(app) as client:
+        print("\n--- Progress (60,000 Paths) ---")
+        job = client.post("/jobs/simulate", json={**REQUEST, "paths": 60000}).json()
+        final, seen = wait_for(client, job["job_id"])
+        monotonic = seen == sorted(seen) and final["status"] == "succeeded"
+        print(f"Status: {final['status']} | progress seen: {sorted(set(seen))}")
+
+        print("\n--- Chunked Job vs Blocking /simulate (Same Seed and Anchor) ---")
+        blocking = client.post("/simulate", json={**REQUEST, "paths": 60000}).json()
+        identical = final["result"]["raw_costs"] == blocking["raw_costs"]
+        print(f"raw_costs identical: {identical} | P95 job ₹{final['result']['financials']['p95_inr']:,.2f} "
+              f"vs blocking ₹{blocking['financials']['p95_inr']:,.2f}")
+
+        print("\n--- Streamed Job Keeps No raw_costs ---")
+        body = client.post("/simulate/stream", json={**REQUEST, "paths": 20000}).text
+        events = dict(zip(
+            [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")],
+            [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+        ))
+        streamed = client.get(f"/jobs/{events['job']['job_id']}").json()
+        lean = streamed["status"] == "succeeded" and "raw_costs" not in streamed["result"] and "raw_costs" not in events["result"]
+        print(f"Status: {streamed['status']} | raw_costs kept: {'raw_costs' in streamed['result']} | "
+              f"P95 ₹{streamed['result']['financials']['p95_inr']:,.2f}")
+
+        print("\n--- Light Endpoint Under Load (2 x 300,000-Path Jobs) ---")
+        heavy = [client.post("/jobs/simulate", json={**REQUEST, "paths": 300000}).json() for _ in range(2)]
+        latencies = []
+        while client.get(f"/jobs/{heavy[0]['job_id']}").json()["status"] in ("queued", "running") and len(latencies) < 50:
+            start_time = time.perf_counter()
+            client.get("/assumptions")
+            latencies.append(time.perf_counter() - start_time)
+            time.sleep(0.02)
+        p95_ms = float(np.percentile(latencies, 95)) * 1e3
+        print(f"/assumptions p95 latency: {p95_ms:.1f} ms over {len(latencies)} calls")
+
+        print("\n--- Cancellation ---")
+        for item in heavy:
+            client.delete(f"/jobs/{item['job_id']}")
+        cancelled = [wait_for(client, item["job_id"])[0] for item in heavy]
+        for item in cancelled:
+            print(f"Job {item['job_id'][:8]}: {item['status']} after {item['progress']['paths_completed']:,} paths")
+        stopped = all(item["status"] == "cancelled" for item in cancelled)
+
+    if monotonic and identical and lean and stopped and p95_ms < 250:
+        print("[PASS] Jobs report progress, match blocking runs, keep no raw_costs when streamed, cancel between chunks and leave light endpoints responsive.")
+    else:
+        print("[FAIL] Jobs did not complete, match blocking runs, drop streamed raw_costs, cancel or stay off the request path as expected.")
+
+if __name__ == "__main__":
+    verify_jobs()
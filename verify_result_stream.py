@@ -0,0 +1,68 @@
+import json
+import time
+import requests
+
+BASE_URL = "http://localhost:8000"
+
+PAYLOAD = {
+    "state": "MH_MSEDCL_HT",
+    "category": "Industrial",
+    "load_mw": 1.0,
+    "seed": 20231101,
+    "paths": 1_000_000
+}
+
+def read_events(response, stop_after=None):
+    """Yields (event, data, seconds since the request) from a text/event-stream body."""
+    event = None
+    started = time.perf_counter()
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            yield event, json.loads(line[len("data: "):]), time.perf_counter() - started
+
+def test_stream():
+    print("--- Voltwise Progressive Result Stream (run uvicorn first) ---")
+    print(f"\nStreaming {PAYLOAD['paths']:,} paths from {BASE_URL}/simulate/stream ...")
+    print(f"{'t (s)':<8} | {'Paths':<10} | {'E[cost] (INR)':<14} | {'P95 (INR)':<12} | {'P99 (INR)':<12} | {'E CI width':<10} | P95 CI width")
+    print("-" * 92)
+    first_estimate_s = None
+    final = None
+    estimates = 0
+    with requests.post(f"{BASE_URL}/simulate/stream", json=PAYLOAD, stream=True) as response:
+        for event, data, elapsed in read_events(response):
+            if event == "estimate":
+                estimates += 1
+                first_estimate_s = first_estimate_s or elapsed
+                estimate = data["estimate"]
+                # Print the first few updates, then every 40th.
+                if estimates <= 3 or estimates % 40 == 0:
+                    print(f"{elapsed:<8.3f} | {data['paths_completed']:<10,d} | {estimate['expected_cost_inr']:<14,.0f} | "
+                          f"{estimate['p95_inr']:<12,.0f} | {estimate['p99_inr']:<12,.0f} | "
+                          f"{estimate['expected_cost_ci_width_inr']:<10,.1f} | {estimate['p95_ci_width_inr']:,.1f}")
+            elif event in ("result", "error", "cancelled"):
+                final = (event, data, elapsed)
+
+    event, data, elapsed = final
+    print(f"\nFinal '{event}' after {elapsed:.2f}s ({estimates} estimates, first after {first_estimate_s * 1e3:.0f} ms)")
+    if event == "result":
+        print(f"Expected cost ₹{data['financials']['expected_cost_inr']:,.0f} | P95 ₹{data['financials']['p95_inr']:,.0f}")
+
+    print("\n--- Early Stop: Disconnect After 5 Estimates ---")
+    with requests.post(f"{BASE_URL}/simulate/stream", json=PAYLOAD, stream=True) as response:
+        for event, data, _ in read_events(response):
+            if event == "job":
+                job_id = data["job_id"]
+            if event == "estimate" and data["paths_completed"] >= 5 * 4096:
+                break
+    time.sleep(1.0)
+    job = requests.get(f"{BASE_URL}/jobs/{job_id}").json()
+    print(f"Job {job_id[:8]}: {job['status']} after {job['progress']['paths_completed']:,} of {job['progress']['paths_total']:,} paths")
+
+    ok = event == "result" or final[0] == "result"
+    ok = ok and first_estimate_s < 0.5 and job["status"] == "cancelled"
+    print(f"\nStream Test: {'SUCCESS' if ok else 'FAILED'}")
+
+if __name__ == "__main__":
+    test_stream()
@@ -0,0 +1,53 @@
+import sys
+import os
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.simulation.engine import SimulationEngine
+from backend.tariffs.engine import TariffEngine
+
+def verify_state_comparison():
+    print("--- Voltwise Multi-State Tariff Comparison Verification ---")
+    contract_demand_kva = 2000.0
+
+    print("\n--- compare_bills vs Single-Tariff calculate_bill (2,000 Paths x 96 Blocks) ---")
+    rng = np.random.default_rng(20231101)
+    prices = 4.15 * np.exp(rng.normal(0.0, 0.25, size=(2000, 96)))
+    load_mw = 1.5 + 0.3 * rng.standard_normal((2000, 96))
+    codes, bills = TariffEngine().compare_bills(contract_demand_kva, prices, load_mw)
+
+    bills_match = bills.shape == (len(codes), prices.shape[0])
+    print(f"{'State':<14} | {'Mean Bill (INR)':<17} | {'Max Rel. Gap':<12}")
+    print("-" * 49)
+    for row, code in enumerate(codes):
+        single = TariffEngine(code).calculate_bill(
+            contract_demand_kva=contract_demand_kva, price_scenarios=prices, load_profile_mw=load_mw
+        )["total_estimated_bill"]
+        gap = float(np.max(np.abs(bills[row] - single) / np.abs(single)))
+        bills_match &= gap < 1e-12
+        print(f"{code:<14} | {np.mean(bills[row]):<17,.2f} | {gap:<12.1e}")
+
+    print("\n--- /simulate compare_states vs Separate Runs per State (20,000 Paths, Same Seed) ---")
+    engine = SimulationEngine()
+    common = dict(num_scenarios=20000, seed=20231101, price_anchor=4.15, with_asset=False)
+    compared = engine.run_simulation(compare_states="all", **common)["financials"]["state_comparison"]["states"]
+
+    runs_match = True
+    print(f"{'State':<14} | {'Compared E[Cost]':<17} | {'Separate E[Cost]':<17} | {'P95 Gap (INR)':<13}")
+    print("-" * 70)
+    for code, state in compared.items():
+        separate = engine.run_simulation(state_code=code, **common)["financials"]
+        mean_gap = abs(state["expected_cost_inr"] - separate["expected_cost_inr"])
+        p95_gap = abs(state["p95_inr"] - separate["p95_inr"])
+        runs_match &= mean_gap <= 1e-6 * abs(separate["expected_cost_inr"]) and p95_gap <= 1e-6 * abs(separate["p95_inr"])
+        print(f"{code:<14} | {state['expected_cost_inr']:<17,.2f} | {separate['expected_cost_inr']:<17,.2f} | {p95_gap:<13.2e}")
+
+    if bills_match and runs_match:
+        print("[PASS] Per-state comparison bills match separate single-tariff runs.")
+    else:
+        print("[FAIL] Per-state comparison bills diverge from single-tariff runs.")
+
+if __name__ == "__main__":
+    verify_state_comparison()
@@ -0,0 +1,54 @@
+import sys
+import os
+import tracemalloc
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from backend.simulation.engine import SimulationEngine
+
+def peak_memory_mb(fn, *args, **kwargs):
+    tracemalloc.start()
+    result = fn(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1e6
+
+def verify_streaming():
+    print("--- Voltwise Streaming Simulation Verification ---")
+    engine = SimulationEngine()
+    common = dict(seed=20231101, price_anchor=4.15, with_asset=True)
+
+    print(f"\n{'Paths':<10} | {'Full Peak (MB)':<15} | {'Stream Peak (MB)':<17}")
+    print("-" * 48)
+    for n in [20000, 100000, 400000]:
+        _, full_mb = peak_memory_mb(engine.run_simulation, num_scenarios=n, **common)
+        _, stream_mb = peak_memory_mb(engine.run_simulation, num_scenarios=n, streaming=True, chunk_size=10000, **common)
+        print(f"{n:<10,d} | {full_mb:<15.1f} | {stream_mb:<17.1f}")
+
+    print("\n--- Sketch Error vs Exact np.percentile (200k Paths, Same Seed) ---")
+    n = 200000
+    full = engine.run_simulation(num_scenarios=n, **common)
+    streamed = engine.run_simulation(num_scenarios=n, streaming=True, chunk_size=10000, **common)
+    bound = streamed["financials"]["quantile_relative_error_bound"]
+    costs = np.asarray(full["raw_costs"])
+
+    within_bound = True
+    for key, q in [("p05_inr", 5), ("p95_inr", 95), ("tail_risk_at_p99_inr", 99)]:
+        exact = np.percentile(costs, q)
+        rel_error = abs(streamed["financials"][key] - exact) / abs(exact)
+        within_bound &= rel_error <= bound
+        print(f"P{q:02d}: exact ₹{exact:,.2f} | sketch ₹{streamed['financials'][key]:,.2f} | rel. error {rel_error:.2e} (bound {bound:.0e})")
+
+    mean_gap = abs(streamed["financials"]["expected_cost_inr"] - full["financials"]["expected_cost_inr"])
+    same_worst = streamed["financials"]["tail_event"] == full["financials"]["tail_event"]
+    print(f"Mean gap: ₹{mean_gap:.6f} | Worst path identical: {same_worst}")
+
+    if within_bound and same_worst and mean_gap < 1e-3:
+        print("[PASS] Streaming summaries agree with the full-tensor run.")
+    else:
+        print("[FAIL] Streaming summaries diverge from the full-tensor run.")
+
+if __name__ == "__main__":
+    verify_streaming()